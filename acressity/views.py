@@ -3,7 +3,6 @@ from django.contrib.auth import get_user_model
 from django.http import Http404
 from django.core.urlresolvers import reverse
 from django.contrib import messages
-from django.core.mail import send_mail
 # from django.contrib.auth.decorators import login_required
 from django.utils.html import escape
 from django.views.generic import TemplateView
@@ -14,6 +13,7 @@ from experiences.models import Experience, FeaturedExperience
 from experiences.forms import ExperienceForm
 from explorers.forms import RegistrationForm, Explorer
 from acressity.forms import ContactForm
+from notifications.models import queue_mail
 from paypal.standard.forms import PayPalPaymentsForm
 
 
@@ -73,7 +73,7 @@ def contact(request):
         form = ContactForm(request.POST)
         if form.is_valid():
             for admin in settings.ADMINS:
-                send_mail(
+                queue_mail(
                     'Message from {0} {1}'.format(
                         form.cleaned_data['first_name'],
                         form.cleaned_data['last_name']
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from experiences.models import Experience
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the dates of the latest narratives of every experience, by which journeys are ordered'
+
+    def handle(self, *args, **kwargs):
+        num_updated = Experience.objects.update_narrative_dates()
+        self.stdout.write('Updated the narrative dates of {0} experiences'.format(num_updated))
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiences', '0005_auto_20160911_1457'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='last_narrative_at',
+            field=models.DateTimeField(help_text='Date of the latest narrative, kept up to date as narratives are saved', null=True, editable=False, blank=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='last_public_narrative_at',
+            field=models.DateTimeField(help_text='Date of the latest public narrative', null=True, editable=False, blank=True, db_index=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.utils import timezone
 from django.core.urlresolvers import reverse
 from django.db import models
+from django.db.models import Max
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils.translation import ugettext_lazy as _
@@ -17,6 +18,25 @@ class ExperienceManager(models.Manager):
     def get_random(self, num=1):
         return self.order_by('?')[:num]
 
+    def update_narrative_dates(self, pks=None):
+        '''
+        Recompute the dates of the latest narrative and latest public narrative
+        of the experiences with the given pks, or of every experience. Returns
+        the number of experiences whose dates changed.
+        '''
+        experiences = self.all() if pks is None else self.filter(pk__in=pks)
+        last_public = dict(experiences.filter(narratives__is_public=True).annotate(
+            last=Max('narratives__date_created')).values_list('pk', 'last'))
+        num_updated = 0
+        for dates in experiences.annotate(last=Max('narratives__date_created')).values(
+                'pk', 'last', 'last_narrative_at', 'last_public_narrative_at'):
+            dates['last_public'] = last_public.get(dates['pk'])
+            if (dates['last'], dates['last_public']) != (dates['last_narrative_at'], dates['last_public_narrative_at']):
+                self.filter(pk=dates['pk']).update(last_narrative_at=dates['last'],
+                                                   last_public_narrative_at=dates['last_public'])
+                num_updated += 1
+        return num_updated
+
 
 class Experience(models.Model):
     '''
@@ -32,6 +52,8 @@ class Experience(models.Model):
             blank=True, help_text=_('''The day you committed to achieving this
                 experience. Leave blank for today'''))
     date_modified = models.DateTimeField(auto_now=True, help_text=_('Updated every time object saved'), null=True, blank=True)
+    last_narrative_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True, help_text=_('Date of the latest narrative, kept up to date as narratives are saved'))
+    last_public_narrative_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True, help_text=_('Date of the latest public narrative'))
     brief = models.TextField(blank=True, null=True, help_text=_('Central to making this experience more real, write a brief about what this experience entails. What are your hopes and aspirations? This is a way for others to understand your intention and for you to get some clarity.'))
     status = models.CharField(max_length=200, null=True, blank=True, help_text=_('Optional short state of the experience at the moment.'))
     gallery = models.OneToOneField(Gallery, null=True, blank=True, on_delete=models.SET_NULL)  # I think I want to cascade delete into the gallery as well
@@ -74,14 +96,6 @@ class Experience(models.Model):
         super(Experience, self).__init__(*args, **kwargs)
         self.__original_is_public = self.is_public
 
-        # Add method names for accessing help text from class object instances
-        for field in self._meta.fields:
-            method_name = 'get_{0}_help_text'.format(field.name)
-            # Use curry to create the method with a pre-defined argument
-            curried_method = curry(self._get_help_text, field=field.name)
-            # Add method to instance of class
-            setattr(self, method_name, curried_method)
-
     def __unicode__(self):
         return self.title
 
@@ -170,6 +184,13 @@ class Experience(models.Model):
         return build_full_absolute_url(self.get_absolute_url())
 
 
+# Add methods for accessing help text to the class, once, rather than to every
+# instance on creation
+for field in Experience._meta.fields:
+    setattr(Experience, 'get_{0}_help_text'.format(field.name),
+            curry(Experience._get_help_text, field=field.name))
+
+
 class FeaturedExperience(models.Model):
     experience = models.ForeignKey(Experience)
     date_featured = models.DateTimeField(default=timezone.now)
@@ -71,3 +71,8 @@ class ExperienceIndexTest(ExperienceTestCase):
                 args=(self.experience.pk,)))
         self.assertEqual(response.status_code, 200)
         self.assertNotIn(self.narrative_private, response.context['narratives'])
+
+    def test_help_text_accessors(self):
+        self.assertEqual(self.experience.get_title_help_text(),
+                Experience._meta.get_field('title').help_text)
+        self.assertNotIn('get_title_help_text', vars(self.experience))
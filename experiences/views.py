@@ -12,13 +12,13 @@ from django.template.loader import render_to_string
 from django.conf import settings
 from django.forms import modelform_factory
 from django.db import InternalError
-from django.core.mail import EmailMultiAlternatives
 
 from experiences.models import Experience, FeaturedExperience
 from experiences.forms import ExperienceForm, ExperienceBriefForm
 from narratives.models import Narrative
 from narratives.forms import NarrativeForm, NarrativeTransferForm, TRANSFER_ACTION_CHOICES
 from notifications import notify
+from notifications.models import queue_mail
 from paypal.standard.forms import PayPalPaymentsForm
 
 
@@ -101,8 +101,7 @@ def create(request):
             from_email = 'acressity@acressity.com'
             subject = 'New Experience!'
             text_content = '{0} has created a new experience: {1}!'.format(request.user, new_experience)
-            message = EmailMultiAlternatives(subject, text_content, from_email, [to])
-            message.send()
+            queue_mail(subject, text_content, from_email, [to])
             if 'ajax' in request.POST:
                 html = '<hr />'
                 html += render_to_string(
@@ -150,9 +149,8 @@ def edit(request, experience_id):
                     request,
                     _('Experience has been successfully edited')
                 )
-                for comrade in experience.comrades(exclude=request.user):
-                    notify.send(sender=request.user, recipient=comrade,
-                                target=experience, verb='has edited your shared experience')
+                notify.send_many(sender=request.user, recipients=experience.comrades(exclude=request.user),
+                                 target=experience, verb='has edited your shared experience')
                 return redirect(reverse('experience', args=(experience.id,)))
         else:
             form = ExperienceForm(instance=experience)
@@ -203,9 +201,8 @@ def delete(request, experience_id):
                             target=experience, verb='has made you the new author of the experience')
                 return redirect(reverse('journey', args=(request.user.id,)))
             elif 'confirm' in request.POST:
-                for comrade in experience.comrades(exclude=request.user):
-                    notify.send(sender=request.user, recipient=comrade,
-                                target=experience, verb='has deleted the experience')
+                notify.send_many(sender=request.user, recipients=experience.comrades(exclude=request.user),
+                                 target=experience, verb='has deleted the experience')
                 experience.delete()
                 messages.success(
                     request, 'Experience {0} was deleted'.format(experience))
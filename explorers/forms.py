@@ -49,6 +49,11 @@ class ExplorerForm(ModelForm):
     def __init__(self, explorer, *args, **kwargs):
         super(ExplorerForm, self).__init__(*args, **kwargs)
         self.fields['featured_experience'].queryset = explorer.experiences.all()
+        # Profile forms posted without the setting keep the stored one
+        self.fields['notification_delivery'].required = False
+
+    def clean_notification_delivery(self):
+        return self.cleaned_data['notification_delivery'] or self.instance.notification_delivery
 
     class Meta:
         model = Explorer
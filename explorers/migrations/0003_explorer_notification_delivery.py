@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explorers', '0002_auto_20160911_1443'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='explorer',
+            name='notification_delivery',
+            field=models.CharField(default='immediate', help_text='When to email you about new activity. Digests gather the activity in between into a single email.', max_length=10, choices=[('immediate', 'As they happen'), ('hourly', 'In an hourly digest'), ('daily', 'In a daily digest')]),
+        ),
+    ]
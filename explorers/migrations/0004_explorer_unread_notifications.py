@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.db.models import Count
+
+
+def count_unread_notifications(apps, schema_editor):
+    Explorer = apps.get_model('explorers', 'Explorer')
+    Notification = apps.get_model('notifications', 'Notification')
+    counts = Notification.objects.filter(unread=True).order_by().values('recipient').annotate(count=Count('id'))
+    for row in counts:
+        Explorer.objects.filter(pk=row['recipient']).update(unread_notifications=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explorers', '0003_explorer_notification_delivery'),
+        ('notifications', '0005_notification_recipient_unread_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='explorer',
+            name='unread_notifications',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_unread_notifications, migrations.RunPython.noop),
+    ]
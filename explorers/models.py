@@ -1,8 +1,8 @@
 from django.db import models
+from django.db.models import Case, Value, When
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from itertools import chain
 from django.conf import settings
 from django.core.urlresolvers import reverse
 
@@ -11,6 +11,13 @@ from experiences.models import Experience
 from acressity.utils import build_full_absolute_url
 
 
+NOTIFICATION_DELIVERY_CHOICES = (
+    ('immediate', _('As they happen')),
+    ('hourly', _('In an hourly digest')),
+    ('daily', _('In a daily digest')),
+)
+
+
 class ExplorerManager(BaseUserManager):
     # Following is currently not being used
     def create_user(self, first_name, last_name, trailname, password):
@@ -67,6 +74,14 @@ class Explorer(AbstractBaseUser):
     is_superuser = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
     notify = models.BooleanField(default=True)
+    notification_delivery = models.CharField(
+        max_length=10,
+        choices=NOTIFICATION_DELIVERY_CHOICES,
+        default='immediate',
+        help_text=_('When to email you about new activity. Digests gather the activity in between into a single email.')
+    )
+    # Maintained by the notifications app, so pages need not count them
+    unread_notifications = models.IntegerField(default=0, editable=False)
     experiences = models.ManyToManyField(Experience, related_name='explorers')
     tracking_experiences = models.ManyToManyField(
         Experience,
@@ -100,22 +115,20 @@ class Explorer(AbstractBaseUser):
     def model(self):
         return self.__class__.__name__
 
-    def ordered_experiences(self):
-
-        def sort_experience(experience):
-            # Sort only by most recent public experience if not privileged
-            # Keeps from revealing a private experience with recent activity
-            if experience.narratives.count():
-                if self in experience.explorers.all():
-                    return experience.latest_narrative().date_created
-                elif experience.public_narratives().count():
-                    return experience.latest_public_narrative().date_created
-            return experience.date_created
-
-        if self.featured_experience:
-            # We need to place the featured experience at front
-            return list(chain([self.featured_experience], sorted(self.experiences.exclude(pk=self.featured_experience.pk).order_by('-date_created'), key=sort_experience, reverse=True)))
-        return self.experiences.order_by('-date_created')
+    def ordered_experiences(self, public=False):
+        '''
+        Return the experiences of the explorer as a queryset, newest first.
+        With a featured experience, it comes first and the others follow by
+        their latest narrative. Ordering only by public narratives, for others
+        to see, keeps from revealing a private narrative with recent activity.
+        '''
+        if self.featured_experience_id is None:
+            return self.experiences.order_by('-date_created')
+        last_narrative_at = 'last_public_narrative_at' if public else 'last_narrative_at'
+        experiences = self.experiences.annotate(
+            featured=Case(When(pk=self.featured_experience_id, then=Value(0)), default=Value(1), output_field=models.IntegerField())
+        )
+        return experiences.order_by('featured', '-' + last_narrative_at, '-date_created')
 
     def get_full_name(self):
         return '{0} {1}'.format(self.first_name, self.last_name)
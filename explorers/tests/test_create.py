@@ -7,6 +7,7 @@ from explorers.models import Explorer
 from explorers.tests import helpers
 from explorers.tests.test_main import ExplorerTestCase
 from experiences.models import Experience
+from narratives.models import Narrative
 from photologue.models import Gallery
 
 
@@ -110,3 +111,28 @@ class ExplorerTestCreate(ExplorerTestCase):
         # Featuring an experience brings it to front
         self.explorer.featured_experience = exp1
         self.assertEquals(list(self.explorer.ordered_experiences()), [exp1, exp2])
+
+    def test_ordered_experiences_by_latest_narrative(self):
+        featured = Experience.objects.create(title='Walk the Camino',
+                author=self.explorer)
+        exp1 = Experience.objects.create(title='Climb Mount Everest',
+                author=self.explorer)
+        exp2 = Experience.objects.create(title='Swim Across English Channel',
+                author=self.explorer)
+        narrative = Narrative.objects.create(title='Base camp', body='Arrived',
+                experience=exp1, author=self.explorer, is_public=False)
+
+        # Without a featured experience, the newest comes first
+        self.assertEquals(list(self.explorer.ordered_experiences()), [exp2, exp1, featured])
+
+        # Otherwise a new narrative brings its experience to front
+        self.explorer.featured_experience = featured
+        self.assertEquals(list(self.explorer.ordered_experiences()), [featured, exp1, exp2])
+
+        # Private narratives are not considered for others to see
+        self.assertEquals(list(self.explorer.ordered_experiences(public=True)), [featured, exp2, exp1])
+
+        # Nor are narratives once transferred to another experience
+        exp2.narratives.add(narrative)
+        self.assertEquals(list(self.explorer.ordered_experiences()), [featured, exp2, exp1])
+        self.assertIsNone(Experience.objects.get(pk=exp1.pk).last_narrative_at)
@@ -1,12 +1,16 @@
+from django.core import mail
+from django.core.management import call_command
 from django.db import IntegrityError
 from django.core.urlresolvers import reverse
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.hashers import make_password
+from django.utils.six import StringIO
 
 from explorers.models import Explorer
 from explorers.tests import helpers
 from explorers.tests.test_main import ExplorerTestCase
 from experiences.models import Experience
+from notifications import notify
 from photologue.models import Gallery
 
 
@@ -36,6 +40,48 @@ class ExplorerTestEdit(ExplorerTestCase):
 
         explorer_edited = Explorer.objects.get(pk=self.explorer.pk)
         self.assertEqual(explorer_edited.trailname, trailname_edited)
+        self.assertEqual(explorer_edited.notification_delivery, 'immediate')
+
+    def test_explorer_can_switch_to_digests(self):
+        self.client.login(
+            username=self.explorer.email,
+            password=self.explorer.password_unhashed
+        )
+
+        self.client.post(
+            reverse(
+                'profile',
+                args=(self.explorer.pk,)
+            ),
+            {
+                'email': self.explorer.email,
+                'first_name': self.explorer.first_name,
+                'last_name': self.explorer.last_name,
+                'notify': True,
+                'notification_delivery': 'daily',
+            }
+        )
+
+        explorer_edited = Explorer.objects.get(pk=self.explorer.pk)
+        self.assertEqual(explorer_edited.notification_delivery, 'daily')
+
+        notify.send(sender=self.explorer_other, recipient=explorer_edited,
+                verb='cheered you on')
+        notify.send(sender=self.explorer_other, recipient=explorer_edited,
+                verb='is following your journey')
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('senddigests', 'hourly', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('senddigests', 'daily', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [explorer_edited.email])
+        self.assertIn('2 new notifications', mail.outbox[0].subject)
+
+        # Delivered notifications are left out of the next digest
+        call_command('senddigests', 'daily', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
 
     def test_explorer_cannot_edit_other_profile(self):
         expl_data_edited = {
@@ -7,7 +7,17 @@ from explorers.models import Explorer
 from explorers.tests import helpers
 from explorers.tests.test_main import ExplorerTestCase
 from experiences.models import Experience
+from narratives.models import Narrative
+from notifications import notify
 from photologue.models import Gallery
+from django_comments.models import Comment
+from django.conf import settings
+
+# Session and explorer, the page of notifications with its recipients and
+# target content types, the actors, one query per content type of the
+# targets and of the action objects (experience, narrative and explorer),
+# then the cheers and tracked experiences of the base template
+PAST_NOTIFICATIONS_QUERIES = 2 + 1 + 1 + 3 + 3 + 2
 
 
 class ExplorerTestIndex(ExplorerTestCase):
@@ -44,3 +54,74 @@ class ExplorerTestIndex(ExplorerTestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertFalse(response.context['owner'])
+
+    def test_board_lists_notes_pertaining_to_explorer(self):
+        experience = Experience.objects.create(title='Climb Mount Everest',
+                author=self.explorer)
+        narrative = Narrative.objects.create(title='Base camp', body='Arrived',
+                experience=experience, author=self.explorer)
+        experience_other = Experience.objects.create(title='Swim Across English Channel',
+                author=self.explorer_other)
+
+        def note(obj, comment):
+            return Comment.objects.create(content_type=ContentType.objects.get_for_model(obj),
+                    object_pk=str(obj.pk), site_id=settings.SITE_ID,
+                    user=self.explorer_other, comment=comment)
+
+        experience_note = note(experience, 'Good luck')
+        narrative_note = note(narrative, 'Stay warm')
+        explorer_note = note(self.explorer, 'Hello')
+        note(experience_other, 'Not for the board')
+
+        self.client.login(
+            username=self.explorer.email,
+            password=self.explorer.password_unhashed
+        )
+        response = self.client.get(
+            reverse('board', args=(self.explorer.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['page_obj']),
+                [explorer_note, narrative_note, experience_note])
+
+        # Notes directly to the explorer are for the explorer only
+        self.client.logout()
+        response = self.client.get(
+            reverse('board', args=(self.explorer.pk,))
+        )
+        self.assertEqual(list(response.context['page_obj']),
+                [narrative_note, experience_note])
+
+
+    def test_past_notifications_query_count(self):
+        experience = Experience.objects.create(title='Cross the Andes',
+                author=self.explorer)
+        narrative = Narrative.objects.create(title='Day one', body='Cold',
+                author=self.explorer, experience=experience)
+        targets = [experience, narrative, self.explorer_other]
+
+        def send_notifications():
+            for target in targets:
+                notify.send(sender=self.explorer_other, recipient=self.explorer,
+                        verb='noted', target=target, action_object=target)
+            self.explorer.notifications.mark_all_as_read()
+
+        self.client.login(
+            username=self.explorer.email,
+            password=self.explorer.password_unhashed
+        )
+        url = reverse('past_notifications', args=(self.explorer.pk,))
+
+        # The actors, targets and action objects are fetched with one query
+        # per content type, so the count stays the same however many
+        # notifications there are on the page
+        send_notifications()
+        with self.assertNumQueries(PAST_NOTIFICATIONS_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['notifications']), 3)
+
+        send_notifications()
+        send_notifications()
+        with self.assertNumQueries(PAST_NOTIFICATIONS_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['notifications']), 9)
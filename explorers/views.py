@@ -14,12 +14,15 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib import messages
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q
 
 from acressity import settings
 from explorers.forms import RegistrationForm, ExplorerForm
 from support.models import InvitationRequest
 from notifications import notify
 from experiences.models import Experience
+from narratives.models import Narrative
 from photologue.models import Gallery
 from experiences.forms import ExperienceForm
 from support.models import Cheer
@@ -33,14 +36,10 @@ def index(request, explorer_id):
         experiences = explorer.ordered_experiences()
         form = ExperienceForm()
     else:
-        # Damn, this is hacky...
-        # To start fixing this ugliness, must first have ordered_experiences() return a queryset instead of list
-        experiences = []
-        for experience in explorer.ordered_experiences():
-            if experience.is_public:
-                experiences += [experience]
-            elif request.user.is_authenticated() and experience in request.user.experiences.all():
-                experiences += [experience]
+        visible = Q(is_public=True)
+        if request.user.is_authenticated():
+            visible |= Q(pk__in=request.user.experiences.values('pk'))
+        experiences = explorer.ordered_experiences(public=True).filter(visible)
     return render(request, 'explorers/index.html', {'explorer': explorer, 'experiences': experiences, 'owner': owner, 'form': form})
 
 
@@ -81,28 +80,24 @@ def story(request, explorer_id):
 def board(request, explorer_id):
     explorer = get_object_or_404(get_user_model(), pk=explorer_id)
     owner = explorer == request.user
+    # Notes on the experiences and authored narratives of the explorer, and
+    # notes directly to the explorer for the explorer only. Comment.object_pk
+    # is a text column, so the ids are compared as strings
+    experience_ids = [str(pk) for pk in explorer.experiences.values_list('pk', flat=True)]
+    narrative_ids = [str(pk) for pk in explorer.narratives.values_list('pk', flat=True)]
+    pertaining = Q(content_type=ContentType.objects.get_for_model(Experience), object_pk__in=experience_ids) | \
+        Q(content_type=ContentType.objects.get_for_model(Narrative), object_pk__in=narrative_ids)
     if owner:
-        # Notes directly to the explorer
-        eo_notes = Comment.objects.filter(content_type__model='explorer').filter(object_pk=explorer.id)
-    else:
-        eo_notes = []
-    # Get the notes pertaining to all experiences
-    # What was I thinking? This will become about the most inefficient thing
-    # imagineable as (if) more experiences notes are added
-    experience_notes = Comment.objects.filter(content_type__model='experience')
-    # Filter the results down for just the experiences pertaining to explorer
-    ei_notes = []
-    for ei_note in experience_notes:
-        if explorer in ei_note.content_object.explorers.all():
-            ei_notes.append(ei_note)
-    # Get the notes queryset pertaining to all narratives
-    narrative_notes = Comment.objects.filter(content_type__model='narrative')
-    # Filter the results down for just the experiences pertaining to explorer
-    nr_notes = []
-    for nr_note in narrative_notes:
-        if nr_note.content_object:
-            if explorer == nr_note.content_object.author:
-                nr_notes.append(nr_note)
+        pertaining |= Q(content_type=ContentType.objects.get_for_model(explorer), object_pk=str(explorer.id))
+    notes = Comment.objects.filter(pertaining).select_related('user').prefetch_related('content_object').order_by('-submit_date')
+    paginator = Paginator(notes, 20)
+    page = request.GET.get('page')
+    try:
+        notes = paginator.page(page)
+    except PageNotAnInteger:
+        notes = paginator.page(1)
+    except EmptyPage:
+        notes = paginator.page(paginator.num_pages)
     # Any requests pertaining to the explorer
     requests = InvitationRequest.objects.filter(recruit=explorer)
     if request.method == 'POST' and request.user == explorer:
@@ -111,14 +106,15 @@ def board(request, explorer_id):
             return redirect(reverse('accept_invitation_request', args=(request.user.id,)))
         elif 'decline' in request.POST:
             return redirect(reverse('decline_invitation_request', args=(request.user.id, invitation_request_id)))
-    nothing = not (ei_notes or nr_notes or requests)
-    notifications = explorer.notifications.unread()
-    return render(request, 'explorers/bulletin_board.html', {'explorer': explorer, 'eo_notes': eo_notes, 'ei_notes': ei_notes, 'nr_notes': nr_notes, 'requests': requests, 'nothing': nothing, 'owner': owner, 'notifications': notifications})
+    nothing = not (notes.object_list or requests)
+    notifications, next_cursor = explorer.notifications.unread().prefetch_objects().page(request.GET.get('before'))
+    return render(request, 'explorers/bulletin_board.html', {'explorer': explorer, 'page_obj': notes, 'is_paginated': notes.has_other_pages(), 'requests': requests, 'nothing': nothing, 'owner': owner, 'notifications': notifications, 'next_cursor': next_cursor})
 
 
 @login_required
 def past_notifications(request, explorer_id):
-    return render(request, 'explorers/past_notifications.html')
+    notifications, next_cursor = request.user.notifications.read().prefetch_objects().page(request.GET.get('before'))
+    return render(request, 'explorers/past_notifications.html', {'notifications': notifications, 'next_cursor': next_cursor})
 
 
 # For subscription relationships
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
 from django.core.urlresolvers import reverse
 from django import forms
 from django.shortcuts import get_object_or_404
@@ -39,6 +40,7 @@ class Narrative(models.Model):
         # Considering using this in the method controlling status of is_public
         super(Narrative, self).__init__(*args, **kwargs)
         self.__original_is_public = self.is_public
+        self._original_experience_id = self.experience_id
 
     class Meta:
         # ordering = ['category']
@@ -118,3 +120,15 @@ class Narrative(models.Model):
         # Return the complete url with scheme and domain
         return build_full_absolute_url(self.get_absolute_url())
 
+
+def update_experience_narrative_dates(sender, instance, raw=False, **kwargs):
+    # Keeps the dates journeys are ordered by current, also for the
+    # experience a narrative was transferred from
+    if raw:
+        return
+    pks = set([instance.experience_id, instance._original_experience_id]) - set([None])
+    Experience.objects.update_narrative_dates(pks)
+    instance._original_experience_id = instance.experience_id
+
+post_save.connect(update_experience_narrative_dates, sender=Narrative)
+post_delete.connect(update_experience_narrative_dates, sender=Narrative)
@@ -54,8 +54,7 @@ def create(request, experience_id):
             explorers_to_notify = experience.comrades(exclude=request.user)
             if new_narrative.is_public and experience.is_public:
                 explorers_to_notify = set(chain(explorers_to_notify, experience.tracking_explorers.all()))
-            for explorer in explorers_to_notify:
-                notify.send(recipient=explorer, sender=request.user, target=new_narrative, verb='has written a new narrative for experience {0}'.format(experience))
+            notify.send_many(recipients=explorers_to_notify, sender=request.user, target=new_narrative, verb='has written a new narrative for experience {0}'.format(experience))
             return redirect('/narratives/{0}'.format(new_narrative.id))
     else:
         narr_form_context = {'experience': experience.id, 'is_public':
@@ -80,8 +79,7 @@ def edit(request, narrative_id):
             if form.is_valid():
                 form.save()
                 messages.success(request, 'Narrative successfully updated')
-                for explorer in narrative.experience.comrades(exclude=request.user):
-                    notify.send(recipient=explorer, sender=request.user, target=narrative, verb='edited a narrative')
+                notify.send_many(recipients=narrative.experience.comrades(exclude=request.user), sender=request.user, target=narrative, verb='edited a narrative')
                 return redirect('/narratives/{0}'.format(narrative.id))
         else:
             form = NarrativeForm(author=narrative.author, instance=narrative)
@@ -98,8 +96,7 @@ def delete(request, narrative_id):
     if request.method == 'POST' and 'confirm' in request.POST:
         narrative.delete()
         messages.success(request, 'Your narrative was deleted')
-        for comrade in narrative.experience.comrades(exclude=request.user):
-            notify.send(sender=request.user, recipient=comrade, verb='has deleted a narrative from the experience', target=narrative.experience)
+        notify.send_many(sender=request.user, recipients=narrative.experience.comrades(exclude=request.user), verb='has deleted a narrative from the experience', target=narrative.experience)
         return redirect(reverse('experience', args=(narrative.experience.id,)))
     else:
         return render(request, 'narratives/delete.html', {'narrative': narrative})
@@ -1,8 +1,21 @@
 from django.contrib import admin
-from notifications.models import Notification
+from notifications.models import Notification, FeedEntry, QueuedEmail
 
 
 class NotificationAdmin(admin.ModelAdmin):
     pass
 
 admin.site.register(Notification, NotificationAdmin)
+
+
+class FeedEntryAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'verb', 'timestamp')
+    raw_id_fields = ('recipient',)
+
+admin.site.register(FeedEntry, FeedEntryAdmin)
+
+
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'created', 'attempts', 'send_after')
+
+admin.site.register(QueuedEmail, QueuedEmailAdmin)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from notifications.models import FeedEntry, FEED_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Deletes the activity feed entries older than NOTIFY_FEED_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days',
+            dest='days',
+            type=int,
+            default=FEED_RETENTION_DAYS,
+            help='Keep the entries of this many days instead'
+        )
+
+    def handle(self, *args, **kwargs):
+        expired = FeedEntry.objects.expired(kwargs['days'])
+        num_deleted = expired.count()
+        expired.delete()
+        self.stdout.write('Deleted {0} feed entries'.format(num_deleted))
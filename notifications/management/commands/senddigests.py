@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from notifications.models import DIGEST_DELIVERIES, send_digests
+
+
+class Command(BaseCommand):
+    help = 'Queues the notification digests of the explorers receiving them, run hourly and daily'
+
+    def add_arguments(self, parser):
+        parser.add_argument('frequency', choices=sorted(DIGEST_DELIVERIES.keys()))
+
+    def handle(self, *args, **kwargs):
+        num_sent = send_digests(kwargs['frequency'])
+        self.stdout.write('Queued {0} {1} digests'.format(num_sent, kwargs['frequency']))
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.models import QueuedEmail, EMAIL_BATCH_SIZE, send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Sends the queued emails, a batch at a time over a single connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size',
+            dest='batch_size',
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help='Number of emails sent over one connection'
+        )
+        parser.add_argument('--loop',
+            action='store_true',
+            dest='loop',
+            default=False,
+            help='Keep waiting for new emails rather than exiting once the queue is empty'
+        )
+        parser.add_argument('--interval',
+            dest='interval',
+            type=float,
+            default=5,
+            help='Seconds to wait for new emails when looping'
+        )
+        parser.add_argument('--status',
+            action='store_true',
+            dest='status',
+            default=False,
+            help='Only show the depth of the queue'
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs['status']:
+            self.write_status()
+            return
+        while True:
+            sent, failed = send_queued_mail(kwargs['batch_size'])
+            if sent or failed:
+                self.stdout.write('Sent {0} emails, {1} failed'.format(sent, failed))
+            if sent + failed < kwargs['batch_size']:
+                if not kwargs['loop']:
+                    break
+                time.sleep(kwargs['interval'])
+        self.write_status()
+
+    def write_status(self):
+        metrics = QueuedEmail.objects.metrics()
+        self.stdout.write('{queued} emails queued, {retrying} of them retrying, {failed} failed; '
+                          'the oldest was queued {oldest_age:.0f} seconds ago'.format(**metrics))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifications.models import update_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Recounts the unread notifications of every user, should the maintained counts drift'
+
+    def handle(self, *args, **kwargs):
+        num_updated = update_unread_counts()
+        self.stdout.write('Updated the unread notification counts of {0} users'.format(num_updated))
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('actor_object_id', models.CharField(max_length=255)),
+                ('verb', models.CharField(max_length=255)),
+                ('description', models.TextField(null=True, blank=True)),
+                ('target_object_id', models.CharField(max_length=255, null=True, blank=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('activity_key', models.CharField(max_length=40, db_index=True)),
+                ('actor_content_type', models.ForeignKey(related_name='feed_actor', to='contenttypes.ContentType')),
+                ('recipient', models.ForeignKey(related_name='feed', to=settings.AUTH_USER_MODEL)),
+                ('target_content_type', models.ForeignKey(related_name='feed_target', blank=True, to='contenttypes.ContentType', null=True)),
+            ],
+            options={
+                'ordering': ('-timestamp', '-id'),
+                'verbose_name_plural': 'feed entries',
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='feedentry',
+            index_together=set([('recipient', 'timestamp')]),
+        ),
+    ]
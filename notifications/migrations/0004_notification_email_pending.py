@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='email_pending',
+            field=models.BooleanField(default=False, db_index=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_email_pending'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='notification',
+            index_together=set([('recipient', 'unread')]),
+        ),
+    ]
@@ -1,15 +1,21 @@
 import datetime
-from .utils import id2slug
+import hashlib
+from collections import defaultdict, OrderedDict
+from importlib import import_module
+from .utils import id2slug, make_cursor, parse_cursor
 from model_utils import managers, Choices
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.generic import GenericForeignKey
-from django.db import models
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models, transaction
+from django.db.models import Count, F, Q
 from django.template.loader import render_to_string
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 
-from notifications.signals import notify
+from notifications.signals import notify, notify_many
 
 # The table fields:
 # id, level, recipient_id, unread, actor_content_type_id, actor_object_id, verb, description, target_content_type_id, target_object_id, action_object_content_type_id, action_object_object_id, timestamp, public
@@ -23,9 +29,86 @@ if getattr(settings, 'USE_TZ'):
     except ImportError:
         pass
 
+# Dotted path to a function returning the pks of the users following an
+# activity, given its actor and target. Their feeds get the activity as well.
+FEED_FOLLOWERS = getattr(settings, 'NOTIFY_FEED_FOLLOWERS', 'support.feeds.followers')
+
+# Days activity feed entries are kept for, see the prunefeed command.
+FEED_RETENTION_DAYS = getattr(settings, 'NOTIFY_FEED_RETENTION_DAYS', 90)
+
+# Number of entries on a page of an activity feed.
+FEED_PAGE_SIZE = getattr(settings, 'NOTIFY_FEED_PAGE_SIZE', 20)
+
+# Number of notifications on a page of a notification list.
+PAGE_SIZE = getattr(settings, 'NOTIFY_PAGE_SIZE', 16)
+
+# An activity reaches a feed only once within this many minutes, however
+# many times it is sent, such as once for each comrade of an experience.
+FEED_DEDUPLICATION_MINUTES = 10
+
+# Queue outgoing email in the database, to be sent by the sendqueuedmail
+# command, rather than sending it within the request. Only turn this on
+# along with a running `sendqueuedmail --loop` or a cron job running it.
+QUEUE_EMAIL = getattr(settings, 'NOTIFY_QUEUE_EMAIL', False)
+
+# Number of queued emails sent over one connection.
+EMAIL_BATCH_SIZE = getattr(settings, 'NOTIFY_EMAIL_BATCH_SIZE', 100)
+
+# Attempts at sending a queued email before giving up on it. Failed attempts
+# are retried after 1, 2, 4... minutes, up to EMAIL_RETRY_MAX_MINUTES.
+EMAIL_MAX_ATTEMPTS = getattr(settings, 'NOTIFY_EMAIL_MAX_ATTEMPTS', 8)
+EMAIL_RETRY_MAX_MINUTES = 60
+
+# Field of the user model counting the unread notifications of the user, kept
+# up to date as notifications are created and read. Users are counted when
+# their model has this field, see the updateunreadcounts command.
+UNREAD_COUNT_FIELD = getattr(settings, 'NOTIFY_UNREAD_COUNT_FIELD', 'unread_notifications')
+
+# Delivery policies of the recipients whose pending notifications each kind
+# of digest emails. Hourly digests also catch up with the notifications of
+# those who went back to immediate emails.
+DIGEST_DELIVERIES = {
+    'hourly': ('hourly', 'immediate'),
+    'daily': ('daily',),
+}
+
+def keyset_page(qs, cursor=None, size=FEED_PAGE_SIZE):
+    """
+Return a page of the rows of a queryset, newest first, starting after the
+position marked by `cursor`, and the cursor of the next page or None if
+this is the last one. Pages are found by their position rather than by an
+offset, so reading any page costs the same.
+"""
+    qs = qs.order_by('-timestamp', '-id')
+    if cursor:
+        try:
+            timestamp, id = parse_cursor(cursor)
+        except ValueError:
+            pass
+        else:
+            qs = qs.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=id))
+    rows = list(qs[:size + 1])
+    if len(rows) > size:
+        rows = rows[:size]
+        return rows, make_cursor(rows[-1].timestamp, rows[-1].id)
+    return rows, None
+
 
 class NotificationQuerySet(models.query.QuerySet):
 
+    def page(self, cursor=None, size=PAGE_SIZE):
+        "Return a page of notifications and the cursor of the next, see keyset_page"
+        return keyset_page(self, cursor, size)
+
+    def prefetch_objects(self):
+        """
+Fetch the actors, targets and action objects of the notifications with one
+query per content type, rather than one per notification, as well as the
+recipients and target content types the notice template uses.
+"""
+        return self.select_related('recipient', 'target_content_type').prefetch_related(
+            'actor', 'target', 'action_object')
+
     def unread(self):
         "Return only unread items in the current queryset"
         return self.filter(unread=True)
@@ -53,9 +136,47 @@ Optionally, filter these by recipient first.
 
         if recipient:
             qs = qs.filter(recipient=recipient)
-
         qs.update(unread=True)
 
+    def update(self, **kwargs):
+        """
+Update the notifications, keeping the unread counts of their recipients
+when `unread` changes.
+"""
+        if 'unread' not in kwargs or not counts_unread():
+            return super(NotificationQuerySet, self).update(**kwargs)
+        delta = 1 if kwargs['unread'] else -1
+        with transaction.atomic():
+            deltas = self.exclude(unread=kwargs['unread'])._recipient_deltas(delta)
+            num_updated = super(NotificationQuerySet, self).update(**kwargs)
+            adjust_unread_counts(deltas)
+        return num_updated
+    update.alters_data = True
+
+    def delete(self):
+        """
+Delete the notifications, keeping the unread counts of their recipients.
+"""
+        if not counts_unread():
+            return super(NotificationQuerySet, self).delete()
+        with transaction.atomic():
+            deltas = self.unread()._recipient_deltas(-1)
+            super(NotificationQuerySet, self).delete()
+            adjust_unread_counts(deltas)
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _recipient_deltas(self, delta):
+        """
+Return `delta` times the number of notifications of each recipient, by
+recipient pk. The rows are locked, so that a concurrent update does not
+count them as well.
+"""
+        deltas = defaultdict(int)
+        for pk in self.order_by().select_for_update().values_list('recipient', flat=True):
+            deltas[pk] += delta
+        return deltas
+
 
 class Notification(models.Model):
     """
@@ -116,10 +237,14 @@ HTML Representation::
 
     public = models.BooleanField(default=True)
 
+    # Waiting to be emailed in a digest
+    email_pending = models.BooleanField(default=False, db_index=True)
+
     objects = managers.PassThroughManager.for_queryset_class(NotificationQuerySet)()
 
     class Meta:
         ordering = ('-timestamp', )
+        index_together = (('recipient', 'unread'), )
 
     def __unicode__(self):
         ctx = {
@@ -149,10 +274,28 @@ current timestamp.
     def slug(self):
         return id2slug(self.id)
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super(Notification, self).save(*args, **kwargs)
+        if adding and self.unread:
+            adjust_unread_counts({self.recipient_id: 1})
+
+    def delete(self, *args, **kwargs):
+        unread = Notification.objects.filter(pk=self.pk, unread=True).exists()
+        super(Notification, self).delete(*args, **kwargs)
+        if unread:
+            adjust_unread_counts({self.recipient_id: -1})
+
     def mark_as_read(self):
+        # The queryset adjusts the count, only if the row actually changes
         if self.unread:
             self.unread = False
-            self.save()
+            Notification.objects.filter(pk=self.pk).update(unread=False)
+
+    def mark_as_unread(self):
+        if not self.unread:
+            self.unread = True
+            Notification.objects.filter(pk=self.pk).update(unread=True)
 
 EXTRA_DATA = False
 if getattr(settings, 'NOTIFY_USE_JSONFIELD', False):
@@ -164,6 +307,250 @@ if getattr(settings, 'NOTIFY_USE_JSONFIELD', False):
     EXTRA_DATA = True
 
 
+class FeedEntryQuerySet(models.query.QuerySet):
+
+    def page(self, cursor=None, size=FEED_PAGE_SIZE):
+        "Return a page of entries and the cursor of the next, see keyset_page"
+        return keyset_page(self, cursor, size)
+
+    def expired(self, days=FEED_RETENTION_DAYS):
+        "Return the entries older than the given number of days"
+        return self.filter(timestamp__lt=now() - datetime.timedelta(days=days))
+
+
+class FeedEntry(models.Model):
+    """
+Activity as shown in the feed of a user. An entry is written for every
+user the activity concerns as it happens, so a feed is read with one
+query on (recipient, timestamp), whatever the number of experiences or
+explorers the user follows.
+"""
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='feed')
+
+    actor_content_type = models.ForeignKey(ContentType, related_name='feed_actor')
+    actor_object_id = models.CharField(max_length=255)
+    actor = GenericForeignKey('actor_content_type', 'actor_object_id')
+
+    verb = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+
+    target_content_type = models.ForeignKey(ContentType, related_name='feed_target',
+        blank=True, null=True)
+    target_object_id = models.CharField(max_length=255, blank=True, null=True)
+    target = GenericForeignKey('target_content_type', 'target_object_id')
+
+    timestamp = models.DateTimeField(default=now)
+    activity_key = models.CharField(max_length=40, db_index=True)
+
+    objects = managers.PassThroughManager.for_queryset_class(FeedEntryQuerySet)()
+
+    class Meta:
+        ordering = ('-timestamp', '-id')
+        index_together = (('recipient', 'timestamp'),)
+        verbose_name_plural = 'feed entries'
+
+    def __unicode__(self):
+        ctx = {
+            'actor': self.actor,
+            'verb': self.verb,
+            'target': self.target,
+            'timesince': self.timesince()
+        }
+        if self.target:
+            return u'%(actor)s %(verb)s %(target)s %(timesince)s ago' % ctx
+        return u'%(actor)s %(verb)s %(timesince)s ago' % ctx
+
+    def timesince(self, now=None):
+        from django.utils.timesince import timesince as timesince_
+        return timesince_(self.timestamp, now)
+
+
+class QueuedEmailQuerySet(models.query.QuerySet):
+
+    def due(self):
+        "Return the emails waiting to be sent, oldest first"
+        return self.filter(attempts__lt=EMAIL_MAX_ATTEMPTS, send_after__lte=now()).order_by('send_after', 'id')
+
+    def failed(self):
+        "Return the emails given up on"
+        return self.filter(attempts__gte=EMAIL_MAX_ATTEMPTS)
+
+    def metrics(self):
+        """
+Return the depth of the queue: the number of emails waiting, of those
+waiting for a retry, of those given up on, and the age in seconds of
+the oldest email waiting.
+"""
+        waiting = self.filter(attempts__lt=EMAIL_MAX_ATTEMPTS)
+        oldest = waiting.aggregate(oldest=models.Min('created'))['oldest']
+        return {
+            'queued': waiting.count(),
+            'retrying': waiting.filter(attempts__gt=0).count(),
+            'failed': self.failed().count(),
+            'oldest_age': (now() - oldest).total_seconds() if oldest else 0,
+        }
+
+
+class QueuedEmail(models.Model):
+    """
+An email waiting to be sent by the sendqueuedmail command. Emails are
+deleted once sent.
+"""
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.TextField(help_text='Comma separated addresses')
+    created = models.DateTimeField(default=now)
+    send_after = models.DateTimeField(default=now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    objects = managers.PassThroughManager.for_queryset_class(QueuedEmailQuerySet)()
+
+    class Meta:
+        ordering = ('send_after', 'id')
+
+    def __unicode__(self):
+        return u'%s to %s' % (self.subject, self.to)
+
+    @classmethod
+    def from_message(cls, message):
+        "Return an unsaved queued email for a Django EmailMessage"
+        html_body = u''
+        for content, mimetype in getattr(message, 'alternatives', []):
+            if mimetype == 'text/html':
+                html_body = content
+        return cls(subject=message.subject, body=message.body, html_body=html_body,
+                   from_email=message.from_email, to=u','.join(message.to))
+
+    def message(self, connection=None):
+        "Return the EmailMessage to send"
+        message = EmailMultiAlternatives(self.subject, self.body, self.from_email,
+                                         self.to.split(','), connection=connection)
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        return message
+
+    def defer(self, error):
+        "Record a failed attempt and wait longer before the next one"
+        self.attempts += 1
+        minutes = min(2 ** (self.attempts - 1), EMAIL_RETRY_MAX_MINUTES)
+        self.send_after = now() + datetime.timedelta(minutes=minutes)
+        self.last_error = unicode(error)
+        self.save(update_fields=['attempts', 'send_after', 'last_error'])
+
+
+def queue_messages(messages):
+    """
+Queue Django EmailMessages to be sent by the sendqueuedmail command, with
+a single query. Sends them at once, over one connection, if
+NOTIFY_QUEUE_EMAIL is off.
+"""
+    messages = list(messages)
+    if not messages:
+        return
+    if not QUEUE_EMAIL:
+        get_connection().send_messages(messages)
+        return
+    QueuedEmail.objects.bulk_create([QueuedEmail.from_message(message) for message in messages])
+
+
+def queue_mail(subject, message, from_email, recipient_list, html_message=None):
+    """
+Like django.core.mail.send_mail, but queues the email.
+"""
+    email = EmailMultiAlternatives(subject, message, from_email, recipient_list)
+    if html_message:
+        email.attach_alternative(html_message, 'text/html')
+    queue_messages([email])
+
+
+def send_queued_mail(batch_size=EMAIL_BATCH_SIZE):
+    """
+Send a batch of due emails over a single connection. Emails which cannot
+be sent are retried later. Returns the numbers of emails sent and failed.
+"""
+    batch = list(QueuedEmail.objects.due()[:batch_size])
+    if not batch:
+        return 0, 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception, e:
+        # The mail server is unreachable, try the whole batch later
+        for email in batch:
+            email.defer(e)
+        return 0, len(batch)
+    sent = []
+    try:
+        for email in batch:
+            try:
+                email.message(connection).send()
+            except Exception, e:
+                email.defer(e)
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+    QueuedEmail.objects.filter(pk__in=sent).delete()
+    return len(sent), len(batch) - len(sent)
+
+
+def get_followers(actor, target=None):
+    """
+Return the pks of the users following an activity, as found by the
+NOTIFY_FEED_FOLLOWERS function.
+"""
+    if not FEED_FOLLOWERS:
+        return []
+    module_name, function_name = FEED_FOLLOWERS.rsplit('.', 1)
+    return getattr(import_module(module_name), function_name)(actor, target)
+
+
+def fan_out(recipients, actor, verb, target=None, description=None, timestamp=None, followers=True):
+    """
+Write an activity to the feeds of the recipients, users or their pks, and
+unless `followers` is False to those of the users following it. Feeds
+which got the same activity in the last FEED_DEDUPLICATION_MINUTES are
+skipped. Returns the number of entries written.
+"""
+    timestamp = timestamp or now()
+    actor_content_type = ContentType.objects.get_for_model(actor)
+    target_content_type = ContentType.objects.get_for_model(target) if target is not None else None
+    target_object_id = target.pk if target is not None else None
+    key = hashlib.sha1(u'|'.join(unicode(part) for part in (
+        actor_content_type.pk, actor.pk, verb, getattr(target_content_type, 'pk', ''),
+        target_object_id, description or ''
+    )).encode('utf-8')).hexdigest()
+
+    recipient_ids = set(getattr(recipient, 'pk', recipient) for recipient in recipients)
+    if followers:
+        recipient_ids.update(get_followers(actor, target))
+        if isinstance(actor, get_user_model()):
+            recipient_ids.discard(actor.pk)
+    if not recipient_ids:
+        return 0
+    recipient_ids.difference_update(FeedEntry.objects.filter(
+        activity_key=key, recipient__in=recipient_ids,
+        timestamp__gte=timestamp - datetime.timedelta(minutes=FEED_DEDUPLICATION_MINUTES)
+    ).values_list('recipient_id', flat=True))
+    FeedEntry.objects.bulk_create([
+        FeedEntry(
+            recipient_id=recipient_id,
+            actor_content_type=actor_content_type,
+            actor_object_id=actor.pk,
+            verb=unicode(verb),
+            description=description,
+            target_content_type=target_content_type,
+            target_object_id=target_object_id,
+            timestamp=timestamp,
+            activity_key=key,
+        ) for recipient_id in recipient_ids
+    ])
+    return len(recipient_ids)
+
+
 def notify_handler(verb, **kwargs):
     """
     Handler function to create Notification instance upon action signal call.
@@ -179,9 +566,11 @@ def notify_handler(verb, **kwargs):
         verb=unicode(verb),
         public=bool(kwargs.pop('public', True)),
         description=kwargs.pop('description', None),
-        timestamp=kwargs.pop('timestamp', now())
+        timestamp=kwargs.pop('timestamp', now()),
+        email_pending=wants_digest(recipient)
     )
 
+    target = kwargs.get('target')
     for opt in ('target', 'action_object'):
         obj = kwargs.pop(opt, None)
         if not obj is None:
@@ -193,18 +582,191 @@ def notify_handler(verb, **kwargs):
         newnotify.data = kwargs
 
     newnotify.save()
+    fan_out([recipient], actor, verb, target=target, description=newnotify.description,
+            timestamp=newnotify.timestamp)
 
     # Send email to recipient of notification
-    if not settings.DEBUG:
-        if newnotify.recipient.notify:
-            to = newnotify.recipient.email
-            from_email = 'acressity@acressity.com'
-            subject = 'New note on your Acressity journey'
-            text_content = render_to_string('notifications/email.txt', {'notice': newnotify})
-            html_content = render_to_string('notifications/email.html', {'notice': newnotify})
-            message = EmailMultiAlternatives(subject, text_content, from_email, [to])
-            message.attach_alternative(html_content, 'text/html')  # This will no longer be necessary in Django 1.7. Can be provided to send_mail as function parameter
-            message.send()
+    send_notification_emails([newnotify])
+
+
+def notify_many_handler(verb, **kwargs):
+    """
+    Handler function to create the Notification instances of all the
+    recipients of a notify.send_many call with a single query.
+    """
+
+    kwargs.pop('signal', None)
+    recipients = list(kwargs.pop('recipients'))
+    actor = kwargs.pop('sender')
+    public = bool(kwargs.pop('public', True))
+    description = kwargs.pop('description', None)
+    timestamp = kwargs.pop('timestamp', now())
+    objs = dict((opt, kwargs.pop(opt, None)) for opt in ('target', 'action_object'))
+    if not recipients:
+        return
+
+    notifications = []
+    for recipient in recipients:
+        newnotify = Notification(
+            recipient=recipient,
+            verb=unicode(verb),
+            public=public,
+            description=description,
+            timestamp=timestamp,
+            email_pending=wants_digest(recipient)
+        )
+        # Setting the generic relations also caches the objects, for the emails
+        newnotify.actor = actor
+        for opt, obj in objs.items():
+            if not obj is None:
+                setattr(newnotify, opt, obj)
+        if len(kwargs) and EXTRA_DATA:
+            newnotify.data = kwargs
+        notifications.append(newnotify)
+
+    Notification.objects.bulk_create(notifications)
+    deltas = defaultdict(int)
+    for newnotify in notifications:
+        deltas[newnotify.recipient_id] += 1
+    adjust_unread_counts(deltas)
+    fan_out(recipients, actor, verb, target=objs['target'], description=description,
+            timestamp=timestamp)
+    send_notification_emails(notifications)
+
+
+def counts_unread():
+    "Whether the user model keeps a count of unread notifications"
+    try:
+        get_user_model()._meta.get_field(UNREAD_COUNT_FIELD)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def unread_counts(notifications):
+    """
+    Return the number of notifications of each recipient in a queryset, by
+    recipient pk.
+    """
+    return dict((row['recipient'], row['count']) for row in
+                notifications.order_by().values('recipient').annotate(count=Count('id')))
+
+
+def adjust_unread_counts(deltas):
+    """
+    Add to the unread notification counts of users, given as a dict of the
+    change by user pk, with one UPDATE per distinct change.
+    """
+    if not counts_unread():
+        return
+    by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(pk)
+    for delta, pks in by_delta.items():
+        get_user_model()._default_manager.filter(pk__in=pks).update(
+            **{UNREAD_COUNT_FIELD: F(UNREAD_COUNT_FIELD) + delta})
+
+
+def update_unread_counts():
+    """
+    Recount the unread notifications of every user whose count is off.
+    Returns the number of users updated.
+    """
+    if not counts_unread():
+        return 0
+    counts = unread_counts(Notification.objects.unread())
+    users = get_user_model()._default_manager.order_by()
+    num_updated = 0
+    for pk, count in users.values_list('pk', UNREAD_COUNT_FIELD):
+        if count != counts.get(pk, 0):
+            users.filter(pk=pk).update(**{UNREAD_COUNT_FIELD: counts.get(pk, 0)})
+            num_updated += 1
+    return num_updated
+
+
+def wants_digest(recipient):
+    """
+    Whether the notifications of the recipient are emailed in digests rather
+    than as they happen.
+    """
+    return recipient.notify and getattr(recipient, 'notification_delivery', 'immediate') != 'immediate'
+
+
+def group_notifications(notifications):
+    """
+    Group notifications of the same actor, verb and target, in the order of
+    their first notification. Returns a list of dicts holding that first
+    notification and the number of notifications in the group.
+    """
+    groups = OrderedDict()
+    for notification in notifications:
+        action = (notification.actor_content_type_id, notification.actor_object_id, notification.verb,
+                  notification.target_content_type_id, notification.target_object_id)
+        if action not in groups:
+            groups[action] = {'notice': notification, 'count': 0}
+        groups[action]['count'] += 1
+    return groups.values()
+
+
+def send_digests(frequency):
+    """
+    Queue one email for each recipient with pending notifications whose
+    delivery policy falls under the given digest frequency, summing up their
+    unread notifications, and mark the notifications as delivered. Returns
+    the number of digests queued.
+    """
+    from acressity.utils import get_site_domain
+
+    pending = Notification.objects.filter(
+        email_pending=True, recipient__notification_delivery__in=DIGEST_DELIVERIES[frequency])
+    recipient_ids = pending.order_by().values_list('recipient', flat=True).distinct()
+    domain = get_site_domain()
+    num_sent = 0
+    for recipient_id in list(recipient_ids):
+        notifications = list(pending.filter(recipient=recipient_id).select_related('recipient')
+                             .prefetch_related('actor', 'target'))
+        recipient = notifications[0].recipient
+        groups = group_notifications(n for n in notifications if n.unread)
+        if groups and recipient.notify:
+            context = {'recipient': recipient, 'groups': groups, 'domain': domain}
+            message = EmailMultiAlternatives(
+                'Your Acressity journey: {0} new notifications'.format(sum(group['count'] for group in groups)),
+                render_to_string('notifications/digest.txt', context),
+                'acressity@acressity.com', [recipient.email])
+            message.attach_alternative(render_to_string('notifications/digest.html', context), 'text/html')
+            queue_messages([message])
+            num_sent += 1
+        Notification.objects.filter(pk__in=[n.pk for n in notifications]).update(email_pending=False)
+    return num_sent
+
+
+def send_notification_emails(notifications):
+    """
+    Queue emails of notifications to those of their recipients who want to be
+    notified. The emails of the recipients of the same action are only
+    rendered once.
+    """
+    if settings.DEBUG:
+        return
+    from_email = 'acressity@acressity.com'
+    subject = 'New note on your Acressity journey'
+    rendered = {}
+    messages = []
+    for newnotify in notifications:
+        if not newnotify.recipient.notify or newnotify.email_pending:
+            continue
+        action = (newnotify.actor_content_type_id, newnotify.actor_object_id, newnotify.verb,
+                  newnotify.target_content_type_id, newnotify.target_object_id, newnotify.description)
+        if action not in rendered:
+            rendered[action] = (render_to_string('notifications/email.txt', {'notice': newnotify}),
+                                render_to_string('notifications/email.html', {'notice': newnotify}))
+        text_content, html_content = rendered[action]
+        message = EmailMultiAlternatives(subject, text_content, from_email, [newnotify.recipient.email])
+        message.attach_alternative(html_content, 'text/html')  # This will no longer be necessary in Django 1.7. Can be provided to send_mail as function parameter
+        messages.append(message)
+    queue_messages(messages)
 
 # connect the signal
 notify.connect(notify_handler, dispatch_uid='notifications.models.notification')
+notify_many.connect(notify_many_handler, dispatch_uid='notifications.models.notification_many')
@@ -1,6 +1,22 @@
 from django.dispatch import Signal
 
-notify = Signal(providing_args=[
+notify_many = Signal(providing_args=[
+    'recipients', 'actor', 'verb', 'action_object', 'target', 'description',
+    'timestamp'
+])
+
+
+class NotifySignal(Signal):
+
+    def send_many(self, sender, recipients, **named):
+        """
+Notify all the recipients of the same action at once, rather than with
+one send per recipient. Sent through the notify_many signal.
+"""
+        return notify_many.send(sender=sender, recipients=recipients, **named)
+
+
+notify = NotifySignal(providing_args=[
     'recipient', 'actor', 'verb', 'action_object', 'target', 'description',
     'timestamp'
 ])
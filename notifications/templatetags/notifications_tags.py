@@ -2,6 +2,8 @@ from django.template import Library
 from django.template.base import TemplateSyntaxError
 from django.template import Node
 
+from notifications.models import UNREAD_COUNT_FIELD, counts_unread
+
 register = Library()
 
 
@@ -13,4 +15,6 @@ def notifications_unread(context):
     user = context['user']
     if user.is_anonymous():
         return ''
+    if counts_unread():
+        return max(getattr(user, UNREAD_COUNT_FIELD), 0)
     return user.notifications.unread().count()
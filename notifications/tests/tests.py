@@ -0,0 +1,163 @@
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.template import Context, Template
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+
+from experiences.models import Experience
+from explorers.models import Explorer
+from explorers.tests import helpers
+from notifications.models import Notification
+from notifications.signals import notify
+
+
+class SendManyTest(TestCase):
+    def setUp(self):
+        self.actor = helpers.create_test_explorer()
+        self.immediate = helpers.create_test_explorer()
+        self.daily = helpers.create_test_explorer()
+        self.daily.notification_delivery = 'daily'
+        self.daily.save()
+        self.experience = Experience.objects.create(title='Climb Mount Everest', author=self.actor)
+
+    def send_many(self):
+        notify.send_many(sender=self.actor, recipients=[self.immediate, self.daily],
+                target=self.experience, verb='has updated the experience')
+
+    def test_one_insert_for_every_recipient(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.send_many()
+
+        inserts = [q for q in queries if 'INSERT INTO "notifications_notification"' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_a_notification_per_recipient(self):
+        self.send_many()
+
+        for recipient in (self.immediate, self.daily):
+            notification = Notification.objects.get(recipient=recipient)
+            self.assertEqual(notification.actor, self.actor)
+            self.assertEqual(notification.target, self.experience)
+            self.assertEqual(notification.verb, 'has updated the experience')
+            self.assertTrue(notification.unread)
+
+    def test_email_pending_per_recipient(self):
+        self.send_many()
+
+        self.assertFalse(Notification.objects.get(recipient=self.immediate).email_pending)
+        self.assertTrue(Notification.objects.get(recipient=self.daily).email_pending)
+        self.assertEqual([message.to for message in mail.outbox], [[self.immediate.email]])
+
+    def test_no_recipients(self):
+        notify.send_many(sender=self.actor, recipients=[], verb='has updated the experience')
+
+        self.assertFalse(Notification.objects.exists())
+
+
+class UnreadCountTest(TestCase):
+    def setUp(self):
+        self.actor = helpers.create_test_explorer()
+        self.recipient = helpers.create_test_explorer()
+        self.other = helpers.create_test_explorer()
+
+    def send(self, recipient=None):
+        notify.send(self.actor, recipient=recipient or self.recipient, verb='is cheering for you')
+        return Notification.objects.latest('id')
+
+    def assertUnread(self, count, recipient=None):
+        recipient = Explorer.objects.get(pk=(recipient or self.recipient).pk)
+        self.assertEqual(recipient.unread_notifications, count)
+        self.assertEqual(recipient.notifications.unread().count(), count)
+
+    def test_new_notifications_are_counted(self):
+        self.send()
+        self.send()
+
+        self.assertUnread(2)
+        self.assertUnread(0, self.actor)
+
+    def test_mark_as_read_and_unread(self):
+        notification = self.send()
+
+        notification.mark_as_read()
+        notification.mark_as_read()
+        self.assertUnread(0)
+
+        notification.mark_as_unread()
+        notification.mark_as_unread()
+        self.assertUnread(1)
+
+    def test_mark_as_read_elsewhere(self):
+        notification = self.send()
+        Notification.objects.get(pk=notification.pk).mark_as_read()
+
+        notification.mark_as_read()
+
+        self.assertUnread(0)
+
+    def test_delete(self):
+        read = self.send()
+        read.mark_as_read()
+        self.send().delete()
+        self.send()
+
+        read.delete()
+
+        self.assertUnread(1)
+
+    def test_mark_all(self):
+        self.send()
+        self.send()
+        self.send(self.other)
+
+        Notification.objects.mark_all_as_read(self.recipient)
+        self.assertUnread(0)
+        self.assertUnread(1, self.other)
+
+        Notification.objects.mark_all_as_unread()
+        self.assertUnread(2)
+        self.assertUnread(1, self.other)
+
+        Notification.objects.mark_all_as_read()
+        self.assertUnread(0)
+        self.assertUnread(0, self.other)
+
+    def test_queryset_update_and_delete(self):
+        self.send()
+        self.send()
+        self.send(self.other)
+
+        Notification.objects.filter(recipient=self.recipient).update(unread=False)
+        self.assertUnread(0)
+        self.assertUnread(1, self.other)
+
+        Notification.objects.update(unread=True, public=False)
+        self.assertUnread(2)
+        self.assertUnread(1, self.other)
+
+        Notification.objects.filter(recipient=self.other).delete()
+        Notification.objects.filter(recipient=self.recipient)[0].mark_as_read()
+        Notification.objects.all().delete()
+        self.assertUnread(0)
+        self.assertUnread(0, self.other)
+
+    def test_template_tag(self):
+        self.send()
+        template = Template('{% load notifications_tags %}{% notifications_unread as count %}{{ count }}')
+
+        html = template.render(Context({'user': Explorer.objects.get(pk=self.recipient.pk)}))
+
+        self.assertEqual(html, '1')
+
+    def test_drift_is_fixed_by_command(self):
+        self.send()
+        Explorer.objects.filter(pk=self.recipient.pk).update(unread_notifications=5)
+        out = StringIO()
+
+        call_command('updateunreadcounts', stdout=out)
+
+        self.assertIn('counts of 1 users', out.getvalue())
+        self.assertUnread(1)
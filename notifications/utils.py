@@ -1,6 +1,35 @@
+import calendar
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+
 def slug2id(slug):
     return long(slug) - 110909
 
 
 def id2slug(id):
     return id + 110909
+
+
+def make_cursor(timestamp, id):
+    """
+Return an opaque cursor for keyset pagination, marking the position of
+the row with the given timestamp and id.
+"""
+    seconds = calendar.timegm(timestamp.utctimetuple())
+    return '%d-%d' % (seconds * 1000000 + timestamp.microsecond, id)
+
+
+def parse_cursor(cursor):
+    """
+Return the timestamp and id a cursor was made from. Raises ValueError for
+malformed cursors.
+"""
+    microseconds, id = [long(part) for part in cursor.split('-')]
+    timestamp = datetime.datetime.utcfromtimestamp(microseconds // 1000000).replace(
+        microsecond=microseconds % 1000000)
+    if settings.USE_TZ:
+        timestamp = timezone.make_aware(timestamp, timezone.utc)
+    return timestamp, id
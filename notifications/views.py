@@ -1,8 +1,6 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.shortcuts import get_object_or_404, render, redirect, render_to_response
-from django.template.context import RequestContext
+from django.shortcuts import get_object_or_404, render, redirect
 from django.core.urlresolvers import reverse
 from .utils import slug2id
 
@@ -14,33 +12,28 @@ def all(request):
     """
 Index page for authenticated user
 """
+    notifications, next_cursor = request.user.notifications.prefetch_objects().page(request.GET.get('before'))
     return render(request, 'notifications/list.html', {
-        'notifications': request.user.notifications.all()
+        'notifications': notifications,
+        'next_cursor': next_cursor,
     })
-    actions = request.user.notifications.all()
 
-    paginator = Paginator(actions, 16)  # Show 16 notifications per page
-    page = request.GET.get('p')
 
-    try:
-        action_list = paginator.page(page)
-    except PageNotAnInteger:
-        # If page is not an integer, deliver first page.
-        action_list = paginator.page(1)
-    except EmptyPage:
-        # If page is out of range (e.g. 9999), deliver last page of results.
-        action_list = paginator.page(paginator.num_pages)
-
-    return render_to_response('notifications/list.html', {
-        'member': request.user,
-        'action_list': action_list,
-    }, context_instance=RequestContext(request))
+@login_required
+def feed(request):
+    entries, next_cursor = request.user.feed.prefetch_related('actor', 'target').page(request.GET.get('before'))
+    return render(request, 'notifications/feed.html', {
+        'entries': entries,
+        'next_cursor': next_cursor,
+    })
 
 
 @login_required
 def unread(request):
+    notifications, next_cursor = request.user.notifications.unread().prefetch_objects().page(request.GET.get('before'))
     return render(request, 'notifications/list.html', {
-        'notifications': request.user.notifications.unread()
+        'notifications': notifications,
+        'next_cursor': next_cursor,
     })
 
 
@@ -41,11 +41,17 @@ class PhotoEffectAdmin(admin.ModelAdmin):
 
 
 class PhotoSizeAdmin(admin.ModelAdmin):
-    list_display = ('name', 'width', 'height', 'crop', 'pre_cache', 'effect', 'increment_count')
+    list_display = ('name', 'width', 'height', 'crop', 'pre_cache', 'effect', 'increment_count', 'family', 'output_format')
     fieldsets = (
         (None, {
             'fields': ('name', 'width', 'height', 'quality')
         }),
+        ('Responsive images', {
+            'fields': ('family', 'output_format')
+        }),
+        ('Encoding', {
+            'fields': ('subsampling', 'strip_metadata')
+        }),
         ('Options', {
             'fields': ('upscale', 'crop', 'pre_cache', 'increment_count')
         }),
@@ -59,6 +65,11 @@ class WatermarkAdmin(admin.ModelAdmin):
     list_display = ('name', 'opacity', 'style')
 
 
+class RenditionJobAdmin(admin.ModelAdmin):
+    list_display = ('content_type', 'object_pk', 'photosize', 'status', 'attempts', 'date_added')
+    list_filter = ['status', 'photosize']
+
+
 class GalleryUploadAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         return False  # To remove the 'Save and continue editing' button
@@ -70,3 +81,4 @@ admin.site.register(Photo, PhotoAdmin)
 admin.site.register(PhotoEffect, PhotoEffectAdmin)
 admin.site.register(PhotoSize, PhotoSizeAdmin)
 admin.site.register(Watermark, WatermarkAdmin)
+admin.site.register(RenditionJob, RenditionJobAdmin)
@@ -0,0 +1,7 @@
+""" Benchmarks of the Photologue rendering pipeline.
+
+Synthetic images are generated at the requested resolutions (see `corpus`),
+each stage of the pipeline is timed on them (see `stages`) and the results
+are written as JSON that later runs can be compared against (see `runner`).
+Run them with the `plbenchmark` management command.
+"""
@@ -0,0 +1,60 @@
+""" Synthetic images to benchmark the rendering pipeline on.
+
+Images are made of noise over gradients, so they compress about as badly as
+photographs do and decoding them costs about as much.
+"""
+import os
+
+try:
+    import Image
+    import ImageChops
+except ImportError:
+    from PIL import Image
+    from PIL import ImageChops
+
+# File extension of each format images can be generated in.
+EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png'}
+
+
+def parse_resolution(value):
+    """Returns the (width, height) of a resolution written as "1920x1080"."""
+    try:
+        width, height = [int(part) for part in value.lower().split('x')]
+    except ValueError:
+        raise ValueError('Invalid resolution "%s", expected WIDTHxHEIGHT' % value)
+    return (width, height)
+
+
+def gradient():
+    """Returns a 1x256 black to white gradient."""
+    return Image.frombytes('L', (1, 256), str(bytearray(range(256))))
+
+
+def make_image(size, seed=0):
+    """Returns an RGB image of `size` with photograph-like detail."""
+    bands = []
+    for band in range(3):
+        noise = Image.effect_noise(size, 32 + 8 * band)
+        ramp = gradient().resize((256, 256)).rotate(90 * ((seed + band) % 4)).resize(size)
+        bands.append(ImageChops.add(ImageChops.multiply(ramp, noise), noise, 2.0))
+    return Image.merge('RGB', bands)
+
+
+def make_corpus(directory, resolutions, formats, count=1):
+    """Writes `count` images per resolution and format to `directory`.
+
+    Returns a list of (path, format, (width, height)) tuples.
+    """
+    corpus = []
+    for size in resolutions:
+        for index in range(count):
+            im = make_image(size, index)
+            for im_format in formats:
+                path = os.path.join(directory, '%dx%d-%d%s' % (size[0], size[1], index,
+                                                              EXTENSIONS[im_format]))
+                if im_format == 'JPEG':
+                    im.save(path, im_format, quality=90)
+                else:
+                    im.save(path, im_format)
+                corpus.append((path, im_format, size))
+    return corpus
@@ -0,0 +1,103 @@
+""" Runs the benchmarks and compares their results between runs.
+
+Every stage is run on every corpus image in a process of its own, so that the
+peak memory use reported for it is its own.
+"""
+import json
+import multiprocessing
+import platform
+import resource
+import time
+
+from django.utils import timezone
+
+from photologue.benchmarks.stages import STAGES
+from photologue.models import Image
+
+
+def run_case(case):
+    """Times one stage on one image. Runs in a worker process."""
+    stage_name, path, im_format, size, repeat = case
+    stage = dict(STAGES)[stage_name]
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    run = stage(path)
+    timings = []
+    for i in range(repeat):
+        start = time.time()
+        run()
+        timings.append(time.time() - start)
+        if hasattr(run, 'reset'):
+            run.reset()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = min(timings)
+    megapixels = size[0] * size[1] / 1000000.0
+    return {
+        'stage': stage_name,
+        'format': im_format,
+        'resolution': '%dx%d' % size,
+        'runs': repeat,
+        'best_ms': round(best * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'ms_per_megapixel': round(best * 1000 / megapixels, 3),
+        'peak_rss_kb': peak_rss,
+        'rss_growth_kb': peak_rss - baseline_rss,
+    }
+
+
+def run(corpus, stages=None, repeat=3):
+    """Runs the stages on every image of the corpus.
+
+    `corpus` is a list of (path, format, (width, height)) tuples as returned
+    by `corpus.make_corpus`. Returns the results as a dictionary ready to be
+    written as JSON.
+    """
+    stages = stages or [name for name, stage in STAGES]
+    cases = [(stage, path, im_format, size, repeat)
+             for path, im_format, size in corpus for stage in stages]
+    # A fresh process for every case, so peak memory use is not carried over
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    try:
+        results = pool.map(run_case, cases, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return {
+        'date': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'pil': getattr(Image, 'PILLOW_VERSION', getattr(Image, 'VERSION', '')),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def result_key(result):
+    return (result['stage'], result['format'], result['resolution'])
+
+
+def compare(baseline, results, threshold=0.1):
+    """Compares results to a baseline run, per stage, format and resolution.
+
+    Returns a list of (key, baseline ms per megapixel, ms per megapixel,
+    relative change, regressed) tuples, where regressed is True when the
+    stage got slower by more than `threshold`.
+    """
+    before = dict((result_key(result), result) for result in baseline['results'])
+    comparison = []
+    for result in results['results']:
+        key = result_key(result)
+        if key not in before:
+            continue
+        old, new = before[key]['ms_per_megapixel'], result['ms_per_megapixel']
+        change = (new - old) / old if old else 0.0
+        comparison.append((key, old, new, change, change > threshold))
+    return comparison
+
+
+def write(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
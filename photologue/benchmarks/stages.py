@@ -0,0 +1,101 @@
+""" The stages of the rendering pipeline, as benchmarked.
+
+Each stage is a function taking the path of a corpus image and returning a
+callable that runs the stage once. Setup, such as decoding the image for the
+stages working on decoded images, happens before the callable is returned and
+is not timed, and neither is the `reset` attribute of the callable, if any,
+which is called between runs.
+"""
+import shutil
+import tempfile
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+from django.core.files.storage import FileSystemStorage
+
+from photologue import stores
+from photologue.index import RenditionIndex
+from photologue.models import Image, Photo, PhotoEffect, PhotoSize
+from photologue.utils.reflection import add_reflection
+from photologue.utils.watermark import apply_watermark, reduce_opacity
+
+# Sizes rendered by the resize and create_sizes stages, like a typical site's
+# thumbnail, display and full screen sizes.
+PHOTOSIZES = [
+    PhotoSize(name='thumbnail', width=150, height=150, crop=True),
+    PhotoSize(name='display', width=800, height=0),
+    PhotoSize(name='large', width=1600, height=1200),
+]
+
+
+def open_image(path):
+    im = Image.open(path)
+    im.load()
+    return im
+
+
+def decode(path):
+    return lambda: open_image(path)
+
+
+def resize(path):
+    im = open_image(path)
+    photo = Photo()
+    return lambda: [photo.resize_image(im, photosize) for photosize in PHOTOSIZES]
+
+
+def effect(path):
+    im = open_image(path)
+    photo_effect = PhotoEffect(color=0.5, brightness=1.1, contrast=1.2, sharpness=1.5)
+    return lambda: photo_effect.pre_process(im)
+
+
+def watermark(path):
+    im = open_image(path)
+    mark = reduce_opacity(Image.new('RGBA', (64, 32), (255, 255, 255, 255)), 0.5)
+    return lambda: apply_watermark(im, mark, 'tile')
+
+
+def reflection(path):
+    im = open_image(path)
+    return lambda: add_reflection(im, bgcolor='#FFFFFF', amount=0.4, opacity=0.6)
+
+
+def encode(path):
+    im = open_image(path).convert('RGB')
+    return lambda: im.save(StringIO(), 'JPEG', quality=70, optimize=True)
+
+
+def create_sizes(path):
+    # Renders to a throwaway store, removing the renditions after every run
+    # so that each run renders all sizes again
+    directory, filename = path.rsplit('/', 1)
+    output = tempfile.mkdtemp(prefix='plbenchmark-')
+    stores._store = stores.LocalRenditionStore(FileSystemStorage(location=output),
+                                               index=RenditionIndex())
+    photo = Photo()
+    photo.image = filename
+    photo.image.storage = FileSystemStorage(location=directory)
+
+    def run():
+        photo.create_sizes(PHOTOSIZES)
+
+    def reset():
+        shutil.rmtree(output, ignore_errors=True)
+        stores._store.index = RenditionIndex()
+    run.reset = reset
+    return run
+
+
+STAGES = (
+    ('decode', decode),
+    ('resize', resize),
+    ('effect', effect),
+    ('watermark', watermark),
+    ('reflection', reflection),
+    ('encode', encode),
+    ('create_sizes', create_sizes),
+)
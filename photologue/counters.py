@@ -0,0 +1,69 @@
+""" Buffered view counting.
+
+Photo sizes with increment_count set count a view every time their URL is
+looked up, usually from a template. Rather than saving the photo each time,
+views are added up in memory and written out every few seconds with one
+UPDATE per model and view count. Counts which cannot be written, such as
+after a request broke its database connection, are kept for the next flush.
+"""
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+# Seconds between writes of the buffered view counts, 0 to write every view.
+FLUSH_INTERVAL = getattr(settings, 'PHOTOLOGUE_VIEW_COUNT_INTERVAL', 10)
+
+# Write the buffered view counts when the process exits.
+FLUSH_AT_EXIT = getattr(settings, 'PHOTOLOGUE_VIEW_COUNT_FLUSH_AT_EXIT', True)
+
+
+class ViewCounter(object):
+    """Adds up views per object until they are flushed to the database."""
+
+    def __init__(self, interval=FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._flushed = time.time()
+
+    def add(self, obj, count=1):
+        with self._lock:
+            self._pending[obj.__class__][obj.pk] += count
+        self.flush_due()
+
+    def flush_due(self, **kwargs):
+        if time.time() - self._flushed >= self.interval:
+            self.flush()
+
+    def flush(self, **kwargs):
+        """Writes the buffered views, one UPDATE per model and view count."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+            self._flushed = time.time()
+        for model, counts in pending.items():
+            by_count = defaultdict(list)
+            for pk, count in counts.items():
+                by_count[count].append(pk)
+            for count, pks in by_count.items():
+                try:
+                    with transaction.atomic():
+                        model._default_manager.filter(pk__in=pks).update(view_count=F('view_count') + count)
+                except DatabaseError:
+                    with self._lock:
+                        for pk in pks:
+                            self._pending[model][pk] += count
+
+
+view_counter = ViewCounter()
+# Flush at the end of requests too, so views are written even when no more
+# come in. This runs after Django's own receivers, so a flush may reopen a
+# connection Django has just closed.
+request_finished.connect(view_counter.flush_due, dispatch_uid='photologue.counters.flush_due')
+if FLUSH_AT_EXIT:
+    atexit.register(view_counter.flush)
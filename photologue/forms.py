@@ -1,9 +1,11 @@
 from django import forms
 from django.forms import ModelForm
+from django.forms.extras.widgets import SelectDateWidget
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
 
-from photologue.models import Photo, Gallery
+from photologue.models import Photo, Gallery, NORMALIZE_ORIGINALS
 from narratives.models import Narrative
 
 
@@ -18,9 +20,22 @@ class GalleryPhotoForm(ModelForm):
             title = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
         return title
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if NORMALIZE_ORIGINALS and image and not getattr(image, '_committed', False):
+            # Normalize while validating, so an upload which cannot be
+            # decoded is reported with the form rather than failing on save
+            self.instance.image = image
+            try:
+                self.instance.normalize_image()
+            except (IOError, SyntaxError, ValueError):
+                raise forms.ValidationError(_('The image could not be read.'))
+            image = self.instance.image
+        return image
+
 
 class GalleryForm(ModelForm):
-    date_added = forms.DateField(widget=forms.extras.widgets.SelectDateWidget())
+    date_added = forms.DateField(widget=SelectDateWidget())
 
     def __init__(self, gallery, *args, **kwargs):
         # initial = {'experience': ''}
@@ -0,0 +1,98 @@
+""" Index of the renditions known to exist.
+
+Looking up a rendition URL used to stat the rendition file every time. The
+rendition store records every rendition it writes or finds here instead, so
+the warm path of a gallery page does no filesystem calls at all.
+
+By default the index lives in the memory of each process. That is enough for
+a single process, but a process cannot see renditions removed by another one.
+Deployments running several processes should share the index through a
+Django cache by naming its alias in PHOTOLOGUE_RENDITION_INDEX_CACHE.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.utils.encoding import smart_str
+
+# Alias of the Django cache shared between processes, None for an in-process index.
+INDEX_CACHE = getattr(settings, 'PHOTOLOGUE_RENDITION_INDEX_CACHE', None)
+
+# Seconds an entry is kept in the shared cache, None to keep it until removed.
+INDEX_TIMEOUT = getattr(settings, 'PHOTOLOGUE_RENDITION_INDEX_TIMEOUT', None)
+
+# Number of entries the in-process index holds before starting over.
+INDEX_SIZE = getattr(settings, 'PHOTOLOGUE_RENDITION_INDEX_SIZE', 100000)
+
+
+class RenditionIndex(object):
+    """Remembers renditions, by name, in the memory of this process."""
+
+    shared = False
+
+    def __init__(self, size=INDEX_SIZE):
+        self.size = size
+        self._names = set()
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def add(self, name):
+        with self._lock:
+            if len(self._names) >= self.size:
+                self._names.clear()
+            self._names.add(name)
+
+    def discard(self, name):
+        with self._lock:
+            self._names.discard(name)
+
+    def contains_many(self, names):
+        """Returns the subset of `names` found in the index."""
+        return set(name for name in names if name in self._names)
+
+
+class CachedRenditionIndex(RenditionIndex):
+    """Shares the index between processes through a Django cache.
+
+    Every lookup is a cache round trip rather than a stat call, so a
+    rendition removed by one process is seen as missing by all of them.
+    """
+
+    shared = True
+
+    def __init__(self, alias, timeout=INDEX_TIMEOUT):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def key(self, name):
+        return 'photologue.rendition.%s' % hashlib.sha1(smart_str(name)).hexdigest()
+
+    def __contains__(self, name):
+        return bool(self.cache.get(self.key(name)))
+
+    def add(self, name):
+        self.cache.set(self.key(name), 1, self.timeout)
+
+    def discard(self, name):
+        self.cache.delete(self.key(name))
+
+    def contains_many(self, names):
+        keys = dict((self.key(name), name) for name in names)
+        return set(keys[key] for key in self.cache.get_many(keys.keys()))
+
+
+_index = None
+
+
+def get_rendition_index():
+    """Returns the rendition index of this process, created on first use."""
+    global _index
+    if _index is None:
+        if INDEX_CACHE:
+            _index = CachedRenditionIndex(INDEX_CACHE)
+        else:
+            _index = RenditionIndex()
+    return _index
@@ -0,0 +1,254 @@
+""" Streaming import of .zip archives of images into a gallery.
+
+Archive members are copied to a spool directory one block at a time, checked
+in a pool of worker processes and inserted with a single bulk query, so an
+archive of thousands of photos never has to fit in memory.
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+from itertools import imap
+
+from django.core.files import File
+from django.db import transaction
+from django.template.defaultfilters import slugify
+from django.utils import timezone
+
+from photologue.models import (Image, Photo, PhotoMetadata, PhotoSizeCache, RenditionJob,
+                               archive_original, exif_metadata, file_digest, read_exif,
+                               INGEST_WORKERS, NORMALIZE_MAX_DIMENSION, NORMALIZE_ORIGINALS,
+                               NORMALIZE_QUALITY, NORMALIZE_STRIP_EXIF, ORIGINAL_ARCHIVE_STORAGE,
+                               QUEUE_RENDITIONS)
+from photologue.utils.normalize import normalize
+from photologue.workers import get_pool, cache_image, in_transaction
+
+# Size of the blocks archive members are spooled to disk in.
+SPOOL_BLOCK_SIZE = 64 * 2 ** 10
+
+
+class IngestReport(object):
+    """Outcome of an import, file by file."""
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = []
+
+    def add_success(self, filename, photo):
+        self.succeeded.append((filename, photo))
+
+    def add_failure(self, filename, reason):
+        self.failed.append((filename, reason))
+
+    def __unicode__(self):
+        return u'%d photos imported, %d files skipped' % (len(self.succeeded), len(self.failed))
+
+    def __str__(self):
+        return self.__unicode__()
+
+
+def normalize_spooled(path):
+    """Normalizes a spooled image in place, archiving it first when an archive
+    storage is set.
+
+    Returns a tuple of (path, archived original name), the path changing
+    with the format of the image, or None if the image was left as it was.
+    """
+    with open(path, 'rb') as f:
+        result = normalize(f, NORMALIZE_MAX_DIMENSION, NORMALIZE_STRIP_EXIF, NORMALIZE_QUALITY)
+        if result is None:
+            return None
+        original_archive = archive_original(File(f)) if ORIGINAL_ARCHIVE_STORAGE else ''
+    data, format = result
+    root, ext = os.path.splitext(path)
+    if ext not in [e for e, f in Image.EXTENSION.items() if f == format]:
+        os.remove(path)
+        path = root + '.jpg'
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path, original_archive
+
+
+def check_image(path):
+    """Validates a spooled image, normalizing it when NORMALIZE_ORIGINALS is
+    set. Runs in a worker process.
+
+    Returns a tuple of (path, error, PhotoMetadata fields, image digest,
+    archived original name).
+    """
+    try:
+        # load() is the only method that can spot a truncated JPEG,
+        # but it cannot be called sanely after verify()
+        trial_image = Image.open(path)
+        trial_image.load()
+        # verify() is the only method that can spot a corrupt PNG,
+        # but it must be called immediately after the constructor
+        trial_image = Image.open(path)
+        trial_image.verify()
+    except Exception, e:
+        return (path, str(e) or 'not a valid image', None, None, None)
+    metadata = exif_metadata(read_exif(path))
+    original_archive = ''
+    if NORMALIZE_ORIGINALS:
+        try:
+            normalized = normalize_spooled(path)
+        except Exception, e:
+            return (path, str(e) or 'not a valid image', None, None, None)
+        if normalized is not None:
+            path, original_archive = normalized
+            # The normalized image is upright
+            metadata['orientation'] = 1
+    with open(path, 'rb') as f:
+        digest = file_digest(File(f))
+    return (path, None, metadata, digest, original_archive)
+
+
+class ZipIngest(object):
+    def __init__(self, path, gallery, title, caption='', is_public=True, tags='', workers=None):
+        self.path = path
+        self.gallery = gallery
+        self.title = title
+        self.caption = caption
+        self.is_public = is_public
+        self.tags = tags
+        self.workers = max(1, workers or INGEST_WORKERS)
+        self.report = IngestReport()
+
+    def run(self):
+        spool_dir = tempfile.mkdtemp(prefix='photologue-')
+        # Inside a transaction, as in a request with ATOMIC_REQUESTS, the
+        # archive is processed in this process
+        pool = get_pool(self.workers) if self.workers > 1 and not in_transaction() else None
+        try:
+            spooled = self.spool(spool_dir)
+            photos = self.check(spooled, pool)
+            photos = self.insert(photos)
+            self.render(photos, pool)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+            shutil.rmtree(spool_dir, ignore_errors=True)
+        return self.report
+
+    def spool(self, spool_dir):
+        """Copies each archive member to the spool directory.
+
+        Returns a list of (archive filename, spooled path) tuples.
+        """
+        spooled = []
+        archive = zipfile.ZipFile(self.path)
+        try:
+            members = sorted(archive.infolist(), key=lambda info: info.filename)
+            for index, info in enumerate(members):
+                filename = info.filename
+                if filename.startswith('__') or filename.endswith('/'):  # do not process meta files
+                    continue
+                if not info.file_size:
+                    self.report.add_failure(filename, 'empty file')
+                    continue
+                path = os.path.join(spool_dir, '%05d%s' % (index, os.path.splitext(filename)[1].lower()))
+                try:
+                    with archive.open(info) as src, open(path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, SPOOL_BLOCK_SIZE)
+                except (zipfile.BadZipfile, IOError, RuntimeError), e:
+                    self.report.add_failure(filename, str(e))
+                    continue
+                spooled.append((filename, path))
+        finally:
+            archive.close()
+        return spooled
+
+    def check(self, spooled, pool):
+        """Validates the spooled files, returning unsaved photos for the good ones."""
+        paths = [path for filename, path in spooled]
+        results = pool.imap(check_image, paths) if pool else imap(check_image, paths)
+        slugs = self.slugs()
+        photos = []
+        for (filename, _), (path, error, metadata, digest, original_archive) in zip(spooled, results):
+            if error:
+                # if a "bad" file is found we just skip it.
+                self.report.add_failure(filename, error)
+                continue
+            title, slug = slugs.next()
+            photo = Photo(title=title,
+                          title_slug=slug,
+                          caption=self.caption,
+                          is_public=self.is_public,
+                          tags=self.tags,
+                          gallery=self.gallery,
+                          date_taken=metadata['date_taken'] or timezone.now(),
+                          image_digest=digest,
+                          original_archive=original_archive)
+            photo._ingest = (filename, path)
+            photo._metadata = metadata
+            photos.append(photo)
+        return photos
+
+    def slugs(self):
+        """Yields unused (title, slug) pairs, looking up the taken slugs once."""
+        taken = set(Photo.objects.filter(title_slug__startswith=slugify(self.title))
+                                 .values_list('title_slug', flat=True))
+        count = 1
+        while True:
+            title = ' '.join([self.title, str(count)])
+            slug = slugify(title)
+            count += 1
+            if slug not in taken:
+                yield title, slug
+
+    def insert(self, photos):
+        """Stores the images and inserts the photos with one query."""
+        storage = Photo._meta.get_field('image').storage
+        field = Photo._meta.get_field('image')
+        stored = []
+        try:
+            for photo in photos:
+                filename, path = photo._ingest
+                root, ext = os.path.splitext(os.path.basename(filename))
+                if ext.lower() != os.path.splitext(path)[1]:
+                    # Normalizing changed the format
+                    ext = os.path.splitext(path)[1]
+                with open(path, 'rb') as f:
+                    name = storage.save(field.generate_filename(photo, root + ext), File(f))
+                stored.append(name)
+                photo.image = name
+            with transaction.atomic():
+                Photo.objects.bulk_create(photos)
+        except Exception:
+            for name in stored:
+                storage.delete(name)
+            raise
+        # bulk_create does not set primary keys on every database
+        saved = dict((photo.title_slug, photo) for photo in
+                     Photo.objects.filter(gallery=self.gallery,
+                                          title_slug__in=[photo.title_slug for photo in photos]))
+        for photo in photos:
+            saved_photo = saved.get(photo.title_slug)
+            if saved_photo is None:
+                self.report.add_failure(photo._ingest[0], 'photo was not saved')
+            else:
+                self.report.add_success(photo._ingest[0], saved_photo)
+                saved_photo._metadata = photo._metadata
+        imported = [photo for filename, photo in self.report.succeeded]
+        PhotoMetadata.objects.bulk_create([PhotoMetadata(photo=photo, **photo._metadata)
+                                           for photo in imported])
+        return imported
+
+    def render(self, photos, pool):
+        """Creates the pre-cached sizes of the imported photos."""
+        photosizes = [photosize for photosize in PhotoSizeCache().sizes.values() if photosize.pre_cache]
+        if not photosizes or not photos:
+            return
+        if QUEUE_RENDITIONS:
+            for photo in photos:
+                RenditionJob.objects.enqueue(photo, photosizes)
+            return
+        size_ids = tuple(sorted(photosize.pk for photosize in photosizes))
+        filenames = dict((photo.pk, filename) for filename, photo in self.report.succeeded)
+        tasks = [(photo._meta.app_label, photo._meta.model_name, photo.pk, size_ids, False)
+                 for photo in photos]
+        results = pool.imap_unordered(cache_image, tasks) if pool else imap(cache_image, tasks)
+        for app_label, model_name, pk, written, error in results:
+            if error:
+                self.report.add_failure(filenames[pk], error)
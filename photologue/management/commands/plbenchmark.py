@@ -0,0 +1,80 @@
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from photologue.benchmarks import corpus, runner
+from photologue.benchmarks.stages import STAGES
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the stages of the Photologue rendering pipeline on generated images.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resolutions', dest='resolutions', default='640x480,1920x1080,4000x3000',
+                            help='Comma separated resolutions of the generated images')
+        parser.add_argument('--formats', dest='formats', default='JPEG,PNG',
+                            help='Comma separated formats of the generated images')
+        parser.add_argument('--count', dest='count', type=int, default=1,
+                            help='Number of images per resolution and format')
+        parser.add_argument('--stages', dest='stages', default='',
+                            help='Comma separated stages to run, out of %s' % ', '.join(
+                                name for name, stage in STAGES))
+        parser.add_argument('--repeat', dest='repeat', type=int, default=3,
+                            help='Number of runs of each stage per image, the best is kept')
+        parser.add_argument('--output', '-o', dest='output', default=None,
+                            help='File to write the results to as JSON')
+        parser.add_argument('--compare', dest='compare', default=None,
+                            help='JSON results of an earlier run to compare against')
+        parser.add_argument('--threshold', dest='threshold', type=float, default=0.1,
+                            help='Relative slowdown over the earlier run that counts as a regression')
+
+    def handle(self, *args, **options):
+        return benchmark(options, self.stdout)
+
+
+def split(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def benchmark(options, stdout):
+    """
+    Benchmarks the rendering pipeline
+    """
+    try:
+        resolutions = [corpus.parse_resolution(value) for value in split(options['resolutions'])]
+    except ValueError, e:
+        raise CommandError(str(e))
+    formats = [value.upper() for value in split(options['formats'])]
+    for im_format in formats:
+        if im_format not in corpus.EXTENSIONS:
+            raise CommandError('Unsupported format "%s"' % im_format)
+    stages = split(options['stages'])
+    for stage in stages:
+        if stage not in dict(STAGES):
+            raise CommandError('Unknown stage "%s"' % stage)
+
+    directory = tempfile.mkdtemp(prefix='plbenchmark-')
+    try:
+        images = corpus.make_corpus(directory, resolutions, formats, options['count'])
+        results = runner.run(images, stages, max(1, options['repeat']))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for result in results['results']:
+        stdout.write('%(stage)-13s %(format)-5s %(resolution)10s %(best_ms)10.1f ms '
+                     '%(ms_per_megapixel)9.1f ms/MP %(peak_rss_kb)9d KB peak' % result)
+    if options['output']:
+        runner.write(results, options['output'])
+
+    if options['compare']:
+        regressions = 0
+        for key, old, new, change, regressed in runner.compare(runner.read(options['compare']), results,
+                                                             options['threshold']):
+            stdout.write('%-13s %-5s %10s %9.1f -> %9.1f ms/MP %+6.1f%%%s'
+                         % (key + (old, new, change * 100, ' REGRESSION' if regressed else '')))
+            regressions += regressed
+        if regressions:
+            raise CommandError('%d stages got slower than the earlier run' % regressions)
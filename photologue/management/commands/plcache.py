@@ -1,26 +1,60 @@
+import os
+import time
+from itertools import imap
+
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from optparse import make_option
-from photologue.models import PhotoSize, ImageModel
+from photologue.models import PhotoSize, ImageModel, PHOTOLOGUE_DIR, claim_sweep
+from photologue.workers import get_pool, cache_image, sweep_renditions
 
-class Command(BaseCommand):
-    option_list = BaseCommand.option_list + (
-        make_option('--reset', '-r', action='store_true', dest='reset', help='Reset photo cache before generating'),
-    )
+# Default location of the file recording which images are done, so that an
+# interrupted run picks up where it left off.
+CHECKPOINT_PATH = os.path.join(settings.MEDIA_ROOT, PHOTOLOGUE_DIR, '.plcache')
+
+# Seconds between progress reports.
+PROGRESS_INTERVAL = 10
 
+
+class Command(BaseCommand):
     help = ('Manages Photologue cache file for the given sizes.')
-    args = '[sizes]'
 
     requires_model_validation = True
     can_import_settings = True
 
+    def add_arguments(self, parser):
+        parser.add_argument('sizes', nargs='*')
+        parser.add_argument('--reset', '-r', action='store_true', dest='reset', default=False,
+                            help='Reset photo cache before generating')
+        parser.add_argument('--workers', '-w', dest='workers', type=int, default=1,
+                            help='Number of worker processes')
+        parser.add_argument('--checkpoint', dest='checkpoint', default=CHECKPOINT_PATH,
+                            help='File recording finished images so an interrupted run can resume')
+        parser.add_argument('--restart', action='store_true', dest='restart', default=False,
+                            help='Ignore the checkpoint of a previous run')
+
     def handle(self, *args, **options):
-        return create_cache(args, options)
+        return create_cache(options['sizes'], options, self.stdout, self.stderr)
+
 
-def create_cache(sizes, options):
+def read_checkpoint(path, header):
+    """
+    Returns the images finished by a previous run for the same sizes.
+    """
+    if not os.path.isfile(path):
+        return set()
+    with open(path) as checkpoint:
+        if checkpoint.readline().strip() != header:
+            return set()
+        return set(line.strip() for line in checkpoint)
+
+
+def create_cache(sizes, options, stdout, stderr):
     """
     Creates the cache for the given files
     """
-    reset = options.get('reset', None)
+    reset = options.get('reset', False)
+    workers = max(1, options.get('workers') or 1)
+    checkpoint_path = options.get('checkpoint') or CHECKPOINT_PATH
 
     size_list = [size.strip(' ,') for size in sizes]
 
@@ -32,12 +66,63 @@ def create_cache(sizes, options):
     if not len(sizes):
         raise CommandError('No photo sizes were found.')
 
-    print 'Caching photos, this may take a while...'
+    if claim_sweep():
+        # A photo size or effect changed and no plworker has swept since
+        removed, queued = sweep_renditions()
+        stdout.write('Removed %d old renditions' % removed)
+
+    size_ids = tuple(sorted(size.pk for size in sizes))
+    header = ' '.join([str(pk) for pk in size_ids] + (['reset'] if reset else []))
+    done = set() if options.get('restart') else read_checkpoint(checkpoint_path, header)
 
+    tasks = []
     for cls in ImageModel.__subclasses__():
-        for photosize in sizes:
-            print 'Cacheing %s size images' % photosize.name
-            for obj in cls.objects.all():
-                if reset:
-                    obj.remove_size(photosize)
-                obj.create_size(photosize)
+        app_label, model_name = cls._meta.app_label, cls._meta.model_name
+        for pk in cls.objects.values_list('pk', flat=True):
+            if '%s.%s:%s' % (app_label, model_name, pk) not in done:
+                tasks.append((app_label, model_name, pk, size_ids, reset))
+
+    stdout.write('Caching %s size images for %d photos (%d already done), this may take a while...' %
+                 (', '.join(size.name for size in sizes), len(tasks), len(done)))
+
+    checkpoint_dir = os.path.dirname(checkpoint_path)
+    if checkpoint_dir and not os.path.isdir(checkpoint_dir):
+        os.makedirs(checkpoint_dir)
+    checkpoint = open(checkpoint_path, 'a' if done else 'w')
+    if not done:
+        checkpoint.write(header + '\n')
+
+    pool = get_pool(workers) if workers > 1 else None
+    results = pool.imap_unordered(cache_image, tasks, chunksize=4) if pool else imap(cache_image, tasks)
+    started = last_report = time.time()
+    count = failed = written = 0
+    try:
+        for app_label, model_name, pk, size_written, error in results:
+            count += 1
+            written += size_written
+            if error:
+                failed += 1
+                stderr.write(error)
+            else:
+                checkpoint.write('%s.%s:%s\n' % (app_label, model_name, pk))
+                checkpoint.flush()
+            if time.time() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.time()
+                stdout.write(progress(count, len(tasks), written, last_report - started))
+    finally:
+        checkpoint.close()
+        if pool:
+            pool.close()
+            pool.join()
+
+    stdout.write(progress(count, len(tasks), written, time.time() - started))
+    if failed:
+        stdout.write('%d photos failed and will be retried on the next run' % failed)
+    else:
+        os.remove(checkpoint_path)
+
+
+def progress(count, total, written, elapsed):
+    elapsed = max(elapsed, 0.001)
+    return '%d/%d photos, %.1f images/sec, %.1f MB written (%.1f MB/sec)' % (
+        count, total, count / elapsed, written / 2.0 ** 20, written / 2.0 ** 20 / elapsed)
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from photologue.index import get_rendition_index
+from photologue.models import PhotoSize, ImageModel
+from photologue.stores import get_rendition_store
+
+# Number of renditions looked up in the index at once.
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Compares the shared Photologue rendition index with the rendition store.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('sizes', nargs='*')
+        parser.add_argument('--fix', action='store_true', dest='fix', default=False,
+                            help='Drop stale entries and add missing ones')
+
+    def handle(self, *args, **options):
+        return check_index(options['sizes'], options, self.stdout)
+
+
+def rendition_names(sizes):
+    """
+    Yields the name of every rendition of the given sizes
+    """
+    for cls in ImageModel.__subclasses__():
+        for obj in cls.objects.only('pk', 'image').iterator():
+            if not obj.image:
+                continue
+            for photosize in sizes:
+                yield obj._get_rendition_name(photosize)
+
+
+def batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def check_index(sizes, options, stdout):
+    """
+    Checks every rendition of the given sizes against the index
+    """
+    index = get_rendition_index()
+    if not index.shared:
+        raise CommandError('The rendition index is kept in the memory of each process, '
+                           'set PHOTOLOGUE_RENDITION_INDEX_CACHE to share it.')
+    store = get_rendition_store()
+
+    size_list = [size.strip(' ,') for size in sizes]
+    if len(size_list) < 1:
+        sizes = PhotoSize.objects.all()
+    else:
+        sizes = PhotoSize.objects.filter(name__in=size_list)
+    sizes = list(sizes)
+    if not sizes:
+        raise CommandError('No photo sizes were found.')
+
+    fix = options.get('fix', False)
+    checked = stale = missing = 0
+    for batch in batches(rendition_names(sizes), BATCH_SIZE):
+        indexed = index.contains_many(batch)
+        for name in batch:
+            stored = store.stored(name)
+            if name in indexed and not stored:
+                stale += 1
+                if fix:
+                    index.discard(name)
+            elif stored and name not in indexed:
+                missing += 1
+                if fix:
+                    index.add(name)
+        checked += len(batch)
+
+    stdout.write('Checked %d renditions: %d stale index entries, %d stored renditions not indexed%s'
+                 % (checked, stale, missing, ' (fixed)' if fix and (stale or missing) else ''))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from photologue.models import ImageModel, file_digest
+
+
+class Command(BaseCommand):
+    help = ('Records the digest of Photologue images, which rendition names are based on.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', dest='all', default=False,
+                            help='Also re-read images that already have a digest')
+
+    def handle(self, *args, **options):
+        return record_digests(options, self.stdout)
+
+
+def record_digests(options, stdout):
+    """
+    Records the digest of every image without one
+    """
+    count = 0
+    for cls in ImageModel.__subclasses__():
+        objs = cls.objects.all()
+        if not options.get('all'):
+            objs = objs.filter(image_digest='')
+        for obj in objs.only('pk', 'image').iterator():
+            if not obj.image:
+                continue
+            try:
+                digest = file_digest(obj.image)
+            except (IOError, OSError):
+                continue
+            finally:
+                obj.image.close()
+            # Renditions named after the old digest are left to plsweep
+            cls.objects.filter(pk=obj.pk).update(image_digest=digest)
+            count += 1
+    stdout.write('Recorded the digest of %d images' % count)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from photologue.models import Photo, PhotoMetadata, exif_metadata, read_exif
+
+
+class Command(BaseCommand):
+    help = ('Re-reads the stored EXIF metadata of Photologue photos from their image files.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', dest='missing', default=False,
+                            help='Only read photos without stored metadata')
+
+    def handle(self, *args, **options):
+        return extract_metadata(options, self.stdout)
+
+
+def extract_metadata(options, stdout):
+    """
+    Extracts the metadata of every photo
+    """
+    photos = Photo.objects.all()
+    if options.get('missing'):
+        photos = photos.filter(metadata__isnull=True)
+
+    count = 0
+    for photo in photos.only('pk', 'image').iterator():
+        try:
+            path = photo.image.path
+        except ValueError:
+            continue
+        PhotoMetadata.objects.update_or_create(photo=photo, defaults=exif_metadata(read_exif(path)))
+        count += 1
+    stdout.write('Read metadata of %d photos' % count)
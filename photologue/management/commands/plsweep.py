@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from photologue.models import claim_sweep
+from photologue.workers import sweep_renditions
+
+
+class Command(BaseCommand):
+    help = ('Removes Photologue renditions of old photo size and effect settings.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', dest='dry_run', default=False,
+                            help='Only count the renditions that would be removed')
+
+    def handle(self, *args, **options):
+        return sweep(options, self.stdout)
+
+
+def sweep(options, stdout):
+    """
+    Sweeps the old renditions of every image
+    """
+    dry_run = options.get('dry_run', False)
+    if not dry_run:
+        # This sweep covers the ones scheduled by edits
+        claim_sweep()
+    removed, queued = sweep_renditions(dry_run)
+    if dry_run:
+        stdout.write('%d renditions would be removed' % removed)
+    else:
+        stdout.write('Removed %d renditions, queued %d images for rendering' % (removed, queued))
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from photologue.models import RenditionJob, claim_sweep
+from photologue.workers import get_pool, run_rendition_job, sweep_renditions
+
+
+class Command(BaseCommand):
+    help = ('Renders queued Photologue photo sizes in a pool of worker processes.')
+
+    requires_model_validation = True
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', '-w', dest='workers', type=int, default=1,
+                            help='Number of worker processes')
+        parser.add_argument('--batch', '-b', dest='batch', type=int, default=50,
+                            help='Number of jobs claimed at a time')
+        parser.add_argument('--poll', dest='poll', type=float, default=2.0,
+                            help='Seconds to wait for new jobs when the queue is empty')
+        parser.add_argument('--stale', dest='stale', type=int, default=600,
+                            help='Seconds after which a running job is assumed lost and requeued')
+        parser.add_argument('--retry-failed', action='store_true', dest='retry_failed', default=False,
+                            help='Queue the jobs which failed too many times again before starting')
+        parser.add_argument('--once', action='store_true', dest='once', default=False,
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            self.stdout.write('Queued %d failed jobs again' % RenditionJob.objects.retry_failed())
+        pool = get_pool(options['workers'])
+        try:
+            while True:
+                if claim_sweep():
+                    # A photo size or effect changed since the last round
+                    removed, queued = sweep_renditions()
+                    self.stdout.write('Removed %d old renditions, queued %d images' % (removed, queued))
+                RenditionJob.objects.requeue_stale(options['stale'])
+                job_ids = RenditionJob.objects.claim(options['batch'])
+                if not job_ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+                failed = 0
+                for error in pool.imap_unordered(run_rendition_job, job_ids):
+                    if error:
+                        failed += 1
+                        self.stderr.write(error)
+                self.stdout.write('Rendered %d of %d queued sizes' % (len(job_ids) - failed, len(job_ids)))
+        finally:
+            pool.close()
+            pool.join()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('photologue', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenditionJob',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('object_pk', models.IntegerField(verbose_name='object ID')),
+                ('status', models.CharField(default=b'pending', max_length=10, verbose_name='status', db_index=True, choices=[(b'pending', 'Pending'), (b'running', 'Running'), (b'failed', 'Failed')])),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('error', models.TextField(verbose_name='error', blank=True)),
+                ('date_added', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date added')),
+                ('date_started', models.DateTimeField(null=True, verbose_name='date started', blank=True)),
+                ('content_type', models.ForeignKey(related_name='rendition_jobs', to='contenttypes.ContentType')),
+                ('photosize', models.ForeignKey(related_name='rendition_jobs', to='photologue.PhotoSize')),
+            ],
+            options={
+                'ordering': ['date_added'],
+                'verbose_name': 'rendition job',
+                'verbose_name_plural': 'rendition jobs',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='renditionjob',
+            unique_together=set([('content_type', 'object_pk', 'photosize')]),
+        ),
+    ]
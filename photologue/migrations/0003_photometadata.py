@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0002_renditionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhotoMetadata',
+            fields=[
+                ('photo', models.OneToOneField(related_name='metadata', primary_key=True, serialize=False, to='photologue.Photo', verbose_name='photo')),
+                ('date_taken', models.DateTimeField(null=True, verbose_name='date taken', blank=True)),
+                ('orientation', models.PositiveSmallIntegerField(default=1, verbose_name='orientation')),
+                ('camera_make', models.CharField(max_length=100, verbose_name='camera make', blank=True)),
+                ('camera_model', models.CharField(max_length=100, verbose_name='camera model', blank=True)),
+                ('latitude', models.FloatField(null=True, verbose_name='latitude', blank=True)),
+                ('longitude', models.FloatField(null=True, verbose_name='longitude', blank=True)),
+                ('date_extracted', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date extracted')),
+            ],
+            options={
+                'verbose_name': 'photo metadata',
+                'verbose_name_plural': 'photo metadata',
+            },
+        ),
+    ]
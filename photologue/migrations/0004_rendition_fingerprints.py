@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0003_photometadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='image_digest',
+            field=models.CharField(verbose_name='image digest', max_length=40, editable=False, blank=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0004_rendition_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photosize',
+            name='family',
+            field=models.CharField(help_text='Sizes of the same family are renditions of a photo at different widths or formats, offered together to browsers through srcset. Examples: "display" for "display", "display_2x" and "display_webp".', max_length=40, verbose_name='family', blank=True),
+        ),
+        migrations.AddField(
+            model_name='photosize',
+            name='output_format',
+            field=models.CharField(default=b'', help_text='Format the size is rendered in. WebP falls back on JPEG where the imaging library cannot write it.', max_length=4, verbose_name='output format', blank=True, choices=[(b'', 'Same as original'), (b'JPEG', 'JPEG'), (b'WEBP', 'WebP')]),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0005_photosize_family'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='photosize',
+            name='output_format',
+            field=models.CharField(default=b'', help_text='Format the size is rendered in. AVIF falls back on WebP, and WebP on JPEG, where the imaging library cannot write them.', max_length=8, verbose_name='output format', blank=True, choices=[(b'', 'Same as original'), (b'JPEG', 'JPEG'), (b'PJPEG', 'Progressive JPEG'), (b'SMALLEST', 'Smaller of baseline and progressive JPEG'), (b'WEBP', 'WebP'), (b'AVIF', 'AVIF')]),
+        ),
+        migrations.AddField(
+            model_name='photosize',
+            name='subsampling',
+            field=models.PositiveSmallIntegerField(blank=True, help_text="Resolution of the colors of JPEG renditions. Leave blank for the imaging library's default.", null=True, verbose_name='chroma subsampling', choices=[(0, '4:4:4 (sharpest colors)'), (1, '4:2:2'), (2, '4:2:0 (smallest)')]),
+        ),
+        migrations.AddField(
+            model_name='photosize',
+            name='strip_metadata',
+            field=models.BooleanField(default=True, help_text='If selected the EXIF data and color profile of the original are left out of renditions.', verbose_name='strip metadata?'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0006_photosize_encoding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='original_archive',
+            field=models.CharField(verbose_name='archived original', max_length=100, editable=False, blank=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photologue', '0007_photo_original_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Revision',
+            fields=[
+                ('name', models.CharField(max_length=40, serialize=False, verbose_name='name', primary_key=True)),
+                ('number', models.PositiveIntegerField(default=0, verbose_name='number')),
+            ],
+            options={
+                'verbose_name': 'revision',
+                'verbose_name_plural': 'revisions',
+            },
+        ),
+    ]
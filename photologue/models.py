@@ -1,16 +1,21 @@
+import hashlib
 import os
+import posixpath
 import random
 import shutil
-import zipfile
+import time
+import traceback
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from inspect import isclass
 from importlib import import_module
 
-from django.db import models
-from django.db.models.signals import post_init
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.base import ContentFile
+from django.core.files.storage import get_storage_class
 from django.core.urlresolvers import reverse
 from django.template.defaultfilters import slugify
 from django.utils import timezone
@@ -23,6 +28,11 @@ from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse
 
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
 # Required PIL classes may or may not be available from the root namespace
 # depending on the installation method used.
 try:
@@ -65,7 +75,10 @@ except ImportError:
 
 from utils import EXIF
 from utils.reflection import add_reflection
-from utils.watermark import apply_watermark
+from utils.watermark import apply_watermark, reduce_opacity, watermark_layer
+from utils.normalize import normalize
+from stores import get_rendition_store
+from counters import view_counter
 
 # Default limit for gallery.latest
 LATEST_LIMIT = getattr(settings, 'PHOTOLOGUE_GALLERY_LATEST_LIMIT', None)
@@ -105,6 +118,68 @@ else:
     def get_storage_path(instance, filename):
         return os.path.join(PHOTOLOGUE_DIR, 'photos', filename)
 
+# Render sizes from a queue drained by the `plworker` command rather than
+# inside the request that asks for them.
+QUEUE_RENDITIONS = getattr(settings, 'PHOTOLOGUE_QUEUE_RENDITIONS', False)
+
+# Attempts at rendering a queued size before its job is left failed. Failed
+# jobs are retried by `plworker --retry-failed`, never by the requests asking
+# for the size.
+RENDITION_MAX_ATTEMPTS = getattr(settings, 'PHOTOLOGUE_RENDITION_MAX_ATTEMPTS', 3)
+
+# URL handed out for a queued size until it has been rendered. Defaults to the
+# URL of the original image.
+RENDITION_PLACEHOLDER_URL = getattr(settings,
+                                    'PHOTOLOGUE_RENDITION_PLACEHOLDER_URL',
+                                    None)
+
+# Number of processes used to validate and render the images of an uploaded
+# .zip archive. Archives uploaded inside a transaction are processed by the
+# uploading process alone.
+INGEST_WORKERS = getattr(settings, 'PHOTOLOGUE_INGEST_WORKERS', 1)
+
+# Serve renditions through the pl-rendition view, with headers letting
+# browsers cache them for good, rather than from MEDIA_URL.
+SERVE_RENDITIONS = getattr(settings, 'PHOTOLOGUE_SERVE_RENDITIONS', False)
+
+# Normalize uploaded originals: turn them upright according to their EXIF
+# orientation, scale them down to NORMALIZE_MAX_DIMENSION and drop their EXIF
+# data. The EXIF tags photologue keeps are read before.
+NORMALIZE_ORIGINALS = getattr(settings, 'PHOTOLOGUE_NORMALIZE_ORIGINALS', False)
+
+# Largest width or height of a normalized original, None to keep its size.
+NORMALIZE_MAX_DIMENSION = getattr(settings, 'PHOTOLOGUE_NORMALIZE_MAX_DIMENSION', 4096)
+
+# Quality of normalized JPEG originals.
+NORMALIZE_QUALITY = getattr(settings, 'PHOTOLOGUE_NORMALIZE_QUALITY', 90)
+
+# Also re-encode uploads which only need their EXIF data dropped. Uploads
+# turned or scaled down always lose it.
+NORMALIZE_STRIP_EXIF = getattr(settings, 'PHOTOLOGUE_NORMALIZE_STRIP_EXIF', True)
+
+# Dotted path to a storage class keeping uploads as they were before being
+# normalized, such as a bucket with a cold storage class. None to discard them.
+# The storage is constructed with the keyword arguments in
+# PHOTOLOGUE_ORIGINAL_ARCHIVE_STORAGE_OPTIONS.
+ORIGINAL_ARCHIVE_STORAGE = getattr(settings, 'PHOTOLOGUE_ORIGINAL_ARCHIVE_STORAGE', None)
+
+# Number of hex digits of the fingerprint in rendition names.
+RENDITION_FINGERPRINT_LENGTH = 8
+
+# Seconds between checks of the photo sizes version.
+SIZE_CACHE_CHECK_INTERVAL = getattr(settings, 'PHOTOLOGUE_SIZE_CACHE_CHECK_INTERVAL', 5)
+
+# Revision counting the changes to photo sizes and effects.
+SIZE_REVISION = 'photosizes'
+
+# Revision counting the sweeps of old renditions waiting for `plworker`.
+SWEEP_REVISION = 'sweep'
+
+# When several sizes are rendered together, decode and derive each one from an
+# image at least this many times larger than the result. Smaller gaps are
+# faster but soften the renditions.
+REDUCING_GAP = 2.0
+
 # Quality options for JPEG images
 JPEG_QUALITY_CHOICES = (
     (30, _('Very Low')),
@@ -138,6 +213,33 @@ WATERMARK_STYLE_CHOICES = (
     ('scale', _('Scale')),
 )
 
+# Formats a photo size can be rendered in, whatever the format of the original
+OUTPUT_FORMAT_CHOICES = (
+    ('', _('Same as original')),
+    ('JPEG', _('JPEG')),
+    ('PJPEG', _('Progressive JPEG')),
+    ('SMALLEST', _('Smaller of baseline and progressive JPEG')),
+    ('WEBP', _('WebP')),
+    ('AVIF', _('AVIF')),
+)
+
+OUTPUT_FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'PJPEG': '.jpg', 'SMALLEST': '.jpg',
+                            'WEBP': '.webp', 'AVIF': '.avif'}
+OUTPUT_FORMAT_MIME_TYPES = {'JPEG': 'image/jpeg', 'PJPEG': 'image/jpeg', 'SMALLEST': 'image/jpeg',
+                            'WEBP': 'image/webp', 'AVIF': 'image/avif'}
+
+# Formats tried in turn when the imaging library cannot write a format
+OUTPUT_FORMAT_FALLBACKS = {'AVIF': 'WEBP', 'WEBP': 'JPEG'}
+
+# Order in which browsers are offered renditions in different formats
+PREFERRED_MIME_TYPES = ('image/avif', 'image/webp', 'image/jpeg')
+
+JPEG_SUBSAMPLING_CHOICES = (
+    (0, _('4:4:4 (sharpest colors)')),
+    (1, _('4:2:2')),
+    (2, _('4:2:0 (smallest)')),
+)
+
 # Prepare a list of image filters
 filter_names = []
 for n in dir(ImageFilter):
@@ -152,6 +254,73 @@ IMAGE_FILTERS_HELP_TEXT = _('Chain multiple filters using the following \
     %s.' % (', '.join(filter_names)))
 
 
+def exif_date_taken(tags):
+    """Returns the DateTimeOriginal of parsed EXIF tags, or None."""
+    try:
+        exif_date = tags.get('EXIF DateTimeOriginal', None)
+        if exif_date is not None:
+            d, t = str.split(exif_date.values)
+            year, month, day = d.split(':')
+            hour, minute, second = t.split(':')
+            return datetime(int(year), int(month), int(day),
+                            int(hour), int(minute), int(second))
+    except:
+        pass
+    return None
+
+
+def _exif_string(tags, key):
+    tag = tags.get(key, None)
+    if tag is None:
+        return ''
+    return force_unicode(tag.printable, errors='replace').strip()[:100]
+
+
+def _exif_coordinate(tags, key):
+    tag = tags.get('GPS GPS%s' % key, None)
+    ref = tags.get('GPS GPS%sRef' % key, None)
+    try:
+        degrees, minutes, seconds = [float(v.num) / v.den for v in tag.values]
+    except (AttributeError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    coordinate = degrees + minutes / 60 + seconds / 3600
+    if ref is not None and ref.printable in ('S', 'W'):
+        coordinate = -coordinate
+    return coordinate
+
+
+def exif_metadata(tags):
+    """Returns the fields of PhotoMetadata found in parsed EXIF tags."""
+    orientation = tags.get('Image Orientation', None)
+    try:
+        orientation = int(orientation.values[0])
+    except (AttributeError, IndexError, TypeError, ValueError):
+        orientation = 1
+    return {
+        'date_taken': exif_date_taken(tags),
+        'orientation': orientation,
+        'camera_make': _exif_string(tags, 'Image Make'),
+        'camera_model': _exif_string(tags, 'Image Model'),
+        'latitude': _exif_coordinate(tags, 'Latitude'),
+        'longitude': _exif_coordinate(tags, 'Longitude'),
+    }
+
+
+def read_exif(path):
+    """Reads just the EXIF tags photologue keeps from an image file.
+
+    `path` may also be an open file, which is read from its start.
+    """
+    try:
+        if hasattr(path, 'read'):
+            path.seek(0)
+            return EXIF.process_header(path, stop_tag='DateTimeOriginal')
+        with open(path, 'rb') as f:
+            return EXIF.process_header(f, stop_tag='DateTimeOriginal')
+    except Exception:
+        return {}
+
+
 class Gallery(models.Model):
     date_added = models.DateTimeField(_('date published'),
                                       default=timezone.now)
@@ -300,12 +469,6 @@ class GalleryUpload(models.Model):
 
     def process_zipfile(self):
         if os.path.isfile(self.zip_file.path):
-            # TODO: implement try-except here
-            zip = zipfile.ZipFile(self.zip_file.path)
-            bad_file = zip.testzip()
-            if bad_file:
-                raise Exception('"%s" in the .zip archive is corrupt.' % bad_file)
-            count = 1
             if self.gallery:
                 gallery = self.gallery
             else:
@@ -314,42 +477,11 @@ class GalleryUpload(models.Model):
                                                  description=self.description,
                                                  is_public=self.is_public,
                                                  tags=self.tags)
-            from cStringIO import StringIO
-            for filename in sorted(zip.namelist()):
-                if filename.startswith('__'):  # do not process meta files
-                    continue
-                data = zip.read(filename)
-                if len(data):
-                    try:
-                        # the following is taken from django.newforms.fields.ImageField:
-                        #  load() is the only method that can spot a truncated JPEG,
-                        #  but it cannot be called sanely after verify()
-                        trial_image = Image.open(StringIO(data))
-                        trial_image.load()
-                        # verify() is the only method that can spot a corrupt PNG,
-                        #  but it must be called immediately after the constructor
-                        trial_image = Image.open(StringIO(data))
-                        trial_image.verify()
-                    except Exception:
-                        # if a "bad" file is found we just skip it.
-                        continue
-                    while 1:
-                        title = ' '.join([self.title, str(count)])
-                        slug = slugify(title)
-                        try:
-                            p = Photo.objects.get(title_slug=slug)
-                        except Photo.DoesNotExist:
-                            photo = Photo(title=title,
-                                          title_slug=slug,
-                                          caption=self.caption,
-                                          is_public=self.is_public,
-                                          tags=self.tags)
-                            photo.image.save(filename, ContentFile(data))
-                            gallery.photos.add(photo)
-                            count = count + 1
-                            break
-                        count = count + 1
-            zip.close()
+            from photologue.ingest import ZipIngest
+            ingest = ZipIngest(self.zip_file.path, gallery, title=self.title,
+                               caption=self.caption, is_public=self.is_public,
+                               tags=self.tags)
+            self.report = ingest.run()
             return gallery
 
 
@@ -360,19 +492,22 @@ class ImageModel(models.Model):
     view_count = models.PositiveIntegerField(default=0, editable=False)
     crop_from = models.CharField(_('crop from'), blank=True, max_length=10, default='center', choices=CROP_ANCHOR_CHOICES)
     effect = models.ForeignKey('PhotoEffect', null=True, blank=True, related_name="%(class)s_related", verbose_name=_('effect'))
+    image_digest = models.CharField(_('image digest'), max_length=40, blank=True, editable=False)
+    original_archive = models.CharField(_('archived original'), max_length=IMAGE_FIELD_MAX_LENGTH,
+                                        blank=True, editable=False)
 
     class Meta:
         abstract = True
 
     @property
     def EXIF(self):
-        try:
-            return EXIF.process_file(open(self.image.path, 'rb'))
-        except:
+        for details in (True, False):
             try:
-                return EXIF.process_file(open(self.image.path, 'rb'), details=False)
+                with open(self.image.path, 'rb') as f:
+                    return EXIF.process_file(f, details=details)
             except:
-                return {}
+                pass
+        return {}
 
     def admin_thumbnail(self):
         func = getattr(self, 'get_admin_thumbnail_url', None)
@@ -394,56 +529,132 @@ class ImageModel(models.Model):
     def cache_url(self):
         return '/'.join([os.path.dirname(self.image.url), "cache"])
 
+    def cache_name(self):
+        """Returns the rendition store directory of this image's sizes."""
+        return posixpath.join(posixpath.dirname(self.image.name), "cache")
+
+    def _get_rendition_name(self, size):
+        return posixpath.join(self.cache_name(), self._get_filename_for_size(size))
+
     def image_filename(self):
         return os.path.basename(force_unicode(self.image.path))
 
     def _get_filename_for_size(self, size):
+        photosize = size
+        if not isinstance(photosize, PhotoSize):
+            photosize = PhotoSizeCache().sizes.get(size)
         size = getattr(size, 'name', size)
         base, ext = os.path.splitext(self.image_filename())
-        return ''.join([base, '_', size, ext])
+        if photosize is not None and photosize.get_output_format():
+            ext = OUTPUT_FORMAT_EXTENSIONS[photosize.get_output_format()]
+        fingerprint = '.' + self.fingerprint(photosize) if photosize is not None else ''
+        return ''.join([base, '_', size, fingerprint, ext])
+
+    def fingerprint(self, photosize):
+        """Returns a short digest of everything a rendition is made from.
+
+        Renditions are named after the contents of the original and the
+        settings of their size and effects, so a rendition URL never changes
+        its contents and can be cached indefinitely by browsers.
+        """
+        effect = self._get_effect(photosize)
+        parts = [self.image_digest, self.crop_from, photosize.fingerprint(),
+                 effect.fingerprint() if effect is not None else '']
+        return hashlib.sha1(smart_str(u'|'.join(parts))).hexdigest()[:RENDITION_FINGERPRINT_LENGTH]
 
     def _get_SIZE_photosize(self, size):
         return PhotoSizeCache().sizes.get(size)
 
+    def _get_family_sizes(self, photosize):
+        """Returns the sizes of the family of `photosize`, or just `photosize`."""
+        if photosize.family:
+            return PhotoSizeCache().families.get(photosize.family, [photosize])
+        return [photosize]
+
     def _get_SIZE_size(self, size):
         photosize = PhotoSizeCache().sizes.get(size)
         if not self.size_exists(photosize):
-            self.create_size(photosize)
-        return Image.open(self._get_SIZE_filename(size)).size
+            if QUEUE_RENDITIONS:
+                RenditionJob.objects.enqueue(self, self._get_family_sizes(photosize))
+                return (self.image.width, self.image.height)
+            self.create_sizes(self._get_family_sizes(photosize))
+        f = get_rendition_store().open(self._get_rendition_name(photosize))
+        try:
+            return Image.open(f).size
+        finally:
+            f.close()
 
     def _get_SIZE_url(self, size):
         photosize = PhotoSizeCache().sizes.get(size)
-        if not self.size_exists(photosize):
-            self.create_size(photosize)
         if photosize.increment_count:
             self.increment_count()
-        return '/'.join([self.cache_url(), self._get_filename_for_size(photosize.name)])
+        return self._get_rendition_url(photosize)
+
+    def _get_rendition_url(self, photosize):
+        if not self.size_exists(photosize):
+            if QUEUE_RENDITIONS:
+                RenditionJob.objects.enqueue(self, self._get_family_sizes(photosize))
+                return RENDITION_PLACEHOLDER_URL or self.image.url
+            # The rest of the family is usually asked for next, render it
+            # from the same decode
+            self.create_sizes(self._get_family_sizes(photosize))
+        name = self._get_rendition_name(photosize)
+        if SERVE_RENDITIONS:
+            return reverse('pl-rendition', args=[self.pk, name])
+        return get_rendition_store().url(name)
+
+    def get_srcset(self, size):
+        """Returns the renditions of a size family, for responsive images.
+
+        `size` is the name of a photo size or of a family. Returns a tuple of
+        the URL to fall back on, the srcset of the family members in the
+        format of that fallback, and a list of (MIME type, srcset) tuples for
+        the members rendered in other formats, most efficient first. Members
+        scaled to a height only cannot be described by width and are left out.
+        """
+        cache = PhotoSizeCache()
+        photosize = cache.sizes.get(size)
+        family = self._get_family_sizes(photosize) if photosize else cache.families.get(size)
+        if not family:
+            raise ValueError('No photo size or family named "%s"' % size)
+        if photosize is None:
+            # Fall back on the narrowest member in the most widely supported format
+            photosize = sorted(family, key=lambda member: member.get_mime_type() in ('image/avif', 'image/webp'))[0]
+        if [member for member in family if member.increment_count]:
+            self.increment_count()
+        srcsets = {}
+        for member in family:
+            if member.width:
+                url = self._get_rendition_url(member)
+                srcsets.setdefault(member.get_mime_type(), []).append('%s %dw' % (url, member.width))
+        fallback_type = photosize.get_mime_type()
+        sources = [(mime_type, ', '.join(srcsets[mime_type])) for mime_type in PREFERRED_MIME_TYPES
+                   if mime_type in srcsets and mime_type != fallback_type]
+        return (self._get_rendition_url(photosize), ', '.join(srcsets.get(fallback_type, [])), sources)
 
     def _get_SIZE_filename(self, size):
         photosize = PhotoSizeCache().sizes.get(size)
-        return smart_str(os.path.join(self.cache_path(), self._get_filename_for_size(photosize.name)))
+        name = self._get_rendition_name(photosize)
+        return get_rendition_store().path(name) or smart_str(name)
 
     def increment_count(self):
-        self.view_count += 1
-        models.Model.save(self)
-
-    def add_accessor_methods(self, *args, **kwargs):
-        for size in PhotoSizeCache().sizes.keys():
-            setattr(self, 'get_%s_size' % size,
-                    curry(self._get_SIZE_size, size=size))
-            setattr(self, 'get_%s_photosize' % size,
-                    curry(self._get_SIZE_photosize, size=size))
-            setattr(self, 'get_%s_url' % size,
-                    curry(self._get_SIZE_url, size=size))
-            setattr(self, 'get_%s_filename' % size,
-                    curry(self._get_SIZE_filename, size=size))
+        view_counter.add(self)
+
+    def __getattr__(self, name):
+        # Resolves get_<size>_url, get_<size>_filename, get_<size>_size and
+        # get_<size>_photosize for the sizes currently defined
+        if not name.startswith('get_'):
+            raise AttributeError(name)
+        accessor = PhotoSizeCache().accessors.get(name)
+        if accessor is None:
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+        method, size = accessor
+        return curry(getattr(self, method), size=size)
 
     def size_exists(self, photosize):
-        func = getattr(self, "get_%s_filename" % photosize.name, None)
-        if func is not None:
-            if os.path.isfile(func()):
-                return True
-        return False
+        if photosize is None:
+            return False
+        return get_rendition_store().exists(self._get_rendition_name(photosize))
 
     def resize_image(self, im, photosize):
         cur_width, cur_height = im.size
@@ -486,55 +697,163 @@ class ImageModel(models.Model):
         return im
 
     def create_size(self, photosize):
-        if self.size_exists(photosize):
-            return
-        if not os.path.isdir(self.cache_path()):
-            os.makedirs(self.cache_path())
+        self.create_sizes([photosize])
+
+    def create_sizes(self, photosizes):
+        """Render the given sizes from a single decode of the original image.
+
+        JPEG originals are decoded at the smallest scale that still leaves
+        REDUCING_GAP headroom over the largest size. Each distinct effect is
+        applied once, and smaller sizes are resized from larger intermediate
+        results rather than from the original.
+
+        Returns the number of bytes written to the cache.
+        """
+        photosizes = [photosize for photosize in photosizes if not self.size_exists(photosize)]
+        if not photosizes:
+            return 0
         try:
-            im = Image.open(self.image.path)
+            original = Image.open(self.image.path)
+            im_format = original.format
+            target = self._decode_size(original.size, photosizes)
+            if target is not None and im_format == 'JPEG':
+                original.draft(original.mode, target)
+            original.load()
         except IOError:
-            return
-        # Save the original format
-        im_format = im.format
-        # Apply effect if found
+            return 0
+        if target is not None and im_format != 'JPEG' and hasattr(original, 'reduce') and \
+           original.mode in ('L', 'RGB', 'RGBA'):
+            factor = int(min(float(original.size[0]) / target[0],
+                             float(original.size[1]) / target[1]))
+            if factor >= 2:
+                original = original.reduce(factor)
+        # Group the sizes by the effect they are rendered with
+        groups = []
+        for photosize in photosizes:
+            effect = self._get_effect(photosize)
+            for group_effect, group in groups:
+                if group_effect == effect:
+                    group.append(photosize)
+                    break
+            else:
+                groups.append((effect, [photosize]))
+        written = 0
+        for effect, group in groups:
+            im = original
+            if effect is not None:
+                im = effect.pre_process(im)
+            # Uncropped intermediate results, available to derive smaller sizes from
+            levels = [im]
+            group.sort(key=lambda photosize: self._area(self._resize_dimensions(im.size, photosize)),
+                       reverse=True)
+            for photosize in group:
+                resized = im
+                if im.size != photosize.size and photosize.size != (0, 0):
+                    dimensions = self._resize_dimensions(im.size, photosize)
+                    source = im
+                    for level in levels:
+                        if level.size[0] >= dimensions[0] * REDUCING_GAP and \
+                           level.size[1] >= dimensions[1] * REDUCING_GAP:
+                            source = level
+                    resized = self.resize_image(source, photosize)
+                    if not photosize.crop and resized is not source:
+                        levels.append(resized)
+                written += self._save_size(resized, im_format, photosize, effect, original.info)
+        return written
+
+    def _get_effect(self, photosize):
         if self.effect is not None:
-            im = self.effect.pre_process(im)
-        elif photosize.effect is not None:
-            im = photosize.effect.pre_process(im)
-        # Resize/crop image
-        if im.size != photosize.size and photosize.size != (0, 0):
-            im = self.resize_image(im, photosize)
+            return self.effect
+        return photosize.effect
+
+    def _area(self, size):
+        return size[0] * size[1]
+
+    def _resize_dimensions(self, size, photosize):
+        """Returns the size `resize_image` scales an image of `size` to, before cropping."""
+        cur_width, cur_height = size
+        new_width, new_height = photosize.size
+        if photosize.size == (0, 0):
+            return size
+        if photosize.crop:
+            ratio = max(float(new_width) / cur_width, float(new_height) / cur_height)
+            return (int(cur_width * ratio), int(cur_height * ratio))
+        if not new_width == 0 and not new_height == 0:
+            ratio = min(float(new_width) / cur_width, float(new_height) / cur_height)
+        elif new_width == 0:
+            ratio = float(new_height) / cur_height
+        else:
+            ratio = float(new_width) / cur_width
+        new_dimensions = (int(round(cur_width * ratio)), int(round(cur_height * ratio)))
+        if new_dimensions[0] > cur_width or new_dimensions[1] > cur_height:
+            if not photosize.upscale:
+                return size
+        return new_dimensions
+
+    def _decode_size(self, size, photosizes):
+        """Returns the smallest size the original can be decoded at for the
+        given photo sizes, or None if it is needed at full resolution.
+        """
+        width = height = 0
+        for photosize in photosizes:
+            effect = self._get_effect(photosize)
+            rotated = effect is not None and effect.transpose_method in ('ROTATE_90', 'ROTATE_270')
+            source = (size[1], size[0]) if rotated else size
+            dimensions = self._resize_dimensions(source, photosize)
+            if rotated:
+                dimensions = (dimensions[1], dimensions[0])
+            width = max(width, int(dimensions[0] * REDUCING_GAP))
+            height = max(height, int(dimensions[1] * REDUCING_GAP))
+        if width >= size[0] or height >= size[1]:
+            return None
+        return (max(width, 1), max(height, 1))
+
+    def _save_size(self, im, im_format, photosize, effect, info=None):
         # Apply watermark if found
         if photosize.watermark is not None:
             im = photosize.watermark.post_process(im)
         # Apply effect if found
-        if self.effect is not None:
-            im = self.effect.post_process(im)
-        elif photosize.effect is not None:
-            im = photosize.effect.post_process(im)
+        if effect is not None:
+            im = effect.post_process(im)
         # Save file
-        im_filename = getattr(self, "get_%s_filename" % photosize.name)()
-        try:
-            if im_format != 'JPEG':
-                try:
-                    im.save(im_filename)
-                    return
-                except KeyError:
-                    pass
-            im.save(im_filename, 'JPEG', quality=int(photosize.quality), optimize=True)
-        except IOError, e:
-            if os.path.isfile(im_filename):
-                os.unlink(im_filename)
-            raise e
+        name = self._get_rendition_name(photosize)
+        store = get_rendition_store()
+        options = {}
+        if not photosize.strip_metadata and info:
+            options.update((key, info[key]) for key in ('exif', 'icc_profile') if info.get(key))
+        output_format = photosize.get_output_format()
+        if output_format in ('WEBP', 'AVIF'):
+            if im.mode not in ('RGB', 'RGBA'):
+                im = im.convert('RGBA')
+            return store.save(name, im, output_format, quality=int(photosize.quality), **options)
+        if output_format is None and im_format != 'JPEG':
+            # Keep the original format if it can be written
+            Image.init()
+            save_format = Image.EXTENSION.get(os.path.splitext(name)[1].lower())
+            if save_format in Image.SAVE:
+                if save_format == 'PNG':
+                    options['optimize'] = True
+                return store.save(name, im, save_format, **options)
+        if im.mode not in ('RGB', 'L', 'CMYK'):
+            im = im.convert('RGB')
+        options.update(quality=int(photosize.quality), optimize=True)
+        if photosize.subsampling is not None:
+            options['subsampling'] = photosize.subsampling
+        if output_format == 'SMALLEST':
+            # Progressive encoding wins on all but the smallest images, keep
+            # whichever came out smaller
+            encodings = []
+            for progressive in (False, True):
+                buf = StringIO()
+                im.save(buf, 'JPEG', progressive=progressive, **options)
+                encodings.append(buf.getvalue())
+            return store.write(name, min(encodings, key=len))
+        return store.save(name, im, 'JPEG', progressive=output_format == 'PJPEG', **options)
 
     def remove_size(self, photosize, remove_dirs=True):
         if not self.size_exists(photosize):
             return
-        filename = getattr(self, "get_%s_filename" % photosize.name)()
-        if os.path.isfile(filename):
-            os.remove(filename)
-        if remove_dirs:
-            self.remove_cache_dirs()
+        get_rendition_store().delete(self._get_rendition_name(photosize), prune=remove_dirs)
 
     def clear_cache(self):
         cache = PhotoSizeCache()
@@ -544,46 +863,87 @@ class ImageModel(models.Model):
 
     def pre_cache(self):
         cache = PhotoSizeCache()
-        for photosize in cache.sizes.values():
-            if photosize.pre_cache:
-                self.create_size(photosize)
+        photosizes = [photosize for photosize in cache.sizes.values() if photosize.pre_cache]
+        if QUEUE_RENDITIONS:
+            RenditionJob.objects.enqueue(self, photosizes)
+            return
+        self.create_sizes(photosizes)
 
     def remove_cache_dirs(self):
-        try:
-            os.removedirs(self.cache_path())
-        except:
-            pass
+        store = get_rendition_store()
+        if hasattr(store, 'prune'):
+            store.prune(self.cache_name())
 
-    def save(self, *args, **kwargs):
+    def normalize_image(self):
+        """Normalizes a new upload, reading its EXIF tags beforehand.
+
+        When an archive storage is set the upload is kept there as it was.
+        Returns True if the image was replaced. Raises IOError if the upload
+        cannot be decoded.
+        """
+        self._normalized = True
+        self._exif_tags = read_exif(self.image)
         if self.date_taken is None:
-            try:
-                exif_date = self.EXIF.get('EXIF DateTimeOriginal', None)
-                if exif_date is not None:
-                    d, t = str.split(exif_date.values)
-                    year, month, day = d.split(':')
-                    hour, minute, second = t.split(':')
-                    self.date_taken = datetime(int(year), int(month), int(day),
-                                               int(hour), int(minute), int(second))
-            except:
-                pass
+            self.date_taken = exif_date_taken(self._exif_tags)
+        result = normalize(self.image, NORMALIZE_MAX_DIMENSION, NORMALIZE_STRIP_EXIF, NORMALIZE_QUALITY)
+        if result is None:
+            return False
+        data, format = result
+        # The normalized image is upright
+        self._exif_tags.pop('Image Orientation', None)
+        if ORIGINAL_ARCHIVE_STORAGE:
+            self.original_archive = archive_original(self.image)
+        name = os.path.basename(self.image.name)
+        root, ext = os.path.splitext(name)
+        if ext.lower() not in [e for e, f in Image.EXTENSION.items() if f == format]:
+            name = root + '.jpg'
+        self.image = ContentFile(data, name=name)
+        return True
+
+    def save(self, *args, **kwargs):
+        if NORMALIZE_ORIGINALS and self.image and not self.image._committed:
+            if not getattr(self, '_normalized', False):
+                self.normalize_image()
+        elif self.date_taken is None:
+            # A new upload is not in the storage yet, read it from the upload
+            self._exif_tags = read_exif(self.image.path if self.image._committed else self.image)
+            self.date_taken = exif_date_taken(self._exif_tags)
+        self._normalized = False
         if self.date_taken is None:
             self.date_taken = timezone.now()
+        rendered_from = None
         if self._get_pk_val():
-            self.clear_cache()
+            rendered_from = type(self)._default_manager.filter(pk=self.pk).values_list(
+                'image', 'image_digest', 'crop_from', 'effect').first()
+        if not self.image_digest or not self.image._committed:
+            self.image_digest = file_digest(self.image)
+            if self.image._committed:
+                self.image.close()
         super(ImageModel, self).save(*args, **kwargs)
+        if rendered_from is not None and \
+           rendered_from != (self.image.name, self.image_digest, self.crop_from, self.effect_id):
+            # Renditions are named after what they are made from, so those of
+            # the old image are no longer referenced. They are left to the
+            # sweep, as other processes may still have them in their index.
+            schedule_sweep()
         self.pre_cache()
 
     def delete(self):
         assert self._get_pk_val() is not None, "%s object can't be deleted because its %s attribute is set to None." % (self._meta.object_name, self._meta.pk.attname)
         self.clear_cache()
+        RenditionJob.objects.filter(content_type=ContentType.objects.get_for_model(self),
+                                    object_pk=self.pk).delete()
         # Files associated to a FileField have to be manually deleted:
         # https://docs.djangoproject.com/en/dev/releases/1.3/#deleting-a-model-doesn-t-delete-associated-files
         # http://haineault.com/blog/147/
         # The data loss scenarios mentioned in the docs hopefully do not apply
         # to Photologue!
         path = self.image.path
+        archived = self.original_archive
         super(ImageModel, self).delete()
         os.remove(path)
+        if archived and not self.__class__.objects.filter(original_archive=archived).exists():
+            get_original_archive_storage().delete(archived)
 
 
 class Photo(ImageModel):
@@ -618,6 +978,10 @@ class Photo(ImageModel):
         if self.title_slug is None:
             self.title_slug = slugify(self.title)
         super(Photo, self).save(*args, **kwargs)
+        tags = getattr(self, '_exif_tags', None)
+        if tags is not None:
+            PhotoMetadata.objects.update_or_create(photo=self, defaults=exif_metadata(tags))
+            self._exif_tags = None
 
     def get_absolute_url(self):
         return reverse('pl-photo', args=[self.id])
@@ -635,6 +999,28 @@ class Photo(ImageModel):
             return None
 
 
+class PhotoMetadata(models.Model):
+    """ EXIF details of a photo, read once when it is uploaded """
+    photo = models.OneToOneField(Photo, primary_key=True, related_name='metadata', verbose_name=_('photo'))
+    date_taken = models.DateTimeField(_('date taken'), null=True, blank=True)
+    orientation = models.PositiveSmallIntegerField(_('orientation'), default=1)
+    camera_make = models.CharField(_('camera make'), max_length=100, blank=True)
+    camera_model = models.CharField(_('camera model'), max_length=100, blank=True)
+    latitude = models.FloatField(_('latitude'), null=True, blank=True)
+    longitude = models.FloatField(_('longitude'), null=True, blank=True)
+    date_extracted = models.DateTimeField(_('date extracted'), default=timezone.now)
+
+    class Meta:
+        verbose_name = _('photo metadata')
+        verbose_name_plural = _('photo metadata')
+
+    def __unicode__(self):
+        return unicode(self.photo)
+
+    def __str__(self):
+        return self.__unicode__()
+
+
 class BaseEffect(models.Model):
     name = models.CharField(_('name'), max_length=30, unique=True)
     description = models.TextField(_('description'), blank=True)
@@ -677,6 +1063,12 @@ class BaseEffect(models.Model):
         im = self.post_process(im)
         return im
 
+    def fingerprint(self):
+        """Returns a digest of the settings of this effect."""
+        values = [field.value_to_string(self) for field in self._meta.concrete_fields
+                  if field.name not in ('id', 'name', 'description')]
+        return hashlib.sha1(smart_str(u'|'.join(values))).hexdigest()
+
     def __unicode__(self):
         return self.name
 
@@ -690,13 +1082,8 @@ class BaseEffect(models.Model):
             pass
         models.Model.save(self, *args, **kwargs)
         self.create_sample()
-        for size in self.photo_sizes.all():
-            size.clear_cache()
-        # try to clear all related subclasses of ImageModel
-        for prop in [prop for prop in dir(self) if prop[-8:] == '_related']:
-            for obj in getattr(self, prop).all():
-                obj.clear_cache()
-                obj.pre_cache()
+        PhotoSizeCache().reset()
+        schedule_sweep()
 
     def delete(self):
         try:
@@ -747,6 +1134,14 @@ class PhotoEffect(BaseEffect):
         return im
 
 
+# Decoded watermark images and the layers drawn from them, kept for reuse as
+# sizes are rendered. Layers are kept by image size, as most photo sizes are
+# rendered to a few fixed dimensions.
+_watermark_marks = {}
+_watermark_layers = {}
+WATERMARK_CACHE_SIZE = 32
+
+
 class Watermark(BaseEffect):
     image = models.ImageField(_('image'), upload_to=PHOTOLOGUE_DIR + "/watermarks")
     style = models.CharField(_('style'), max_length=5, choices=WATERMARK_STYLE_CHOICES, default='scale')
@@ -756,9 +1151,27 @@ class Watermark(BaseEffect):
         verbose_name = _('watermark')
         verbose_name_plural = _('watermarks')
 
+    def get_mark(self):
+        """Returns the decoded watermark image, with its opacity applied."""
+        key = (self.image.name, self.opacity)
+        mark = _watermark_marks.get(key)
+        if mark is None:
+            mark = Image.open(self.image.path)
+            mark = reduce_opacity(mark, self.opacity) if self.opacity < 1 else mark.convert('RGBA')
+            if len(_watermark_marks) >= WATERMARK_CACHE_SIZE:
+                _watermark_marks.clear()
+            _watermark_marks[key] = mark
+        return mark
+
     def post_process(self, im):
-        mark = Image.open(self.image.path)
-        return apply_watermark(im, mark, self.style, self.opacity)
+        key = (self.image.name, self.opacity, self.style, im.size)
+        layer = _watermark_layers.get(key)
+        if layer is None:
+            layer = watermark_layer(self.get_mark(), im.size, self.style)
+            if len(_watermark_layers) >= WATERMARK_CACHE_SIZE:
+                _watermark_layers.clear()
+            _watermark_layers[key] = layer
+        return apply_watermark(im, None, self.style, self.opacity, layer=layer)
 
 
 class PhotoSize(models.Model):
@@ -772,6 +1185,10 @@ class PhotoSize(models.Model):
     increment_count = models.BooleanField(_('increment view count?'), default=False, help_text=_('If selected the image\'s "view_count" will be incremented when this photo size is displayed.'))
     effect = models.ForeignKey('PhotoEffect', null=True, blank=True, related_name='photo_sizes', verbose_name=_('photo effect'))
     watermark = models.ForeignKey('Watermark', null=True, blank=True, related_name='photo_sizes', verbose_name=_('watermark image'))
+    family = models.CharField(_('family'), max_length=40, blank=True, help_text=_('Sizes of the same family are renditions of a photo at different widths or formats, offered together to browsers through srcset. Examples: "display" for "display", "display_2x" and "display_webp".'))
+    output_format = models.CharField(_('output format'), max_length=8, blank=True, choices=OUTPUT_FORMAT_CHOICES, default='', help_text=_('Format the size is rendered in. AVIF falls back on WebP, and WebP on JPEG, where the imaging library cannot write them.'))
+    subsampling = models.PositiveSmallIntegerField(_('chroma subsampling'), null=True, blank=True, choices=JPEG_SUBSAMPLING_CHOICES, help_text=_('Resolution of the colors of JPEG renditions. Leave blank for the imaging library\'s default.'))
+    strip_metadata = models.BooleanField(_('strip metadata?'), default=True, help_text=_('If selected the EXIF data and color profile of the original are left out of renditions.'))
 
     class Meta:
         ordering = ['width', 'height']
@@ -784,26 +1201,47 @@ class PhotoSize(models.Model):
     def __str__(self):
         return self.__unicode__()
 
+    def get_output_format(self):
+        """Returns the format renditions are written in, None to keep the original's."""
+        output_format = self.output_format or None
+        if output_format in OUTPUT_FORMAT_FALLBACKS:
+            Image.init()
+            while output_format in OUTPUT_FORMAT_FALLBACKS and output_format not in Image.SAVE:
+                output_format = OUTPUT_FORMAT_FALLBACKS[output_format]
+        return output_format
+
+    def get_mime_type(self):
+        """Returns the MIME type of renditions, None when it depends on the original."""
+        return OUTPUT_FORMAT_MIME_TYPES.get(self.get_output_format())
+
+    def fingerprint(self):
+        """Returns a digest of the settings renditions of this size are made with."""
+        values = [self.width, self.height, self.quality, self.upscale, self.crop, self.output_format,
+                  self.subsampling, self.strip_metadata,
+                  self.effect.fingerprint() if self.effect is not None else '',
+                  self.watermark.fingerprint() if self.watermark is not None else '']
+        return hashlib.sha1(smart_str(u'|'.join(map(unicode, values)))).hexdigest()
+
     def clear_cache(self):
-        for cls in ImageModel.__subclasses__():
-            for obj in cls.objects.all():
-                obj.remove_size(self)
-                if self.pre_cache:
-                    obj.create_size(self)
+        """Drops the renditions of this size.
+
+        Renditions are only re-rendered when next used, and the files of the
+        old ones are removed by the next sweep (see `plsweep`).
+        """
         PhotoSizeCache().reset()
+        schedule_sweep()
 
     def save(self, *args, **kwargs):
         if self.crop is True:
             if self.width == 0 or self.height == 0:
                 raise ValueError("PhotoSize width and/or height can not be zero if crop=True.")
         super(PhotoSize, self).save(*args, **kwargs)
-        PhotoSizeCache().reset()
         self.clear_cache()
 
     def delete(self):
         assert self._get_pk_val() is not None, "%s object can't be deleted because its %s attribute is set to None." % (self._meta.object_name, self._meta.pk.attname)
-        self.clear_cache()
         super(PhotoSize, self).delete()
+        self.clear_cache()
 
     def _get_size(self):
         return (self.width, self.height)
@@ -813,29 +1251,263 @@ class PhotoSize(models.Model):
     size = property(_get_size, _set_size)
 
 
+class RenditionJobManager(models.Manager):
+    def enqueue(self, obj, photosizes):
+        """Queue the given sizes of an image for rendering by `plworker`.
+
+        Sizes that are already queued are left alone, failed ones included,
+        so an image that cannot be rendered costs no more than a lookup.
+        """
+        photosizes = [photosize for photosize in photosizes if photosize is not None]
+        if not photosizes:
+            return
+        content_type = ContentType.objects.get_for_model(obj)
+        jobs = self.filter(content_type=content_type, object_pk=obj.pk,
+                           photosize__in=photosizes)
+        queued = set(jobs.values_list('photosize_id', flat=True))
+        new_jobs = [self.model(content_type=content_type, object_pk=obj.pk, photosize=photosize)
+                    for photosize in photosizes if photosize.pk not in queued]
+        if new_jobs:
+            try:
+                with transaction.atomic():
+                    self.bulk_create(new_jobs)
+            except IntegrityError:
+                # Another request queued the same sizes in the meantime.
+                pass
+
+    def claim(self, limit):
+        """Mark up to `limit` pending jobs as running and return their ids.
+
+        A job is only handed to the caller that flipped its status, so several
+        workers can drain the same queue.
+        """
+        claimed = []
+        pending = self.filter(status=RenditionJob.PENDING).values_list('pk', flat=True)[:limit]
+        for pk in pending:
+            if self.filter(pk=pk, status=RenditionJob.PENDING).update(
+                    status=RenditionJob.RUNNING, date_started=timezone.now(),
+                    attempts=F('attempts') + 1):
+                claimed.append(pk)
+        return claimed
+
+    def retry_failed(self):
+        """Give failed jobs another RENDITION_MAX_ATTEMPTS attempts."""
+        return self.filter(status=RenditionJob.FAILED).update(status=RenditionJob.PENDING, attempts=0)
+
+    def requeue_stale(self, timeout):
+        """Give jobs back to the queue whose worker died while rendering.
+
+        The lost attempt was counted when the job was claimed, so a job which
+        keeps killing its worker fails once it has been attempted
+        RENDITION_MAX_ATTEMPTS times.
+        """
+        cutoff = timezone.now() - timedelta(seconds=timeout)
+        stale = self.filter(status=RenditionJob.RUNNING, date_started__lt=cutoff)
+        failed = stale.filter(attempts__gte=RENDITION_MAX_ATTEMPTS).update(
+            status=RenditionJob.FAILED, error='The worker rendering this size was lost.')
+        return stale.update(status=RenditionJob.PENDING) + failed
+
+
+class RenditionJob(models.Model):
+    """ A photo size waiting to be rendered for an image """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (FAILED, _('Failed')),
+    )
+
+    content_type = models.ForeignKey(ContentType, related_name='rendition_jobs')
+    object_pk = models.IntegerField(_('object ID'))
+    photosize = models.ForeignKey(PhotoSize, related_name='rendition_jobs')
+    status = models.CharField(_('status'), max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveIntegerField(_('attempts'), default=0)
+    error = models.TextField(_('error'), blank=True)
+    date_added = models.DateTimeField(_('date added'), default=timezone.now)
+    date_started = models.DateTimeField(_('date started'), null=True, blank=True)
+
+    objects = RenditionJobManager()
+
+    class Meta:
+        ordering = ['date_added']
+        unique_together = ('content_type', 'object_pk', 'photosize')
+        verbose_name = _('rendition job')
+        verbose_name_plural = _('rendition jobs')
+
+    def __unicode__(self):
+        return u'%s #%s: %s' % (self.content_type.model, self.object_pk, self.photosize)
+
+    def __str__(self):
+        return self.__unicode__()
+
+    def run(self):
+        """Render the size and drop the job, or record why it failed.
+
+        A failed job goes back to the queue until it has been attempted
+        RENDITION_MAX_ATTEMPTS times.
+        """
+        try:
+            obj = self.content_type.get_object_for_this_type(pk=self.object_pk)
+        except ObjectDoesNotExist:
+            self.delete()
+            return
+        try:
+            obj.create_size(self.photosize)
+        except Exception:
+            self.status = self.PENDING if self.attempts < RENDITION_MAX_ATTEMPTS else self.FAILED
+            self.error = traceback.format_exc()
+            self.save()
+            raise
+        self.delete()
+
+
+def file_digest(f):
+    """Returns the SHA-1 digest of the contents of the Django File `f`."""
+    digest = hashlib.sha1()
+    for chunk in f.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+_original_archive_storage = None
+
+
+def get_original_archive_storage():
+    """Returns the storage uploads are archived in, created on first use."""
+    global _original_archive_storage
+    if _original_archive_storage is None:
+        _original_archive_storage = get_storage_class(ORIGINAL_ARCHIVE_STORAGE)(
+            **getattr(settings, 'PHOTOLOGUE_ORIGINAL_ARCHIVE_STORAGE_OPTIONS', {}))
+    return _original_archive_storage
+
+
+def archive_original(f):
+    """Copies the Django File `f` to the archive storage. Returns its name there.
+
+    Archived originals are named after their digest, so an upload repeated
+    in several galleries is only archived once.
+    """
+    digest = file_digest(f)
+    ext = os.path.splitext(f.name)[1].lower()
+    name = posixpath.join(PHOTOLOGUE_DIR, 'originals', digest[:2], digest + ext)
+    storage = get_original_archive_storage()
+    if not storage.exists(name):
+        f.seek(0)
+        name = storage.save(name, f)
+    return name
+
+
+class Revision(models.Model):
+    """ A counter bumped on changes every process must pick up """
+    name = models.CharField(_('name'), max_length=40, primary_key=True)
+    number = models.PositiveIntegerField(_('number'), default=0)
+
+    class Meta:
+        verbose_name = _('revision')
+        verbose_name_plural = _('revisions')
+
+    def __unicode__(self):
+        return u'%s: %d' % (self.name, self.number)
+
+    def __str__(self):
+        return self.__unicode__()
+
+
+def get_revision(name):
+    """Returns the current number of a revision, 0 until it is first bumped."""
+    return Revision.objects.filter(name=name).values_list('number', flat=True).first() or 0
+
+
+def bump_revision(name):
+    """Adds one to a revision. Returns its new number."""
+    if not Revision.objects.filter(name=name).update(number=F('number') + 1):
+        try:
+            with transaction.atomic():
+                Revision.objects.create(name=name, number=1)
+        except IntegrityError:
+            # Created by another process in the meantime
+            Revision.objects.filter(name=name).update(number=F('number') + 1)
+    return get_revision(name)
+
+
+def schedule_sweep():
+    """Asks `plworker` to sweep old renditions on its next round. Without a
+    worker, the next `plcache` or `plsweep` run does it."""
+    bump_revision(SWEEP_REVISION)
+
+
+def claim_sweep():
+    """Takes the pending sweeps, if any. Returns whether there were some.
+
+    Only the worker clearing the count gets them, so several workers do
+    not sweep the same changes.
+    """
+    pending = get_revision(SWEEP_REVISION)
+    return bool(pending) and bool(Revision.objects.filter(name=SWEEP_REVISION, number=pending).update(number=0))
+
+
 class PhotoSizeCache(object):
-    __state = {"sizes": {}}
+    """Registry of the photo sizes, shared by every instance in a process.
+
+    Changing a size bumps the SIZE_REVISION revision in the database. Every
+    process compares its copy against that number at most once per
+    SIZE_CACHE_CHECK_INTERVAL seconds and reloads the sizes when it changed,
+    so all processes pick up new sizes without querying them on every
+    lookup.
+    """
+    __state = {"sizes": {}, "_accessors": None, "_families": None, "version": None, "checked": 0,
+               "stats": {"hits": 0, "misses": 0, "reloads": 0}}
 
     def __init__(self):
         self.__dict__ = self.__state
+        now = time.time()
+        if now - self.checked >= SIZE_CACHE_CHECK_INTERVAL:
+            self.checked = now
+            version = get_revision(SIZE_REVISION)
+            if version != self.version:
+                if self.version is not None:
+                    self.stats['reloads'] += 1
+                self.sizes = {}
+                self._accessors = None
+                self._families = None
+                self.version = version
         if not len(self.sizes):
-            sizes = PhotoSize.objects.all()
+            self.stats['misses'] += 1
+            sizes = PhotoSize.objects.select_related('effect', 'watermark')
             for size in sizes:
                 self.sizes[size.name] = size
+        else:
+            self.stats['hits'] += 1
 
-    def reset(self):
-        self.sizes = {}
-
-
-# Set up the accessor methods
-def add_methods(sender, instance, signal, *args, **kwargs):
-    """ Adds methods to access sized images (urls, paths)
+    @property
+    def accessors(self):
+        """Maps the name of every size accessor method to its implementation and size."""
+        if self._accessors is None:
+            accessors = {}
+            for size in self.sizes.keys():
+                for kind in ('size', 'photosize', 'url', 'filename'):
+                    accessors['get_%s_%s' % (size, kind)] = ('_get_SIZE_%s' % kind, size)
+            self._accessors = accessors
+        return self._accessors
 
-    after the Photo model's __init__ function completes,
-    this method calls "add_accessor_methods" on each instance.
-    """
-    if hasattr(instance, 'add_accessor_methods'):
-        instance.add_accessor_methods()
+    @property
+    def families(self):
+        """Maps every size family to its sizes, narrowest first."""
+        if self._families is None:
+            families = {}
+            for size in self.sizes.values():
+                if size.family:
+                    families.setdefault(size.family, []).append(size)
+            for family in families.values():
+                family.sort(key=lambda size: (size.width, size.height))
+            self._families = families
+        return self._families
 
-# connect the add_accessor_methods function to the post_init signal
-post_init.connect(add_methods)
+    def reset(self):
+        """Drops the sizes of every process, to be reloaded on next use."""
+        self.version = bump_revision(SIZE_REVISION)
+        self.sizes = {}
+        self._accessors = None
+        self._families = None
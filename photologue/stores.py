@@ -0,0 +1,240 @@
+""" Backends for keeping rendered photo sizes.
+
+Renditions are addressed by a name relative to the store, such as
+"photologue/photos/cache/beach_thumbnail.jpg". The store decides where the
+bytes actually live and how their URL is built, so the web nodes rendering
+gallery pages do not need to share a disk.
+
+The backend is chosen with the PHOTOLOGUE_RENDITION_STORE setting, a dotted
+path to one of the classes below (or a callable returning a store), and is
+constructed with the keyword arguments in PHOTOLOGUE_RENDITION_STORE_OPTIONS.
+"""
+import hashlib
+import os
+import posixpath
+from importlib import import_module
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage, FileSystemStorage
+from django.utils.encoding import smart_str
+
+from index import get_rendition_index
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+
+class RenditionStore(object):
+    """Keeps renditions in any Django storage.
+
+    Renditions written or found by the store are recorded in the rendition
+    index, so only renditions not known to exist reach the storage.
+    """
+
+    def __init__(self, storage=None, index=None):
+        self.storage = storage or default_storage
+        self.index = index or get_rendition_index()
+
+    def location(self, name):
+        """Returns the storage name a rendition is kept under."""
+        return name
+
+    def exists(self, name):
+        if name in self.index:
+            return True
+        if self.stored(name):
+            self.index.add(name)
+            return True
+        return False
+
+    def stored(self, name):
+        """Checks the storage itself for the rendition, bypassing the index."""
+        return self.storage.exists(self.location(name))
+
+    def save(self, name, im, format, **options):
+        """Encodes the PIL image `im` and stores it. Returns its size in bytes."""
+        buf = StringIO()
+        im.save(buf, format, **options)
+        return self.write(name, buf.getvalue())
+
+    def write(self, name, data):
+        """Stores an already encoded rendition. Returns its size in bytes."""
+        location = self.location(name)
+        if self.storage.exists(location):
+            self.storage.delete(location)
+        self.storage.save(location, ContentFile(data))
+        self.index.add(name)
+        return len(data)
+
+    def open(self, name):
+        return self.storage.open(self.location(name), 'rb')
+
+    def delete(self, name, prune=True):
+        self.index.discard(name)
+        self.storage.delete(self.location(name))
+
+    def url(self, name):
+        return self.storage.url(self.location(name))
+
+    def listdir(self, directory):
+        """Returns the names of the renditions kept in `directory`."""
+        try:
+            files = self.storage.listdir(directory)[1]
+        except OSError:
+            return []
+        return [posixpath.join(directory, filename) for filename in files]
+
+    def path(self, name):
+        """Returns a local filesystem path for the rendition, if it has one."""
+        try:
+            return self.storage.path(self.location(name))
+        except NotImplementedError:
+            return None
+
+
+class LocalRenditionStore(RenditionStore):
+    """Keeps renditions on the local filesystem, next to the originals."""
+
+    def __init__(self, storage=None, index=None):
+        super(LocalRenditionStore, self).__init__(storage, index)
+        if not isinstance(self.storage, FileSystemStorage):
+            raise ValueError('%s needs a FileSystemStorage' % self.__class__.__name__)
+
+    def stored(self, name):
+        return os.path.isfile(self.path(name))
+
+    def _make_directory(self, path):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # created by another worker in the meantime
+                if not os.path.isdir(directory):
+                    raise
+
+    def save(self, name, im, format, **options):
+        path = self.path(name)
+        self._make_directory(path)
+        try:
+            im.save(path, format, **options)
+        except IOError:
+            if os.path.isfile(path):
+                os.unlink(path)
+            raise
+        self.index.add(name)
+        return os.path.getsize(path)
+
+    def write(self, name, data):
+        path = self.path(name)
+        self._make_directory(path)
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.index.add(name)
+        return len(data)
+
+    def open(self, name):
+        return open(self.path(name), 'rb')
+
+    def delete(self, name, prune=True):
+        self.index.discard(name)
+        path = self.path(name)
+        if os.path.isfile(path):
+            os.remove(path)
+        if prune:
+            self.prune(posixpath.dirname(name))
+
+    def prune(self, directory):
+        """Removes the directory and its parents while they are empty, up to
+        the root of the storage."""
+        root = os.path.abspath(self.storage.location)
+        path = os.path.abspath(self.storage.path(directory))
+        while path.startswith(root + os.sep):
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+            path = os.path.dirname(path)
+
+    def path(self, name):
+        return smart_str(self.storage.path(self.location(name)))
+
+
+class ShardedRenditionStore(LocalRenditionStore):
+    """Spreads renditions over a two level tree of hashed subdirectories.
+
+    "cache/beach_thumbnail.jpg" is kept as "cache/3f/a2/beach_thumbnail.jpg",
+    which keeps directories small for libraries of many thousand photos.
+    """
+
+    def location(self, name):
+        directory, filename = posixpath.split(name)
+        digest = hashlib.sha1(smart_str(name)).hexdigest()
+        return posixpath.join(directory, digest[:2], digest[2:4], filename)
+
+    def listdir(self, directory):
+        names = []
+        try:
+            shards = self.storage.listdir(directory)[0]
+        except OSError:
+            return names
+        for shard in shards:
+            for subshard in self.storage.listdir(posixpath.join(directory, shard))[0]:
+                files = self.storage.listdir(posixpath.join(directory, shard, subshard))[1]
+                names.extend(posixpath.join(directory, filename) for filename in files)
+        return names
+
+    def delete(self, name, prune=True):
+        super(ShardedRenditionStore, self).delete(name, prune=False)
+        # Always drop emptied shards, so the rendition directory itself can
+        # be pruned later on
+        shard = os.path.dirname(self.path(name))
+        for level in range(2):
+            try:
+                os.rmdir(shard)
+            except OSError:
+                break
+            shard = os.path.dirname(shard)
+        if prune:
+            self.prune(posixpath.dirname(name))
+
+
+class S3RenditionStore(RenditionStore):
+    """Keeps renditions in an S3 compatible bucket through django-storages.
+
+    PHOTOLOGUE_RENDITION_STORE_OPTIONS are passed on to S3BotoStorage, so a
+    local stand-in such as MinIO can be used by setting its host, port and
+    use_ssl options.
+    """
+
+    def __init__(self, storage=None, index=None, **options):
+        if storage is None:
+            from storages.backends.s3boto import S3BotoStorage
+            options.setdefault('file_overwrite', True)
+            storage = S3BotoStorage(**options)
+        super(S3RenditionStore, self).__init__(storage, index)
+
+    def write(self, name, data):
+        # The storage overwrites existing keys, no need to check first
+        self.storage.save(self.location(name), ContentFile(data))
+        self.index.add(name)
+        return len(data)
+
+
+_store = None
+
+
+def get_rendition_store():
+    """Returns the configured rendition store, created on first use."""
+    global _store
+    if _store is None:
+        backend = getattr(settings, 'PHOTOLOGUE_RENDITION_STORE',
+                          'photologue.stores.LocalRenditionStore')
+        if not callable(backend):
+            module_name, class_name = backend.rsplit('.', 1)
+            backend = getattr(import_module(module_name), class_name)
+        _store = backend(**getattr(settings, 'PHOTOLOGUE_RENDITION_STORE_OPTIONS', {}))
+    return _store
@@ -9,3 +9,27 @@ def next_in_gallery(photo, gallery):
 @register.inclusion_tag('photologue/tags/prev_in_gallery.html')
 def previous_in_gallery(photo, gallery):
     return {'photo': photo.get_previous_in_gallery(gallery)}
+
+@register.simple_tag
+def srcset(photo, size):
+    """Outputs the srcset of the family of a photo size, e.g.
+    <img src="{{ photo.get_display_url }}" srcset="{% srcset photo 'display' %}">
+    Outputs nothing if there is no such size.
+    """
+    try:
+        return photo.get_srcset(size)[1]
+    except ValueError:
+        return ''
+
+@register.inclusion_tag('photologue/tags/picture.html')
+def picture(photo, size, sizes='100vw', alt=None):
+    """Outputs a <picture> offering every rendition of the family of a photo
+    size, e.g. {% picture photo 'display' sizes='(max-width: 800px) 100vw, 800px' %}
+    Offers just the original image if there is no such size.
+    """
+    try:
+        src, srcset, sources = photo.get_srcset(size)
+    except ValueError:
+        src, srcset, sources = photo.image.url, '', []
+    return {'photo': photo, 'src': src, 'srcset': srcset, 'sources': sources,
+            'sizes': sizes, 'alt': photo.title if alt is None else alt}
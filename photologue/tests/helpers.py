@@ -0,0 +1,95 @@
+import itertools
+import struct
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from PIL import Image
+
+from photologue.models import Gallery, Photo, PhotoSize
+
+
+class InlinePool(object):
+    """Stands in for the worker pool, running the tasks in this process, where
+    the test database is."""
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def imap_unordered(self, func, iterable, chunksize=1):
+        return itertools.imap(func, iterable)
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+
+def create_test_gallery(title='Patagonia', is_public=True):
+    return Gallery.objects.create(
+        title=title,
+        title_slug=title.lower(),
+        is_public=is_public,
+        content_type=ContentType.objects.get_for_model(Gallery)
+    )
+
+
+def create_test_photo(gallery, data=None, name='beach.jpg', **kwargs):
+    """Saves a photo the way an upload is saved, from a file not yet stored."""
+    photo = Photo(title=kwargs.pop('title', 'Beach'), gallery=gallery, **kwargs)
+    photo.image = upload(data or make_jpeg(), name)
+    photo.save()
+    return photo
+
+
+def create_test_size(name='thumbnail', width=100, height=75, **kwargs):
+    return PhotoSize.objects.create(name=name, width=width, height=height, **kwargs)
+
+
+def upload(data, name='beach.jpg'):
+    return SimpleUploadedFile(name, data, content_type='image/jpeg')
+
+
+def make_image(width=400, height=300, format='JPEG', mode='RGB', **options):
+    """Encodes a gradient, so the image has some detail to resize."""
+    im = Image.new('L', (width, height))
+    im.putdata([255 * x // max(width - 1, 1) for y in range(height) for x in range(width)])
+    im = im.convert(mode)
+    buf = StringIO()
+    im.save(buf, format, **options)
+    return buf.getvalue()
+
+
+def make_jpeg(width=400, height=300, **options):
+    return make_image(width, height, 'JPEG', **options)
+
+
+def make_exif_jpeg(width=64, height=48, orientation=1, make='Canon', date_taken='2015:06:01 10:11:12'):
+    """Returns a JPEG with an EXIF segment holding the camera make, the
+    orientation and the date the photo was taken.
+    """
+    make += '\x00'
+    date_taken += '\x00'
+    ifd0_offset = 8
+    ifd0_size = 2 + 3 * 12 + 4
+    make_offset = ifd0_offset + ifd0_size
+    exif_offset = make_offset + len(make)
+    date_offset = exif_offset + 2 + 12 + 4
+    tiff = 'II*\x00' + struct.pack('<I', ifd0_offset)
+    tiff += struct.pack('<H', 3)
+    tiff += struct.pack('<HHII', 0x010f, 2, len(make), make_offset)
+    tiff += struct.pack('<HHIHH', 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack('<HHII', 0x8769, 4, 1, exif_offset)
+    tiff += struct.pack('<I', 0)
+    tiff += make
+    tiff += struct.pack('<H', 1) + struct.pack('<HHII', 0x9003, 2, len(date_taken), date_offset)
+    tiff += struct.pack('<I', 0)
+    tiff += date_taken
+    app1 = 'Exif\x00\x00' + tiff
+    data = make_jpeg(width, height)
+    return data[:2] + '\xff\xe1' + struct.pack('>H', len(app1) + 2) + app1 + data[2:]
@@ -0,0 +1,41 @@
+from photologue.models import Photo
+from photologue.stores import get_rendition_store
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class SizeAccessorTest(PhotologueTestCase):
+    def setUp(self):
+        super(SizeAccessorTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery)
+
+    def test_accessors_of_defined_sizes(self):
+        self.assertEqual(self.photo.get_thumbnail_photosize(), self.thumbnail)
+        self.assertEqual(self.photo.get_thumbnail_size(), (100, 75))
+        name = self.photo._get_rendition_name(self.thumbnail)
+        self.assertEqual(self.photo.get_thumbnail_url(), get_rendition_store().url(name))
+        self.assertEqual(self.photo.get_thumbnail_filename(), get_rendition_store().path(name))
+
+    def test_accessors_are_not_set_on_instances(self):
+        photo = Photo.objects.get(pk=self.photo.pk)
+
+        self.assertFalse([name for name in vars(photo) if name.startswith('get_thumbnail')])
+
+    def test_unknown_accessors(self):
+        self.assertRaises(AttributeError, getattr, self.photo, 'get_poster_url')
+        self.assertRaises(AttributeError, getattr, self.photo, 'thumbnail_url')
+        self.assertFalse(hasattr(self.photo, 'get_thumbnail_width'))
+        try:
+            self.photo.get_poster_url
+        except AttributeError, e:
+            self.assertEqual(str(e), "'Photo' object has no attribute 'get_poster_url'")
+
+    def test_accessors_follow_size_changes(self):
+        display = helpers.create_test_size('display', 400, 300)
+
+        self.assertEqual(self.photo.get_display_photosize(), display)
+
+        display.delete()
+
+        self.assertFalse(hasattr(self.photo, 'get_display_url'))
@@ -0,0 +1,91 @@
+import json
+import os
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils.six import StringIO
+
+from photologue.benchmarks import corpus, runner
+from photologue.benchmarks.stages import STAGES
+from photologue.models import Image
+from photologue.tests.test_main import PhotologueTestCase
+
+
+def result(stage='decode', ms_per_megapixel=10.0):
+    return {'stage': stage, 'format': 'JPEG', 'resolution': '64x48', 'ms_per_megapixel': ms_per_megapixel}
+
+
+class CorpusTest(PhotologueTestCase):
+    def test_parse_resolution(self):
+        self.assertEqual(corpus.parse_resolution('1920x1080'), (1920, 1080))
+        self.assertEqual(corpus.parse_resolution('640X480'), (640, 480))
+        self.assertRaises(ValueError, corpus.parse_resolution, '1920')
+
+    def test_make_corpus(self):
+        images = corpus.make_corpus(self.media_root, [(64, 48), (32, 32)], ['JPEG', 'PNG'], count=2)
+
+        self.assertEqual(len(images), 8)
+        for path, im_format, size in images:
+            im = Image.open(path)
+            self.assertEqual(im.format, im_format)
+            self.assertEqual(im.size, size)
+
+
+class RunnerTest(PhotologueTestCase):
+    def test_every_stage_runs(self):
+        (path, im_format, size), = corpus.make_corpus(self.media_root, [(320, 240)], ['JPEG'])
+
+        for name, stage in STAGES:
+            measured = runner.run_case((name, path, im_format, size, 2))
+            self.assertEqual(measured['stage'], name)
+            self.assertEqual(measured['resolution'], '320x240')
+            self.assertEqual(measured['runs'], 2)
+            self.assertLessEqual(measured['best_ms'], measured['mean_ms'])
+
+    def test_compare(self):
+        baseline = {'results': [result('decode', 10.0), result('resize', 10.0), result('encode', 10.0)]}
+        results = {'results': [result('decode', 10.5), result('resize', 12.0), result('effect', 5.0)]}
+
+        comparison = runner.compare(baseline, results, threshold=0.1)
+
+        self.assertEqual([(key[0], regressed) for key, old, new, change, regressed in comparison],
+                         [('decode', False), ('resize', True)])
+        self.assertAlmostEqual(comparison[1][3], 0.2)
+
+
+class BenchmarkCommandTest(PhotologueTestCase):
+    def benchmark(self, **options):
+        out = StringIO()
+        defaults = {'resolutions': '64x48', 'formats': 'jpeg', 'stages': 'decode,encode', 'repeat': 1}
+        defaults.update(options)
+        call_command('plbenchmark', stdout=out, **defaults)
+        return out.getvalue()
+
+    def test_results_are_written(self):
+        output = os.path.join(self.media_root, 'results.json')
+
+        out = self.benchmark(output=output)
+
+        self.assertIn('decode', out)
+        self.assertIn('encode', out)
+        results = runner.read(output)
+        self.assertEqual(sorted(r['stage'] for r in results['results']), ['decode', 'encode'])
+
+    def test_regressions_fail(self):
+        baseline = os.path.join(self.media_root, 'baseline.json')
+        with open(baseline, 'w') as f:
+            json.dump({'results': [result('decode', 0.000001)]}, f)
+
+        self.assertRaises(CommandError, self.benchmark, compare=baseline)
+
+    def test_improvements_pass(self):
+        baseline = os.path.join(self.media_root, 'baseline.json')
+        with open(baseline, 'w') as f:
+            json.dump({'results': [result('decode', 10 ** 9)]}, f)
+
+        self.assertNotIn('REGRESSION', self.benchmark(compare=baseline))
+
+    def test_invalid_options(self):
+        self.assertRaises(CommandError, self.benchmark, resolutions='wide')
+        self.assertRaises(CommandError, self.benchmark, formats='tiff')
+        self.assertRaises(CommandError, self.benchmark, stages='upload')
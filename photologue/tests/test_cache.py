@@ -0,0 +1,82 @@
+import os
+
+import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils.six import StringIO
+
+from photologue.models import Photo
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+from photologue.workers import cache_image
+
+
+class CacheCommandTest(PhotologueTestCase):
+    def setUp(self):
+        super(CacheCommandTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.display = helpers.create_test_size('display', 300, 225)
+        self.photos = [helpers.create_test_photo(self.gallery, title='Beach %d' % i) for i in range(3)]
+        self.checkpoint = os.path.join(self.media_root, 'plcache')
+
+    def cache(self, *sizes, **options):
+        out = StringIO()
+        err = StringIO()
+        call_command('plcache', *sizes, checkpoint=self.checkpoint, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_renders_given_sizes(self):
+        out, err = self.cache('thumbnail')
+
+        self.assertIn('3/3 photos', out)
+        for photo in self.photos:
+            self.assertTrue(photo.size_exists(self.thumbnail))
+            self.assertFalse(photo.size_exists(self.display))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_unknown_sizes(self):
+        self.assertRaises(CommandError, self.cache, 'poster')
+
+    def test_interrupted_run_resumes(self):
+        failing = self.photos[1]
+        create_sizes = Photo.create_sizes
+
+        def fail_one(photo, photosizes):
+            if photo.pk == failing.pk:
+                raise IOError('disk full')
+            return create_sizes(photo, photosizes)
+
+        with mock.patch.object(Photo, 'create_sizes', autospec=True, side_effect=fail_one):
+            out, err = self.cache('thumbnail')
+        self.assertIn('1 photos failed', out)
+        self.assertIn('disk full', err)
+        self.assertTrue(os.path.exists(self.checkpoint))
+        self.assertFalse(failing.size_exists(self.thumbnail))
+
+        with mock.patch.object(Photo, 'create_sizes', autospec=True, side_effect=create_sizes) as rendered:
+            out, err = self.cache('thumbnail')
+        self.assertIn('(2 already done)', out)
+        self.assertEqual([call[0][0].pk for call in rendered.call_args_list], [failing.pk])
+        self.assertTrue(failing.size_exists(self.thumbnail))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_of_other_sizes_is_ignored(self):
+        with open(self.checkpoint, 'w') as checkpoint:
+            checkpoint.write('%d\nphotologue.photo:%d\n' % (self.display.pk, self.photos[0].pk))
+
+        out, err = self.cache('thumbnail')
+
+        self.assertIn('for 3 photos (0 already done)', out)
+
+    def test_worker_picks_up_edited_sizes(self):
+        photo = self.photos[0]
+        task = ('photologue', 'photo', photo.pk, (self.thumbnail.pk,), False)
+        cache_image(task)
+
+        self.thumbnail.size = (120, 90)
+        self.thumbnail.save()
+        self.assertEqual(cache_image(task)[4], None)
+
+        self.assertTrue(photo.size_exists(self.thumbnail))
+        self.assertEqual(photo.get_thumbnail_size(), (120, 90))
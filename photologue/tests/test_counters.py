@@ -0,0 +1,72 @@
+import mock
+
+from django.core.signals import request_finished
+from django.db import DatabaseError, close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+
+from photologue.counters import ViewCounter, view_counter
+from photologue.models import Photo
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class ViewCounterTest(PhotologueTestCase):
+    def setUp(self):
+        super(ViewCounterTest, self).setUp()
+        self.photo = helpers.create_test_photo(self.gallery)
+        self.other_photo = helpers.create_test_photo(self.gallery, name='glacier.jpg')
+        self.counter = ViewCounter(interval=60)
+
+    def test_views_are_buffered_until_flushed(self):
+        for i in range(3):
+            self.counter.add(self.photo)
+        self.counter.add(self.other_photo)
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 0)
+
+        self.counter.flush()
+
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 3)
+        self.assertEqual(Photo.objects.get(pk=self.other_photo.pk).view_count, 1)
+
+    def test_one_update_per_view_count(self):
+        self.counter.add(self.photo)
+        self.counter.add(self.other_photo)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.counter.flush()
+
+        self.assertEqual(len([q for q in queries if 'UPDATE ' in q['sql']]), 1)
+
+    def test_views_are_written_at_once_without_interval(self):
+        ViewCounter(interval=0).add(self.photo)
+
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 1)
+
+    def test_views_are_kept_when_they_cannot_be_written(self):
+        self.counter.add(self.photo, 2)
+
+        with mock.patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError):
+            self.counter.flush()
+        self.counter.flush()
+
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 2)
+
+    def test_flushed_at_the_end_of_requests(self):
+        view_counter.add(self.photo)
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 0)
+
+        with mock.patch.object(view_counter, 'interval', 0):
+            request_finished.send(sender=self.__class__)
+
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 1)
+
+    def test_django_receivers_are_left_in_order(self):
+        receivers = [receiver() for key, receiver in request_finished.receivers]
+
+        self.assertLess(receivers.index(close_old_connections), receivers.index(view_counter.flush_due))
+
+    def test_increment_count_uses_the_shared_counter(self):
+        self.photo.increment_count()
+        view_counter.flush()
+
+        self.assertEqual(Photo.objects.get(pk=self.photo.pk).view_count, 1)
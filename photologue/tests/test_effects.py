@@ -0,0 +1,106 @@
+from django.core.files.base import ContentFile
+
+from PIL import Image, ImageChops
+
+from photologue import models
+from photologue.models import PhotoEffect, Watermark
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+from photologue.utils import reflection
+from photologue.utils.reflection import add_reflection, reflection_mask
+from photologue.utils.watermark import apply_watermark, reduce_opacity
+
+
+def same_image(a, b):
+    return a.size == b.size and ImageChops.difference(a.convert('RGB'), b.convert('RGB')).getbbox() is None
+
+
+class ReflectionTest(PhotologueTestCase):
+    def setUp(self):
+        super(ReflectionTest, self).setUp()
+        self.addCleanup(reflection._masks.clear)
+        self.im = Image.new('RGB', (40, 100), (200, 0, 0))
+
+    def test_reflection(self):
+        im = add_reflection(self.im, bgcolor='#ffffff', amount=0.5, opacity=0.6)
+
+        self.assertEqual(im.size, (40, 150))
+        self.assertEqual(im.getpixel((20, 50)), (200, 0, 0))
+        # The reflection fades from the image into the background
+        top = im.getpixel((20, 100))
+        bottom = im.getpixel((20, 149))
+        self.assertLess(top[1], bottom[1])
+        self.assertGreater(top[0], 200)
+        self.assertGreater(bottom[1], 240)
+
+    def test_no_reflection(self):
+        im = add_reflection(self.im, bgcolor='#ffffff', amount=0)
+
+        self.assertTrue(same_image(im, self.im))
+
+    def test_masks_are_reused(self):
+        mask = reflection_mask((40, 100), 0.5, 0.6)
+
+        self.assertIs(reflection_mask((40, 100), 0.5, 0.6), mask)
+        self.assertEqual(mask.size, (40, 50))
+        self.assertIsNot(reflection_mask((40, 80), 0.5, 0.6), mask)
+
+    def test_effect_adds_reflection(self):
+        effect = PhotoEffect(name='reflected', reflection_size=0.2)
+
+        self.assertEqual(effect.post_process(self.im).size, (40, 120))
+        self.assertTrue(same_image(PhotoEffect(name='plain').post_process(self.im), self.im))
+
+
+class WatermarkTest(PhotologueTestCase):
+    def setUp(self):
+        super(WatermarkTest, self).setUp()
+        self.addCleanup(models._watermark_marks.clear)
+        self.addCleanup(models._watermark_layers.clear)
+        self.mark = Image.new('RGBA', (10, 10), (0, 0, 255, 255))
+        self.im = Image.new('RGB', (40, 30), (255, 255, 255))
+
+    def create_watermark(self, style, opacity=1):
+        watermark = Watermark(name='mark %s %s' % (style, opacity), style=style, opacity=opacity)
+        watermark.image.save('mark.png', ContentFile(helpers.make_image(10, 10, 'PNG')), save=False)
+        return watermark
+
+    def test_positioned_mark(self):
+        im = apply_watermark(self.im, self.mark, (5, 5))
+
+        self.assertEqual(im.getpixel((7, 7))[:3], (0, 0, 255))
+        self.assertEqual(im.getpixel((20, 20))[:3], (255, 255, 255))
+
+    def test_tiled_mark(self):
+        im = apply_watermark(self.im, self.mark, 'tile')
+
+        for xy in ((0, 0), (15, 15), (35, 25)):
+            self.assertEqual(im.getpixel(xy)[:3], (0, 0, 255))
+
+    def test_scaled_mark(self):
+        im = apply_watermark(self.im, self.mark, 'scale')
+
+        self.assertEqual(im.getpixel((20, 15))[:3], (0, 0, 255))
+        self.assertEqual(im.getpixel((2, 15))[:3], (255, 255, 255))
+
+    def test_opacity(self):
+        im = apply_watermark(self.im, self.mark, (0, 0), opacity=0.5)
+
+        red, green, blue = im.getpixel((5, 5))[:3]
+        self.assertTrue(100 < red < 160)
+        self.assertEqual(blue, 255)
+        self.assertEqual(reduce_opacity(self.mark, 0.5).getpixel((0, 0))[3], 127)
+
+    def test_layers_are_reused_for_the_same_size(self):
+        watermark = self.create_watermark('tile', 0.5)
+        expected = apply_watermark(self.im, Image.open(watermark.image.path), 'tile', 0.5)
+
+        first = watermark.post_process(self.im)
+        second = watermark.post_process(self.im)
+
+        self.assertTrue(same_image(first, expected))
+        self.assertTrue(same_image(second, expected))
+        self.assertEqual(len(models._watermark_marks), 1)
+        self.assertEqual(len(models._watermark_layers), 1)
+        watermark.post_process(Image.new('RGB', (20, 20)))
+        self.assertEqual(len(models._watermark_layers), 2)
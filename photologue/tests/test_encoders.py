@@ -0,0 +1,94 @@
+import mock
+
+from photologue.models import Image
+from photologue.stores import get_rendition_store
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class OutputFormatTest(PhotologueTestCase):
+    def setUp(self):
+        super(OutputFormatTest, self).setUp()
+        self.jpeg = helpers.create_test_photo(self.gallery, helpers.make_jpeg(400, 300))
+        self.png = helpers.create_test_photo(self.gallery, helpers.make_image(400, 300, 'PNG'),
+                                             name='chart.png', title='Chart')
+
+    def render(self, photo, photosize):
+        photo.create_size(photosize)
+        name = photo._get_rendition_name(photosize)
+        f = get_rendition_store().open(name)
+        try:
+            im = Image.open(f)
+            im.load()
+            f.seek(0, 2)
+            return im, f.tell()
+        finally:
+            f.close()
+
+    def test_original_format_is_kept(self):
+        photosize = helpers.create_test_size('display', 200, 150)
+
+        self.assertEqual(self.render(self.png, photosize)[0].format, 'PNG')
+        self.assertEqual(self.render(self.jpeg, photosize)[0].format, 'JPEG')
+        self.assertTrue(self.png._get_rendition_name(photosize).endswith('.png'))
+
+    def test_jpeg_output(self):
+        photosize = helpers.create_test_size('display', 200, 150, output_format='JPEG')
+
+        im, length = self.render(self.png, photosize)
+
+        self.assertEqual(im.format, 'JPEG')
+        self.assertNotIn('progressive', im.info)
+        self.assertTrue(self.png._get_rendition_name(photosize).endswith('.jpg'))
+
+    def test_progressive_jpeg_output(self):
+        photosize = helpers.create_test_size('display', 200, 150, output_format='PJPEG')
+
+        im, length = self.render(self.jpeg, photosize)
+
+        self.assertEqual(im.format, 'JPEG')
+        self.assertIn('progressive', im.info)
+
+    def test_smallest_jpeg_output(self):
+        baseline = helpers.create_test_size('baseline', 200, 150, output_format='JPEG')
+        progressive = helpers.create_test_size('progressive', 200, 150, output_format='PJPEG')
+        smallest = helpers.create_test_size('smallest', 200, 150, output_format='SMALLEST')
+
+        lengths = [self.render(self.jpeg, photosize)[1] for photosize in (baseline, progressive)]
+
+        self.assertEqual(self.render(self.jpeg, smallest)[1], min(lengths))
+
+    def test_unsupported_formats_fall_back(self):
+        photosize = helpers.create_test_size('display', 200, 150, output_format='AVIF')
+        Image.init()
+        save = dict((key, value) for key, value in Image.SAVE.items() if key not in ('AVIF', 'WEBP'))
+
+        with mock.patch.dict(Image.SAVE, save, clear=True):
+            self.assertEqual(photosize.get_output_format(), 'JPEG')
+            self.assertEqual(photosize.get_mime_type(), 'image/jpeg')
+            self.assertEqual(self.render(self.jpeg, photosize)[0].format, 'JPEG')
+
+    def test_chroma_subsampling(self):
+        sharp = helpers.create_test_size('sharp', 200, 150, subsampling=0)
+        small = helpers.create_test_size('small', 200, 150, subsampling=2)
+
+        # Sampling factors of the luma component
+        self.assertEqual(self.render(self.jpeg, sharp)[0].layer[0][1:3], (1, 1))
+        self.assertEqual(self.render(self.jpeg, small)[0].layer[0][1:3], (2, 2))
+
+    def test_metadata_is_stripped_by_default(self):
+        photo = helpers.create_test_photo(self.gallery, helpers.make_exif_jpeg(200, 150), name='camera.jpg')
+        stripped = helpers.create_test_size('stripped', 100, 75)
+        kept = helpers.create_test_size('kept', 100, 75, strip_metadata=False)
+
+        self.assertNotIn('exif', self.render(photo, stripped)[0].info)
+        self.assertIn('exif', self.render(photo, kept)[0].info)
+
+    def test_encoder_settings_rename_renditions(self):
+        photosize = helpers.create_test_size('display', 200, 150)
+        name = self.jpeg._get_rendition_name(photosize)
+
+        photosize.subsampling = 0
+        photosize.save()
+
+        self.assertNotEqual(self.jpeg._get_rendition_name(photosize), name)
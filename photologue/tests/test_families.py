@@ -0,0 +1,72 @@
+from django.template import Context, Template
+
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class SizeFamilyTest(PhotologueTestCase):
+    def setUp(self):
+        super(SizeFamilyTest, self).setUp()
+        self.display = helpers.create_test_size('display', 400, 300, family='display')
+        self.display_2x = helpers.create_test_size('display_2x', 800, 600, family='display')
+        self.display_webp = helpers.create_test_size('display_webp', 400, 300, family='display',
+                                                     output_format='WEBP')
+        self.display_tall = helpers.create_test_size('display_tall', 0, 300, family='display')
+        self.photo = helpers.create_test_photo(self.gallery, helpers.make_jpeg(1000, 750))
+
+    def url(self, photosize):
+        return self.photo._get_rendition_url(photosize)
+
+    def test_family_is_rendered_together(self):
+        self.photo.get_display_url()
+
+        for photosize in (self.display, self.display_2x, self.display_webp, self.display_tall):
+            self.assertTrue(self.photo.size_exists(photosize))
+
+    def test_srcset(self):
+        src, srcset, sources = self.photo.get_srcset('display')
+
+        self.assertEqual(src, self.url(self.display))
+        self.assertEqual(srcset, '%s 400w, %s 800w' % (self.url(self.display), self.url(self.display_2x)))
+        self.assertEqual(sources, [(self.display_webp.get_mime_type(), '%s 400w' % self.url(self.display_webp))])
+
+    def test_srcset_of_a_family_name(self):
+        helpers.create_test_size('hero_large', 800, 600, family='hero')
+        hero_small = helpers.create_test_size('hero_small', 200, 150, family='hero')
+
+        src, srcset, sources = self.photo.get_srcset('hero')
+
+        self.assertEqual(src, self.url(hero_small))
+        self.assertTrue(srcset.startswith('%s 200w, ' % src))
+        self.assertEqual(sources, [])
+
+    def test_size_without_family(self):
+        thumbnail = helpers.create_test_size('thumbnail', 100, 75)
+
+        self.assertEqual(self.photo.get_srcset('thumbnail'), (self.url(thumbnail), '%s 100w' % self.url(thumbnail), []))
+
+    def test_unknown_size(self):
+        self.assertRaises(ValueError, self.photo.get_srcset, 'poster')
+
+    def test_srcset_tag(self):
+        html = Template("{% load photologue_tags %}{% srcset photo 'display' %}").render(
+            Context({'photo': self.photo}))
+
+        self.assertEqual(html, self.photo.get_srcset('display')[1])
+
+    def test_picture_tag(self):
+        html = Template("{% load photologue_tags %}{% picture photo 'display' sizes='50vw' %}").render(
+            Context({'photo': self.photo}))
+
+        self.assertIn('<source type="%s" srcset="%s 400w" sizes="50vw"/>'
+                      % (self.display_webp.get_mime_type(), self.url(self.display_webp)), html)
+        self.assertIn('<img src="%s" srcset="%s 400w, %s 800w" sizes="50vw" alt="Beach"/>'
+                      % (self.url(self.display), self.url(self.display), self.url(self.display_2x)), html)
+
+    def test_tags_of_unknown_sizes(self):
+        context = Context({'photo': self.photo})
+
+        self.assertEqual(Template("{% load photologue_tags %}{% srcset photo 'poster' %}").render(context), '')
+        html = Template("{% load photologue_tags %}{% picture photo 'poster' %}").render(context)
+        self.assertIn('<img src="%s" alt="Beach"/>' % self.photo.image.url, html)
+        self.assertNotIn('<source', html)
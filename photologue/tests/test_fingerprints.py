@@ -0,0 +1,100 @@
+import hashlib
+import os
+
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from photologue.models import (Photo, PhotoEffect, RENDITION_FINGERPRINT_LENGTH, SWEEP_REVISION,
+                               get_revision)
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class FingerprintTest(PhotologueTestCase):
+    def setUp(self):
+        super(FingerprintTest, self).setUp()
+        self.data = helpers.make_jpeg()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery, self.data)
+
+    def name(self, photo=None):
+        return (photo or self.photo)._get_rendition_name(self.thumbnail)
+
+    def test_digest_of_the_upload(self):
+        self.assertEqual(self.photo.image_digest, hashlib.sha1(self.data).hexdigest())
+
+    def test_rendition_name(self):
+        fingerprint = self.name().rsplit('.', 2)[1]
+
+        self.assertEqual(len(fingerprint), RENDITION_FINGERPRINT_LENGTH)
+        self.assertTrue(self.name().startswith('photologue/photos/cache/beach_thumbnail.'))
+
+    def test_same_inputs_same_name(self):
+        self.assertEqual(self.name(Photo.objects.get(pk=self.photo.pk)), self.name())
+
+    def test_new_image_new_name(self):
+        name = self.name()
+
+        self.photo.image = helpers.upload(helpers.make_jpeg(300, 200))
+        self.photo.save()
+
+        self.assertNotEqual(self.name(), name)
+
+    def test_crop_anchor_changes_name(self):
+        name = self.name()
+
+        self.photo.crop_from = 'top'
+
+        self.assertNotEqual(self.name(), name)
+
+    def test_size_settings_change_name(self):
+        name = self.name()
+
+        self.thumbnail.quality = 90
+
+        self.assertNotEqual(self.name(), name)
+
+    def test_effect_settings_change_name(self):
+        effect = PhotoEffect.objects.create(name='faded', color=0.5)
+        self.photo.effect = effect
+        name = self.name()
+
+        effect.description = 'Washed out colors'
+        self.assertEqual(self.name(), name)
+        effect.color = 0.4
+        self.assertNotEqual(self.name(), name)
+
+    def test_saving_keeps_renditions(self):
+        self.photo.create_size(self.thumbnail)
+        sweeps = get_revision(SWEEP_REVISION)
+
+        self.photo.title = 'Sunset'
+        self.photo.save()
+
+        self.assertTrue(self.photo.size_exists(self.thumbnail))
+        self.assertEqual(get_revision(SWEEP_REVISION), sweeps)
+
+    def test_edited_image_leaves_renditions_to_the_sweep(self):
+        self.photo.create_size(self.thumbnail)
+        name = self.name()
+        sweeps = get_revision(SWEEP_REVISION)
+
+        self.photo.crop_from = 'top'
+        self.photo.save()
+
+        self.assertTrue(os.path.isfile(os.path.join(self.media_root, name)))
+        self.assertEqual(get_revision(SWEEP_REVISION), sweeps + 1)
+
+    def test_record_missing_digests(self):
+        Photo.objects.update(image_digest='')
+        out = StringIO()
+
+        call_command('pldigest', stdout=out)
+
+        self.assertIn('Recorded the digest of 1 images', out.getvalue())
+        self.assertEqual(Photo.objects.get().image_digest, hashlib.sha1(self.data).hexdigest())
+
+        call_command('pldigest', stdout=out)
+        self.assertIn('Recorded the digest of 0 images', out.getvalue())
+        call_command('pldigest', all=True, stdout=out)
+        self.assertIn('Recorded the digest of 1 images', out.getvalue())
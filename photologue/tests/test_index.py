@@ -0,0 +1,110 @@
+import os
+
+import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils.six import StringIO
+
+from photologue import index
+from photologue.index import CachedRenditionIndex, RenditionIndex
+from photologue.stores import get_rendition_store
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class RenditionIndexTest(PhotologueTestCase):
+    def test_add_and_discard(self):
+        names = RenditionIndex()
+
+        names.add('cache/beach_thumbnail.jpg')
+
+        self.assertIn('cache/beach_thumbnail.jpg', names)
+        self.assertEqual(names.contains_many(['cache/beach_thumbnail.jpg', 'cache/beach_display.jpg']),
+                         set(['cache/beach_thumbnail.jpg']))
+        names.discard('cache/beach_thumbnail.jpg')
+        self.assertNotIn('cache/beach_thumbnail.jpg', names)
+
+    def test_index_starts_over_when_full(self):
+        names = RenditionIndex(size=2)
+
+        for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+            names.add(name)
+
+        self.assertEqual(names.contains_many(['a.jpg', 'b.jpg', 'c.jpg']), set(['c.jpg']))
+
+    def test_cached_index_is_shared(self):
+        self.addCleanup(caches['default'].clear)
+        names = CachedRenditionIndex('default')
+
+        names.add('cache/beach_thumbnail.jpg')
+
+        self.assertIn('cache/beach_thumbnail.jpg', CachedRenditionIndex('default'))
+        self.assertEqual(CachedRenditionIndex('default').contains_many(
+            ['cache/beach_thumbnail.jpg', 'cache/beach_display.jpg']), set(['cache/beach_thumbnail.jpg']))
+        names.discard('cache/beach_thumbnail.jpg')
+        self.assertNotIn('cache/beach_thumbnail.jpg', CachedRenditionIndex('default'))
+
+
+class IndexedPhotoTest(PhotologueTestCase):
+    def setUp(self):
+        super(IndexedPhotoTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery)
+
+    def test_warm_urls_skip_the_filesystem(self):
+        self.photo.get_thumbnail_url()
+
+        with mock.patch('os.path.isfile') as isfile, mock.patch('os.stat') as stat:
+            self.photo.get_thumbnail_url()
+
+        self.assertFalse(isfile.called)
+        self.assertFalse(stat.called)
+
+    def test_removed_sizes_leave_the_index(self):
+        self.photo.get_thumbnail_url()
+
+        self.photo.remove_size(self.thumbnail)
+
+        self.assertFalse(self.photo.size_exists(self.thumbnail))
+
+
+class CheckIndexCommandTest(PhotologueTestCase):
+    def setUp(self):
+        super(CheckIndexCommandTest, self).setUp()
+        self.addCleanup(caches['default'].clear)
+        index._index = CachedRenditionIndex('default')
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.display = helpers.create_test_size('display', 400, 300)
+        self.photo = helpers.create_test_photo(self.gallery)
+        self.photo.create_sizes([self.thumbnail, self.display])
+
+    def check(self, *sizes, **options):
+        out = StringIO()
+        call_command('plcheckindex', *sizes, stdout=out, **options)
+        return out.getvalue()
+
+    def test_index_in_step(self):
+        self.assertIn('Checked 2 renditions: 0 stale index entries, 0 stored renditions not indexed',
+                      self.check())
+
+    def test_stale_and_missing_entries(self):
+        store = get_rendition_store()
+        os.remove(store.path(self.photo._get_rendition_name(self.thumbnail)))
+        index._index.discard(self.photo._get_rendition_name(self.display))
+
+        self.assertIn('1 stale index entries, 1 stored renditions not indexed', self.check())
+        self.assertIn('(fixed)', self.check(fix=True))
+        self.assertIn('0 stale index entries, 0 stored renditions not indexed', self.check())
+        self.assertFalse(self.photo.size_exists(self.thumbnail))
+        self.assertIn(self.photo._get_rendition_name(self.display), index._index)
+
+    def test_given_sizes(self):
+        self.assertIn('Checked 1 renditions', self.check('display'))
+        self.assertRaises(CommandError, self.check, 'poster')
+
+    def test_index_must_be_shared(self):
+        index._index = RenditionIndex()
+
+        self.assertRaises(CommandError, self.check)
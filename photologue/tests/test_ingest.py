@@ -0,0 +1,129 @@
+import datetime
+import hashlib
+import os
+import zipfile
+
+import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.utils import timezone
+
+from photologue.ingest import ZipIngest
+from photologue.models import GalleryUpload, Image, Photo, PhotoMetadata, RenditionJob
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class ZipIngestTest(PhotologueTestCase):
+    def setUp(self):
+        super(ZipIngestTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail', pre_cache=True)
+        self.archive = os.path.join(self.media_root, 'photos.zip')
+        self.make_archive({
+            'b-beach.jpg': helpers.make_jpeg(),
+            'a-camera.jpg': helpers.make_exif_jpeg(date_taken='2015:06:01 10:11:12'),
+            'c-broken.jpg': 'not an image',
+            'd-empty.jpg': '',
+            '__MACOSX/._a-camera.jpg': 'resource fork',
+            'album/': '',
+        })
+
+    def make_archive(self, members):
+        archive = zipfile.ZipFile(self.archive, 'w')
+        for name, data in members.items():
+            archive.writestr(name, data)
+        archive.close()
+
+    def ingest(self, **kwargs):
+        return ZipIngest(self.archive, self.gallery, 'Trip', **kwargs).run()
+
+    def test_images_are_imported(self):
+        report = self.ingest()
+
+        self.assertEqual([filename for filename, photo in report.succeeded], ['a-camera.jpg', 'b-beach.jpg'])
+        self.assertEqual(str(report), '2 photos imported, 2 files skipped')
+        photos = Photo.objects.filter(gallery=self.gallery).order_by('title_slug')
+        self.assertEqual([photo.title for photo in photos], ['Trip 1', 'Trip 2'])
+        for photo in photos:
+            self.assertTrue(photo.image_digest)
+            self.assertTrue(os.path.isfile(photo.image.path))
+
+    def test_bad_files_are_reported(self):
+        report = self.ingest()
+
+        failed = dict(report.failed)
+        self.assertEqual(sorted(failed), ['c-broken.jpg', 'd-empty.jpg'])
+        self.assertEqual(failed['d-empty.jpg'], 'empty file')
+
+    def test_taken_slugs_are_skipped(self):
+        helpers.create_test_photo(self.gallery, title='Trip 1', title_slug='trip-1')
+
+        self.ingest()
+
+        self.assertEqual(sorted(Photo.objects.values_list('title_slug', flat=True)),
+                         ['trip-1', 'trip-2', 'trip-3'])
+
+    def test_exif_metadata_is_stored(self):
+        report = self.ingest()
+
+        photo = dict(report.succeeded)['a-camera.jpg']
+        self.assertEqual(timezone.localtime(photo.date_taken).replace(tzinfo=None),
+                         datetime.datetime(2015, 6, 1, 10, 11, 12))
+        self.assertEqual(PhotoMetadata.objects.get(photo=photo).camera_make, 'Canon')
+        self.assertEqual(PhotoMetadata.objects.count(), 2)
+
+    def test_pre_cached_sizes_are_rendered(self):
+        report = self.ingest()
+
+        for filename, photo in report.succeeded:
+            self.assertTrue(photo.size_exists(self.thumbnail))
+
+    def test_pre_cached_sizes_are_queued(self):
+        with mock.patch('photologue.ingest.QUEUE_RENDITIONS', True):
+            report = self.ingest()
+
+        self.assertEqual(RenditionJob.objects.count(), 2)
+        for filename, photo in report.succeeded:
+            self.assertFalse(photo.size_exists(self.thumbnail))
+
+    def test_no_pool_inside_a_transaction(self):
+        with mock.patch('photologue.ingest.get_pool') as get_pool:
+            with transaction.atomic():
+                report = self.ingest(workers=2)
+
+        self.assertFalse(get_pool.called)
+        self.assertEqual(len(report.succeeded), 2)
+        for filename, photo in report.succeeded:
+            self.assertTrue(photo.size_exists(self.thumbnail))
+
+    def test_images_are_normalized(self):
+        self.make_archive({
+            'rotated.jpg': helpers.make_exif_jpeg(64, 48, orientation=6),
+            'upright.jpg': helpers.make_jpeg(64, 48),
+        })
+
+        with mock.patch('photologue.ingest.NORMALIZE_ORIGINALS', True):
+            report = self.ingest()
+
+        photos = dict(report.succeeded)
+        rotated = Image.open(photos['rotated.jpg'].image.path)
+        self.assertEqual(rotated.size, (48, 64))
+        self.assertNotIn('exif', rotated.info)
+        self.assertEqual(PhotoMetadata.objects.get(photo=photos['rotated.jpg']).orientation, 1)
+        self.assertEqual(PhotoMetadata.objects.get(photo=photos['rotated.jpg']).camera_make, 'Canon')
+        self.assertEqual(photos['rotated.jpg'].date_taken.year, 2015)
+        self.assertEqual(Image.open(photos['upright.jpg'].image.path).size, (64, 48))
+        for photo in photos.values():
+            with open(photo.image.path, 'rb') as f:
+                self.assertEqual(photo.image_digest, hashlib.sha1(f.read()).hexdigest())
+
+    def test_gallery_upload(self):
+        with open(self.archive, 'rb') as f:
+            upload = GalleryUpload(zip_file=SimpleUploadedFile('photos.zip', f.read()),
+                                   gallery=self.gallery, title='Trip')
+        upload.save()
+
+        self.assertEqual(len(upload.report.succeeded), 2)
+        self.assertEqual(self.gallery.photos.count(), 2)
+        self.assertFalse(GalleryUpload.objects.exists())
@@ -0,0 +1,31 @@
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from photologue import index, stores
+from photologue.counters import view_counter
+from photologue.models import PhotoSizeCache
+from photologue.tests import helpers
+
+
+class PhotologueTestCase(TestCase):
+    def setUp(self):
+        # Images are written to a media root of their own, and the
+        # registries kept by the process start out empty
+        self.media_root = tempfile.mkdtemp()
+        self.media_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.media_override.enable()
+        self.reset_registries()
+        self.gallery = helpers.create_test_gallery()
+
+    def tearDown(self):
+        self.media_override.disable()
+        shutil.rmtree(self.media_root)
+        self.reset_registries()
+
+    def reset_registries(self):
+        index._index = None
+        stores._store = None
+        view_counter.flush()
+        PhotoSizeCache().reset()
@@ -0,0 +1,58 @@
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from photologue.forms import GalleryPhotoForm
+from photologue.models import Photo, PhotoMetadata, read_exif
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class PhotoMetadataTest(PhotologueTestCase):
+    def test_upload_stores_exif_metadata(self):
+        photo = helpers.create_test_photo(self.gallery, helpers.make_exif_jpeg(orientation=6))
+
+        metadata = PhotoMetadata.objects.get(photo=photo)
+        self.assertEqual(metadata.camera_make, 'Canon')
+        self.assertEqual(metadata.orientation, 6)
+        self.assertEqual(metadata.date_taken.year, 2015)
+        self.assertEqual(photo.date_taken.year, 2015)
+
+    def test_form_upload_stores_exif_metadata(self):
+        form = GalleryPhotoForm({'title': 'Glacier', 'crop_from': 'center', 'is_public': True},
+                                {'image': helpers.upload(helpers.make_exif_jpeg())})
+        self.assertTrue(form.is_valid(), form.errors)
+        photo = form.save(commit=False)
+        photo.gallery = self.gallery
+        photo.save()
+
+        metadata = PhotoMetadata.objects.get(photo=photo)
+        self.assertEqual(metadata.camera_make, 'Canon')
+        self.assertEqual(metadata.date_taken.year, 2015)
+
+    def test_upload_without_exif_is_dated_now(self):
+        photo = helpers.create_test_photo(self.gallery)
+
+        self.assertIsNotNone(photo.date_taken)
+        self.assertEqual(PhotoMetadata.objects.get(photo=photo).camera_make, '')
+
+    def test_read_exif_stops_at_date_taken(self):
+        photo = helpers.create_test_photo(self.gallery, helpers.make_exif_jpeg())
+
+        tags = read_exif(photo.image.path)
+        self.assertEqual(str(tags['EXIF DateTimeOriginal']), '2015:06:01 10:11:12')
+        self.assertEqual(str(tags['Image Make']), 'Canon')
+        with open(photo.image.path, 'rb') as f:
+            self.assertEqual(set(read_exif(f)), set(tags))
+
+    def test_read_exif_of_unreadable_file(self):
+        self.assertEqual(read_exif('/nonexistent/beach.jpg'), {})
+
+    def test_extract_missing_metadata_command(self):
+        photo = helpers.create_test_photo(self.gallery, helpers.make_exif_jpeg())
+        PhotoMetadata.objects.all().delete()
+        out = StringIO()
+
+        call_command('plexif', missing=True, stdout=out)
+
+        self.assertIn('Read metadata of 1 photos', out.getvalue())
+        self.assertEqual(Photo.objects.get(pk=photo.pk).metadata.camera_make, 'Canon')
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+
+import mock
+
+from django.core.files.storage import FileSystemStorage
+
+from photologue.models import Image, PhotoMetadata
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+from photologue.utils.normalize import auto_orient, normalize
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+
+def decode(data):
+    return Image.open(StringIO(data))
+
+
+class NormalizeTest(PhotologueTestCase):
+    def test_rotated_photo_is_turned_upright(self):
+        data, format = normalize(StringIO(helpers.make_exif_jpeg(64, 48, orientation=6)))
+
+        im = decode(data)
+        self.assertEqual(format, 'JPEG')
+        self.assertEqual(im.size, (48, 64))
+        self.assertNotIn('exif', im.info)
+
+    def test_large_photo_is_scaled_down(self):
+        data, format = normalize(StringIO(helpers.make_jpeg(800, 600)), max_dimension=400)
+
+        self.assertEqual(decode(data).size, (400, 300))
+
+    def test_exif_is_stripped(self):
+        data, format = normalize(StringIO(helpers.make_exif_jpeg(64, 48)))
+
+        self.assertEqual(decode(data).size, (64, 48))
+        self.assertNotIn('exif', decode(data).info)
+
+    def test_normal_photos_are_left_alone(self):
+        self.assertIsNone(normalize(StringIO(helpers.make_jpeg(800, 600)), max_dimension=1000))
+        self.assertIsNone(normalize(StringIO(helpers.make_exif_jpeg(64, 48)), strip_exif=False))
+
+    def test_png_stays_png(self):
+        data, format = normalize(StringIO(helpers.make_image(800, 600, 'PNG')), max_dimension=400)
+
+        self.assertEqual(format, 'PNG')
+        self.assertEqual(decode(data).format, 'PNG')
+
+    def test_auto_orient(self):
+        im = Image.new('RGB', (4, 2))
+        im.putpixel((0, 0), (255, 0, 0))
+
+        self.assertEqual(auto_orient(im, 1).getpixel((0, 0)), (255, 0, 0))
+        self.assertEqual(auto_orient(im, 2).getpixel((3, 0)), (255, 0, 0))
+        self.assertEqual(auto_orient(im, 3).getpixel((3, 1)), (255, 0, 0))
+        self.assertEqual(auto_orient(im, 6).size, (2, 4))
+        self.assertEqual(auto_orient(im, 6).getpixel((1, 0)), (255, 0, 0))
+        self.assertEqual(auto_orient(im, 8).getpixel((0, 3)), (255, 0, 0))
+
+
+class NormalizedUploadTest(PhotologueTestCase):
+    def setUp(self):
+        super(NormalizedUploadTest, self).setUp()
+        normalize_originals = mock.patch('photologue.models.NORMALIZE_ORIGINALS', True)
+        normalize_originals.start()
+        self.addCleanup(normalize_originals.stop)
+
+    def archive_originals(self):
+        archive_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_root)
+        patchers = [
+            mock.patch('photologue.models.ORIGINAL_ARCHIVE_STORAGE',
+                       'django.core.files.storage.FileSystemStorage'),
+            mock.patch('photologue.models._original_archive_storage',
+                       FileSystemStorage(location=archive_root)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return archive_root
+
+    def test_upload_is_normalized(self):
+        photo = helpers.create_test_photo(self.gallery, helpers.make_exif_jpeg(64, 48, orientation=6))
+
+        im = Image.open(photo.image.path)
+        self.assertEqual(im.size, (48, 64))
+        self.assertNotIn('exif', im.info)
+        self.assertEqual(photo.date_taken.year, 2015)
+        self.assertEqual(PhotoMetadata.objects.get(photo=photo).camera_make, 'Canon')
+        self.assertEqual(PhotoMetadata.objects.get(photo=photo).orientation, 1)
+        self.assertEqual(photo.original_archive, '')
+
+    def test_upload_is_archived(self):
+        archive_root = self.archive_originals()
+        data = helpers.make_exif_jpeg(64, 48, orientation=6)
+
+        photo = helpers.create_test_photo(self.gallery, data)
+        duplicate = helpers.create_test_photo(self.gallery, data)
+
+        self.assertTrue(photo.original_archive)
+        self.assertEqual(duplicate.original_archive, photo.original_archive)
+        archived = os.path.join(archive_root, photo.original_archive)
+        with open(archived, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+        photo.delete()
+        self.assertTrue(os.path.isfile(archived))
+        duplicate.delete()
+        self.assertFalse(os.path.isfile(archived))
+
+    def test_normal_upload_is_not_archived(self):
+        self.archive_originals()
+
+        photo = helpers.create_test_photo(self.gallery, helpers.make_jpeg(64, 48))
+
+        self.assertEqual(photo.original_archive, '')
@@ -0,0 +1,133 @@
+import mock
+
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from photologue.models import RENDITION_MAX_ATTEMPTS, Photo, RenditionJob
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+from photologue.workers import run_rendition_job
+
+
+class RenditionQueueTest(PhotologueTestCase):
+    def setUp(self):
+        super(RenditionQueueTest, self).setUp()
+        queue_renditions = mock.patch('photologue.models.QUEUE_RENDITIONS', True)
+        queue_renditions.start()
+        self.addCleanup(queue_renditions.stop)
+        get_pool = mock.patch('photologue.management.commands.plworker.get_pool', helpers.InlinePool)
+        get_pool.start()
+        self.addCleanup(get_pool.stop)
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery)
+
+    def fail_rendering(self):
+        create_size = mock.patch.object(Photo, 'create_size', side_effect=IOError('truncated'))
+        create_size.start()
+        self.addCleanup(create_size.stop)
+
+    def run_queue(self):
+        for pk in RenditionJob.objects.claim(10):
+            run_rendition_job(pk)
+
+    def test_missing_size_is_queued_once(self):
+        url = self.photo.get_thumbnail_url()
+        self.photo.get_thumbnail_url()
+
+        self.assertEqual(url, self.photo.image.url)
+        self.assertFalse(self.photo.size_exists(self.thumbnail))
+        job = RenditionJob.objects.get()
+        self.assertEqual(job.photosize, self.thumbnail)
+        self.assertEqual(job.status, RenditionJob.PENDING)
+
+    def test_placeholder_is_handed_out_until_rendered(self):
+        with mock.patch('photologue.models.RENDITION_PLACEHOLDER_URL', '/static/rendering.png'):
+            self.assertEqual(self.photo.get_thumbnail_url(), '/static/rendering.png')
+
+    def test_worker_renders_queued_sizes(self):
+        self.photo.get_thumbnail_url()
+        out = StringIO()
+
+        call_command('plworker', once=True, stdout=out)
+
+        self.assertIn('Rendered 1 of 1 queued sizes', out.getvalue())
+        self.assertFalse(RenditionJob.objects.exists())
+        self.assertTrue(self.photo.size_exists(self.thumbnail))
+        self.assertNotEqual(self.photo.get_thumbnail_url(), self.photo.image.url)
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        self.photo.get_thumbnail_url()
+
+        self.assertEqual(len(RenditionJob.objects.claim(10)), 1)
+        self.assertEqual(RenditionJob.objects.claim(10), [])
+        self.assertEqual(RenditionJob.objects.get().attempts, 1)
+
+    def test_job_fails_after_max_attempts(self):
+        self.fail_rendering()
+        self.photo.get_thumbnail_url()
+
+        for attempt in range(1, RENDITION_MAX_ATTEMPTS):
+            self.run_queue()
+            job = RenditionJob.objects.get()
+            self.assertEqual(job.status, RenditionJob.PENDING)
+            self.assertEqual(job.attempts, attempt)
+        self.run_queue()
+
+        job = RenditionJob.objects.get()
+        self.assertEqual(job.status, RenditionJob.FAILED)
+        self.assertIn('truncated', job.error)
+
+    def test_requests_do_not_retry_failed_jobs(self):
+        self.fail_rendering()
+        self.photo.get_thumbnail_url()
+        for attempt in range(RENDITION_MAX_ATTEMPTS):
+            self.run_queue()
+
+        self.photo.get_thumbnail_url()
+
+        self.assertEqual(RenditionJob.objects.get().status, RenditionJob.FAILED)
+        self.assertEqual(RenditionJob.objects.claim(10), [])
+
+    def test_retry_failed(self):
+        self.photo.get_thumbnail_url()
+        RenditionJob.objects.update(status=RenditionJob.FAILED, attempts=RENDITION_MAX_ATTEMPTS)
+        out = StringIO()
+
+        call_command('plworker', once=True, retry_failed=True, stdout=out)
+
+        self.assertIn('Queued 1 failed jobs again', out.getvalue())
+        self.assertFalse(RenditionJob.objects.exists())
+        self.assertTrue(self.photo.size_exists(self.thumbnail))
+
+    def test_stale_jobs_are_requeued(self):
+        self.photo.get_thumbnail_url()
+        RenditionJob.objects.claim(10)
+
+        self.assertEqual(RenditionJob.objects.requeue_stale(600), 0)
+        self.assertEqual(RenditionJob.objects.requeue_stale(-1), 1)
+        self.assertEqual(RenditionJob.objects.get().status, RenditionJob.PENDING)
+
+    def test_stale_jobs_fail_after_max_attempts(self):
+        self.photo.get_thumbnail_url()
+
+        for attempt in range(1, RENDITION_MAX_ATTEMPTS):
+            self.assertEqual(len(RenditionJob.objects.claim(10)), 1)
+            RenditionJob.objects.requeue_stale(-1)
+            job = RenditionJob.objects.get()
+            self.assertEqual(job.status, RenditionJob.PENDING)
+            self.assertEqual(job.attempts, attempt)
+        RenditionJob.objects.claim(10)
+        RenditionJob.objects.requeue_stale(-1)
+
+        job = RenditionJob.objects.get()
+        self.assertEqual(job.status, RenditionJob.FAILED)
+        self.assertIn('lost', job.error)
+        self.assertEqual(RenditionJob.objects.claim(10), [])
+
+    def test_jobs_of_deleted_photos_are_dropped(self):
+        self.photo.get_thumbnail_url()
+        Photo.objects.filter(pk=self.photo.pk).delete()
+
+        self.run_queue()
+
+        self.assertFalse(RenditionJob.objects.exists())
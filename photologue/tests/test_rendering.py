@@ -0,0 +1,76 @@
+import mock
+
+from PIL import Image, JpegImagePlugin
+
+from photologue.models import Photo
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class CreateSizesTest(PhotologueTestCase):
+    def setUp(self):
+        super(CreateSizesTest, self).setUp()
+        self.large = helpers.create_test_size('large', 800, 600)
+        self.display = helpers.create_test_size('display', 400, 300)
+        self.thumbnail = helpers.create_test_size('thumbnail', 100, 100, crop=True)
+        self.narrow = helpers.create_test_size('narrow', 200, 0)
+        self.photo = helpers.create_test_photo(self.gallery, helpers.make_jpeg(2000, 1500))
+
+    def test_sizes_are_rendered_from_one_decode(self):
+        with mock.patch.object(Image, 'open', wraps=Image.open) as image_open:
+            written = self.photo.create_sizes([self.thumbnail, self.display, self.large, self.narrow])
+
+        self.assertEqual(image_open.call_count, 1)
+        self.assertGreater(written, 0)
+        self.assertEqual(self.photo.get_large_size(), (800, 600))
+        self.assertEqual(self.photo.get_display_size(), (400, 300))
+        self.assertEqual(self.photo.get_thumbnail_size(), (100, 100))
+        self.assertEqual(self.photo.get_narrow_size(), (200, 150))
+
+    def test_existing_sizes_are_not_rendered_again(self):
+        self.photo.create_sizes([self.display])
+
+        with mock.patch.object(Image, 'open', wraps=Image.open) as image_open:
+            self.assertEqual(self.photo.create_sizes([self.display]), 0)
+
+        self.assertFalse(image_open.called)
+
+    def test_smaller_sizes_are_derived_from_larger_ones(self):
+        sources = []
+        resize_image = Photo.resize_image
+
+        def record_source(photo, im, photosize):
+            sources.append((photosize.name, im.size))
+            return resize_image(photo, im, photosize)
+
+        with mock.patch.object(Photo, 'resize_image', autospec=True, side_effect=record_source):
+            self.photo.create_sizes([self.thumbnail, self.display, self.large])
+
+        sources = dict(sources)
+        # JPEG is drafted at scales of 1/2, 1/4 and 1/8 only, too small here
+        self.assertEqual(sources['large'], (2000, 1500))
+        self.assertEqual(sources['display'], (800, 600))
+        self.assertEqual(sources['thumbnail'], (400, 300))
+
+    def test_jpeg_is_drafted_at_reduced_scale(self):
+        with mock.patch.object(JpegImagePlugin.JpegImageFile, 'draft', autospec=True,
+                               wraps=JpegImagePlugin.JpegImageFile.draft) as draft:
+            self.photo.create_sizes([self.display])
+
+        self.assertEqual(draft.call_args[0][2], (800, 600))
+        self.assertEqual(self.photo.get_display_size(), (400, 300))
+
+    def test_decode_size(self):
+        decode_size = self.photo._decode_size
+
+        self.assertEqual(decode_size((2000, 1500), [self.display, self.thumbnail]), (800, 600))
+        self.assertEqual(decode_size((2000, 1500), [self.narrow]), (400, 300))
+        self.assertEqual(decode_size((2000, 1500), [self.large, self.display]), (1600, 1200))
+        # Sizes needing more than half the original decode it whole
+        self.assertIsNone(decode_size((800, 600), [self.display]))
+
+    def test_unreadable_image_renders_nothing(self):
+        photo = helpers.create_test_photo(self.gallery, 'not an image', name='broken.jpg')
+
+        self.assertEqual(photo.create_sizes([self.display]), 0)
+        self.assertFalse(photo.size_exists(self.display))
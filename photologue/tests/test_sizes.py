@@ -0,0 +1,41 @@
+from django.db.models import F
+
+from photologue.models import PhotoSize, PhotoSizeCache, Revision, SIZE_REVISION, bump_revision, get_revision
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class PhotoSizeCacheTest(PhotologueTestCase):
+    def setUp(self):
+        super(PhotoSizeCacheTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+
+    def test_sizes_are_loaded_once(self):
+        self.assertIn('thumbnail', PhotoSizeCache().sizes)
+
+        with self.assertNumQueries(0):
+            PhotoSizeCache().sizes['thumbnail']
+
+    def test_saving_a_size_bumps_the_revision(self):
+        revision = get_revision(SIZE_REVISION)
+
+        helpers.create_test_size('display', 400, 300)
+
+        self.assertEqual(get_revision(SIZE_REVISION), revision + 1)
+        self.assertIn('display', PhotoSizeCache().sizes)
+
+    def test_sizes_changed_by_another_process_are_reloaded(self):
+        PhotoSizeCache().sizes
+        # Another process adds a size and bumps the revision
+        PhotoSize.objects.bulk_create([PhotoSize(name='display', width=400, height=300)])
+        Revision.objects.filter(name=SIZE_REVISION).update(number=F('number') + 1)
+        self.assertNotIn('display', PhotoSizeCache().sizes)
+
+        PhotoSizeCache().checked = 0
+
+        self.assertIn('display', PhotoSizeCache().sizes)
+
+    def test_bump_revision_creates_it(self):
+        self.assertEqual(get_revision('elsewhere'), 0)
+        self.assertEqual(bump_revision('elsewhere'), 1)
+        self.assertEqual(bump_revision('elsewhere'), 2)
@@ -0,0 +1,126 @@
+import os
+
+from django.core.files.storage import FileSystemStorage, Storage
+from django.test import override_settings
+
+from PIL import Image
+
+from photologue import stores
+from photologue.index import RenditionIndex
+from photologue.stores import (LocalRenditionStore, RenditionStore, ShardedRenditionStore,
+                               get_rendition_store)
+from photologue.tests.test_main import PhotologueTestCase
+
+NAME = 'photologue/photos/cache/beach_thumbnail.jpg'
+
+
+class RenditionStoreTest(PhotologueTestCase):
+    store_class = RenditionStore
+
+    def setUp(self):
+        super(RenditionStoreTest, self).setUp()
+        self.storage = FileSystemStorage(location=self.media_root, base_url='/media/')
+        self.index = RenditionIndex()
+        self.store = self.store_class(self.storage, self.index)
+        self.im = Image.new('RGB', (40, 30), 'blue')
+
+    def test_save(self):
+        written = self.store.save(NAME, self.im, 'JPEG')
+
+        self.assertEqual(written, os.path.getsize(self.store.path(NAME)))
+        self.assertIn(NAME, self.index)
+        self.assertTrue(self.store.exists(NAME))
+        f = self.store.open(NAME)
+        try:
+            self.assertEqual(Image.open(f).size, (40, 30))
+        finally:
+            f.close()
+
+    def test_write(self):
+        self.assertEqual(self.store.write(NAME, 'jpeg bytes'), 10)
+
+        self.assertIn(NAME, self.index)
+        with open(self.store.path(NAME), 'rb') as f:
+            self.assertEqual(f.read(), 'jpeg bytes')
+
+    def test_renditions_found_in_the_storage_are_indexed(self):
+        self.store.save(NAME, self.im, 'JPEG')
+        self.index.discard(NAME)
+
+        self.assertTrue(self.store.exists(NAME))
+        self.assertIn(NAME, self.index)
+
+    def test_indexed_renditions_skip_the_storage(self):
+        self.index.add(NAME)
+
+        self.assertTrue(self.store.exists(NAME))
+        self.assertFalse(self.store.stored(NAME))
+
+    def test_listdir(self):
+        other = 'photologue/photos/cache/beach_display.jpg'
+        self.store.save(NAME, self.im, 'JPEG')
+        self.store.save(other, self.im, 'JPEG')
+
+        self.assertEqual(sorted(self.store.listdir('photologue/photos/cache')), sorted([NAME, other]))
+        self.assertEqual(self.store.listdir('photologue/photos/missing'), [])
+
+    def test_delete(self):
+        self.store.save(NAME, self.im, 'JPEG')
+
+        self.store.delete(NAME)
+
+        self.assertFalse(self.store.exists(NAME))
+        self.assertNotIn(NAME, self.index)
+
+
+class LocalRenditionStoreTest(RenditionStoreTest):
+    store_class = LocalRenditionStore
+
+    def test_delete_prunes_empty_directories(self):
+        self.store.save(NAME, self.im, 'JPEG')
+
+        self.store.delete(NAME)
+
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'photologue')))
+        self.assertTrue(os.path.isdir(self.media_root))
+
+    def test_delete_without_pruning(self):
+        self.store.save(NAME, self.im, 'JPEG')
+
+        self.store.delete(NAME, prune=False)
+
+        self.assertFalse(self.store.exists(NAME))
+        self.assertTrue(os.path.isdir(os.path.join(self.media_root, 'photologue/photos/cache')))
+
+
+class ShardedRenditionStoreTest(LocalRenditionStoreTest):
+    store_class = ShardedRenditionStore
+
+    def test_location(self):
+        location = self.store.location(NAME)
+
+        directory, shard, subshard, filename = location.rsplit('/', 3)
+        self.assertEqual(directory, 'photologue/photos/cache')
+        self.assertEqual(len(shard), 2)
+        self.assertEqual(len(subshard), 2)
+        self.assertEqual(filename, 'beach_thumbnail.jpg')
+        self.assertEqual(self.store.location(NAME), location)
+
+    def test_url(self):
+        self.assertEqual(self.store.url(NAME), '/media/' + self.store.location(NAME))
+
+
+class GetRenditionStoreTest(PhotologueTestCase):
+    def test_default_store(self):
+        store = get_rendition_store()
+
+        self.assertIsInstance(store, LocalRenditionStore)
+        self.assertIs(get_rendition_store(), store)
+
+    def test_configured_store(self):
+        with override_settings(PHOTOLOGUE_RENDITION_STORE='photologue.stores.ShardedRenditionStore'):
+            stores._store = None
+            self.assertIsInstance(get_rendition_store(), ShardedRenditionStore)
+
+    def test_local_store_needs_a_filesystem(self):
+        self.assertRaises(ValueError, LocalRenditionStore, Storage())
@@ -0,0 +1,80 @@
+import os
+
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from photologue.models import claim_sweep
+from photologue.stores import get_rendition_store
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+from photologue.workers import sweep_renditions
+
+
+class SweepTest(PhotologueTestCase):
+    def setUp(self):
+        super(SweepTest, self).setUp()
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery)
+        self.photo.get_thumbnail_url()
+        self.old_rendition = get_rendition_store().path(self.photo._get_rendition_name(self.thumbnail))
+        claim_sweep()
+
+    def edit_size(self):
+        self.thumbnail.width = 120
+        self.thumbnail.save()
+
+    def test_editing_a_size_schedules_one_sweep(self):
+        self.assertFalse(claim_sweep())
+
+        self.edit_size()
+
+        self.assertTrue(claim_sweep())
+        self.assertFalse(claim_sweep())
+
+    def test_sweep_removes_renditions_of_old_settings(self):
+        self.edit_size()
+        self.photo.get_thumbnail_url()
+
+        removed, queued = sweep_renditions()
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.isfile(self.old_rendition))
+        self.assertTrue(self.photo.size_exists(self.thumbnail))
+
+    def test_dry_run_keeps_renditions(self):
+        self.edit_size()
+        out = StringIO()
+
+        call_command('plsweep', dry_run=True, stdout=out)
+
+        self.assertIn('1 renditions would be removed', out.getvalue())
+        self.assertTrue(os.path.isfile(self.old_rendition))
+
+    def test_worker_runs_scheduled_sweep(self):
+        self.edit_size()
+        out = StringIO()
+
+        call_command('plworker', once=True, stdout=out)
+
+        self.assertIn('Removed 1 old renditions', out.getvalue())
+        self.assertFalse(os.path.isfile(self.old_rendition))
+        self.assertFalse(claim_sweep())
+
+    def test_sweep_command_takes_scheduled_sweep(self):
+        self.edit_size()
+
+        call_command('plsweep', stdout=StringIO())
+
+        self.assertFalse(os.path.isfile(self.old_rendition))
+        self.assertFalse(claim_sweep())
+
+    def test_cache_command_runs_scheduled_sweep(self):
+        self.edit_size()
+        out = StringIO()
+
+        call_command('plcache', 'thumbnail', checkpoint=os.path.join(self.media_root, 'plcache'), stdout=out)
+
+        self.assertIn('Removed 1 old renditions', out.getvalue())
+        self.assertFalse(os.path.isfile(self.old_rendition))
+        self.assertTrue(self.photo.size_exists(self.thumbnail))
+        self.assertFalse(claim_sweep())
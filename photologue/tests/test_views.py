@@ -0,0 +1,99 @@
+import mock
+
+from django.core.urlresolvers import reverse
+
+from explorers.tests import helpers as explorer_helpers
+from photologue.tests import helpers
+from photologue.tests.test_main import PhotologueTestCase
+
+
+class RenditionViewTest(PhotologueTestCase):
+    def setUp(self):
+        super(RenditionViewTest, self).setUp()
+        serve_renditions = mock.patch('photologue.models.SERVE_RENDITIONS', True)
+        serve_renditions.start()
+        self.addCleanup(serve_renditions.stop)
+        self.thumbnail = helpers.create_test_size('thumbnail')
+        self.photo = helpers.create_test_photo(self.gallery)
+        self.url = self.photo.get_thumbnail_url()
+
+    def test_rendition_is_served_for_good(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertTrue(response['ETag'])
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_validators_are_served(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE='Sat, 01 Jan 2000 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rendition_of_another_photo_is_not_found(self):
+        other = helpers.create_test_photo(self.gallery, name='glacier.jpg')
+        name = self.url.split('/', 4)[4]
+
+        response = self.client.get(reverse('pl-rendition', args=[other.pk, name]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_private_rendition_needs_gallery_explorer(self):
+        self.gallery.is_public = False
+        self.gallery.save()
+        explorer = explorer_helpers.create_test_explorer()
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.gallery.explorers.add(explorer)
+        self.client.login(username=explorer.email, password=explorer.password_unhashed)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
+
+class PhotoViewTest(PhotologueTestCase):
+    def setUp(self):
+        super(PhotoViewTest, self).setUp()
+        self.photo = helpers.create_test_photo(self.gallery)
+
+    def test_photo_without_display_size(self):
+        response = self.client.get(reverse('pl-photo', args=[self.photo.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<img src="%s"' % self.photo.image.url)
+
+    def test_photo_links_to_its_original(self):
+        response = self.client.get(reverse('pl-photo', args=[self.photo.pk]))
+
+        self.assertContains(response, '<a href="%s">' % reverse('pl-photo-original', args=[self.photo.pk]))
+
+    def test_original_is_served(self):
+        url = reverse('pl-photo-original', args=[self.photo.pk])
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['ETag'], '"%s"' % self.photo.image_digest)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_private_original_needs_gallery_explorer(self):
+        self.gallery.is_public = False
+        self.gallery.save()
+
+        response = self.client.get(reverse('pl-photo-original', args=[self.photo.pk]))
+
+        self.assertEqual(response.status_code, 403)
@@ -50,6 +50,8 @@ urlpatterns = patterns(
     url(r'^photo/page/(?P<page>[0-9]+)/$',
         PhotoListView.as_view(),
         name='pl-photo-list'),
+    url(r'^photo/(?P<pk>\d+)/original/$', 'photologue.views.photo_original', name='pl-photo-original'),
+    url(r'^rendition/(?P<pk>\d+)/(?P<name>.+)$', 'photologue.views.rendition', name='pl-rendition'),
     url(r'^photo/update_photo', 'photologue.views.update_photo', name='update_photo'),  # AJAX function for convenient updating
     url(r'^photo/ajax_upload', 'photologue.views.ajax_upload', name='ajax_upload'),
 )
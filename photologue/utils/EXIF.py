@@ -14,6 +14,10 @@
 # command line arguments, or as
 #    tags = EXIF.process_file(f, details=False)
 #
+# To read only the EXIF segment of a JPEG, without MakerNotes or
+# thumbnails, when just a few tags are needed:
+#    tags = EXIF.process_header(f, stop_tag='DateTimeOriginal')
+#
 # To stop processing after a certain tag is retrieved,
 # pass the -t TAG or --stop-tag TAG argument, or as
 #    tags = EXIF.process_file(f, stop_tag='TAG')
@@ -1698,6 +1702,67 @@ def process_file(f, stop_tag='UNDEF', details=True, strict=False, debug=False):
     return hdr.tags
 
 
+def read_exif_segment(f):
+    """Returns the EXIF data of a JPEG file, starting at its TIFF header.
+
+    Only the segment headers before the APP1 segment are read; the image
+    data itself is never touched. Returns None if there is no EXIF segment.
+    """
+    if f.read(2) != '\xFF\xD8':
+        return None
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != '\xFF':
+            return None
+        if marker[1] in ('\xD9', '\xDA'):
+            # end of image or start of scan, no EXIF segment follows
+            return None
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        length = s2n_motorola(length)
+        if marker[1] == '\xE1':
+            data = f.read(length - 2)
+            if data[0:6] == 'Exif\x00\x00':
+                return data[6:]
+        else:
+            f.seek(length - 2, 1)
+
+
+def process_header(f, stop_tag='UNDEF', strict=False):
+    """Fast path of process_file for extracting a few well-known tags.
+
+    For JPEG files only the APP1 segment is read, into memory, and parsing
+    stops at stop_tag within the EXIF IFD. MakerNotes and thumbnails are
+    skipped. Other formats fall back to process_file without details.
+    """
+    global detailed
+    detailed = False
+
+    from cStringIO import StringIO
+    data = read_exif_segment(f)
+    if data is None:
+        f.seek(0)
+        if f.read(4) in ['II*\x00', 'MM\x00*']:
+            f.seek(0)
+            return process_file(f, stop_tag=stop_tag, details=False, strict=strict)
+        return {}
+    if data[0:1] not in ('I', 'M'):
+        return {}
+    hdr = EXIF_header(StringIO(data), data[0], 0, 0, strict)
+    ifd = hdr.first_IFD()
+    if not ifd:
+        return {}
+    hdr.dump_IFD(ifd, 'Image')
+    exif_off = hdr.tags.get('Image ExifOffset')
+    if exif_off:
+        hdr.dump_IFD(exif_off.values[0], 'EXIF', stop_tag=stop_tag)
+    gps_off = hdr.tags.get('Image GPSInfo')
+    if gps_off:
+        hdr.dump_IFD(gps_off.values[0], 'GPS', dict=GPS_TAGS)
+    return hdr.tags
+
+
 # show command line usage
 def usage(exit_status):
     msg = 'Usage: EXIF.py [OPTIONS] file1 [file2 ...]\n'
@@ -0,0 +1,92 @@
+""" Functions for normalizing uploaded originals.
+
+Cameras record which way up a photo should be shown in its EXIF Orientation
+tag rather than turning the pixels, and phones upload photos far larger than
+any photo size is rendered at. A normalized original is upright, no larger
+than a given dimension and carries no EXIF data, so every rendition derived
+from it is both cheaper to make and the right way up.
+"""
+
+try:
+    import Image
+except ImportError:
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("The Python Imaging Library was not found.")
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+# EXIF tag holding the orientation of the image.
+ORIENTATION_TAG = 0x0112
+
+# Transpositions turning an image upright, by EXIF orientation.
+ORIENTATION_TRANSPOSES = {
+    2: (Image.FLIP_LEFT_RIGHT,),
+    3: (Image.ROTATE_180,),
+    4: (Image.FLIP_TOP_BOTTOM,),
+    5: (Image.ROTATE_90, Image.FLIP_TOP_BOTTOM),
+    6: (Image.ROTATE_270,),
+    7: (Image.ROTATE_90, Image.FLIP_LEFT_RIGHT),
+    8: (Image.ROTATE_90,),
+}
+
+
+def get_orientation(im):
+    """Returns the EXIF orientation of an opened image, 1 if it has none."""
+    try:
+        return int(im._getexif().get(ORIENTATION_TAG, 1))
+    except Exception:
+        return 1
+
+
+def auto_orient(im, orientation):
+    """Returns the image turned upright according to its EXIF orientation."""
+    for method in ORIENTATION_TRANSPOSES.get(orientation, ()):
+        im = im.transpose(method)
+    return im
+
+
+def normalize(f, max_dimension=None, strip_exif=True, quality=90):
+    """Normalizes the image in the file `f`.
+
+    Returns the encoded normalized image and its format, or None when the
+    image is already upright, small enough and, if `strip_exif` is set,
+    without EXIF data, so it is best left as it is. Animated images are
+    always left as they are. Raises IOError if the image cannot be decoded.
+    """
+    f.seek(0)
+    im = Image.open(f)
+    if getattr(im, 'is_animated', False):
+        return None
+    format = im.format
+    orientation = get_orientation(im)
+    too_large = bool(max_dimension) and max(im.size) > max_dimension
+    has_exif = 'exif' in im.info
+    if orientation not in ORIENTATION_TRANSPOSES and not too_large and not (strip_exif and has_exif):
+        return None
+
+    options = {}
+    if im.info.get('icc_profile'):
+        options['icc_profile'] = im.info['icc_profile']
+    if too_large:
+        # Also lets the JPEG decoder scale the image down while decoding
+        im.thumbnail((max_dimension, max_dimension), Image.ANTIALIAS)
+    else:
+        im.load()
+    im = auto_orient(im, orientation)
+
+    if format not in Image.SAVE or format == 'JPEG':
+        # The EXIF data, orientation included, is not written back
+        format = 'JPEG'
+        options.update(quality=quality, optimize=True)
+        if im.mode not in ('L', 'RGB', 'CMYK'):
+            im = im.convert('RGB')
+    elif format == 'PNG':
+        options['optimize'] = True
+    buf = StringIO()
+    im.save(buf, format, **options)
+    return buf.getvalue(), format
@@ -41,6 +41,34 @@ except ImportError:
         raise ImportError("The Python Imaging Library was not found.")
 
 
+# Gradient masks by (image size, amount, opacity). Photo sizes come in a
+# handful of dimensions, so the same few masks are used over and over.
+_masks = {}
+MASK_CACHE_SIZE = 32
+
+
+def reflection_mask(size, amount, opacity):
+    """ Returns the alpha mask blending a reflection of an image of `size`
+    into the background, covering only the reflected rows.
+    """
+    key = (size, amount, opacity)
+    mask = _masks.get(key)
+    if mask is None:
+        width, height = size
+        start = int(255 - (255 * opacity)) # The start of our gradient
+        steps = int(255 * amount) # the number of intermedite values
+        increment = (255 - start) / float(steps)
+        # build a single column of the gradient, stretch it over the height
+        # of the image and keep the part below the reflection height
+        column = bytearray(int(y * increment + start) if y < steps else 255 for y in range(255))
+        mask = Image.frombytes('L', (1, 255), str(column)).resize((1, height))
+        mask = mask.crop((0, 0, 1, int(height * amount))).resize((width, int(height * amount)))
+        if len(_masks) >= MASK_CACHE_SIZE:
+            _masks.clear()
+        _masks[key] = mask
+    return mask
+
+
 def add_reflection(im, bgcolor="#00000", amount=0.4, opacity=0.6):
     """ Returns the supplied PIL Image (im) with a reflection effect
 
@@ -55,37 +83,23 @@ def add_reflection(im, bgcolor="#00000", amount=0.4, opacity=0.6):
     # convert bgcolor string to rgb value
     background_color = ImageColor.getrgb(bgcolor)
 
-    # copy orignial image and flip the orientation
-    reflection = im.copy().transpose(Image.FLIP_TOP_BOTTOM)
-
-    # create a new image filled with the bgcolor the same size
-    background = Image.new("RGB", im.size, background_color)
-
-    # calculate our alpha mask
-    start = int(255 - (255 * opacity)) # The start of our gradient
-    steps = int(255 * amount) # the number of intermedite values
-    increment = (255 - start) / float(steps)
-    mask = Image.new('L', (1, 255))
-    for y in range(255):
-        if y < steps:
-            val = int(y * increment + start)
-        else:
-            val = 255
-        mask.putpixel((0, y), val)
-    alpha_mask = mask.resize(im.size)
-
-    # merge the reflection onto our background color using the alpha mask
-    reflection = Image.composite(background, reflection, alpha_mask)
-
-    # crop the reflection
+    # only the bottom rows of the original end up in the reflection, flip
+    # just those
     reflection_height = int(im.size[1] * amount)
-    reflection = reflection.crop((0, 0, im.size[0], reflection_height))
+    reflection = im.crop((0, im.size[1] - reflection_height, im.size[0], im.size[1]))
+    reflection = reflection.transpose(Image.FLIP_TOP_BOTTOM)
 
     # create new image sized to hold both the original image and the reflection
     composite = Image.new("RGB", (im.size[0], im.size[1] + reflection_height), background_color)
-
-    # paste the orignal image and the reflection into the composite image
     composite.paste(im, (0, 0))
+    if not reflection_height:
+        return composite
+
+    # merge the reflection onto our background color using the alpha mask
+    background = Image.new("RGB", reflection.size, background_color)
+    reflection = Image.composite(background, reflection, reflection_mask(im.size, amount, opacity))
+
+    # paste the reflection into the composite image
     composite.paste(reflection, (0, im.size[1]))
 
     # return the image complete with reflection effect
@@ -27,29 +27,48 @@ def reduce_opacity(im, opacity):
     im.putalpha(alpha)
     return im
 
-def apply_watermark(im, mark, position, opacity=1):
-    """Adds a watermark to an image."""
-    if opacity < 1:
-        mark = reduce_opacity(mark, opacity)
-    if im.mode != 'RGBA':
-        im = im.convert('RGBA')
-    # create a transparent layer the size of the image and draw the
-    # watermark in that layer.
-    layer = Image.new('RGBA', im.size, (0, 0, 0, 0))
+def tile(mark, size):
+    """Returns a transparent layer of `size` covered with copies of `mark`."""
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    # paste one row of marks, then copy the row down the layer
+    row = Image.new('RGBA', (size[0], mark.size[1]), (0, 0, 0, 0))
+    for x in range(0, size[0], mark.size[0]):
+        row.paste(mark, (x, 0))
+    for y in range(0, size[1], mark.size[1]):
+        layer.paste(row, (0, y))
+    return layer
+
+def watermark_layer(mark, size, position):
+    """Returns a transparent layer of `size` with `mark` drawn at `position`."""
     if position == 'tile':
-        for y in range(0, im.size[1], mark.size[1]):
-            for x in range(0, im.size[0], mark.size[0]):
-                layer.paste(mark, (x, y))
-    elif position == 'scale':
+        return tile(mark, size)
+    layer = Image.new('RGBA', size, (0, 0, 0, 0))
+    if position == 'scale':
         # scale, but preserve the aspect ratio
         ratio = min(
-            float(im.size[0]) / mark.size[0], float(im.size[1]) / mark.size[1])
+            float(size[0]) / mark.size[0], float(size[1]) / mark.size[1])
         w = int(mark.size[0] * ratio)
         h = int(mark.size[1] * ratio)
         mark = mark.resize((w, h))
-        layer.paste(mark, ((im.size[0] - w) / 2, (im.size[1] - h) / 2))
+        layer.paste(mark, ((size[0] - w) / 2, (size[1] - h) / 2))
     else:
         layer.paste(mark, position)
+    return layer
+
+def apply_watermark(im, mark, position, opacity=1, layer=None):
+    """Adds a watermark to an image.
+
+    `layer` may be a layer made earlier by `watermark_layer` for the same
+    mark, size, position and opacity, to skip drawing it again.
+    """
+    if im.mode != 'RGBA':
+        im = im.convert('RGBA')
+    if layer is None:
+        if opacity < 1:
+            mark = reduce_opacity(mark, opacity)
+        # create a transparent layer the size of the image and draw the
+        # watermark in that layer.
+        layer = watermark_layer(mark, im.size, position)
     # composite the watermark with the layer
     return Image.composite(layer, im, layer)
 
@@ -1,25 +1,34 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import hashlib
 import json
+import mimetypes
+import posixpath
 
 from django.views.generic.dates import ArchiveIndexView, DateDetailView, DayArchiveView, MonthArchiveView, YearArchiveView
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
 from django.template.defaultfilters import slugify
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponseRedirect, HttpResponse
+from django.http import HttpResponseRedirect, HttpResponse, HttpResponseNotModified, FileResponse, Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.core.urlresolvers import reverse
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.encoding import smart_str
 
 from acressity import settings
 from photologue.models import Photo, Gallery
 from photologue.forms import GalleryForm, GalleryPhotoForm
+from photologue.stores import get_rendition_store
 from notifications import notify
 
+# Seconds browsers may keep a rendition for, a year.
+RENDITION_MAX_AGE = 365 * 24 * 60 * 60
+
 
 def upload_photo(request, gallery_id):
     gallery = get_object_or_404(Gallery, pk=gallery_id)
@@ -36,8 +45,7 @@ def upload_photo(request, gallery_id):
                 gallery.featured_photo = photo
                 gallery.save()
             messages.success(request, 'Your photo was successfully uploaded')
-            for comrade in gallery.explorers.exclude(id=request.user.id):
-                notify.send(sender=request.user, recipient=comrade, target=photo, verb='has uploaded a new photo')
+            notify.send_many(sender=request.user, recipients=gallery.explorers.exclude(id=request.user.id), target=photo, verb='has uploaded a new photo')
             return HttpResponseRedirect('/photologue/gallery/{0}/'.format(gallery.id))
     else:
         form = GalleryPhotoForm()
@@ -59,8 +67,7 @@ def ajax_upload(request):
             if 'feature' in request.POST.keys():
                 gallery.featured_photo = photo
                 gallery.save()
-            for comrade in gallery.explorers.exclude(id=request.user.id):
-                notify.send(sender=request.user, recipient=comrade, target=photo, verb='has uploaded a new photo')
+            notify.send_many(sender=request.user, recipients=gallery.explorers.exclude(id=request.user.id), target=photo, verb='has uploaded a new photo')
             data = {'html': render_to_string('photologue/snippets/photo_dash.html', {'photo': photo, 'user': request.user, 'STATIC_URL': settings.STATIC_URL })}
             return HttpResponse(json.dumps(data))
         else:
@@ -121,6 +128,54 @@ def photo_view(request, pk):
     return render(request, 'photologue/photo_detail.html', {'object': photo})
 
 
+def photo_original(request, pk):
+    photo = get_object_or_404(Photo, pk=pk)
+    if not photo.gallery.is_public:
+        if request.user not in photo.gallery.explorers.all():
+            raise PermissionDenied
+    # The digest changes with the contents of the image, browsers holding a
+    # copy only need to check it is still current
+    etag = '"%s"' % photo.image_digest if photo.image_digest else None
+    if etag and etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(photo.image.name)[0] or 'application/octet-stream'
+        response = FileResponse(photo.image.storage.open(photo.image.name, 'rb'), content_type=content_type)
+    if etag:
+        response['ETag'] = etag
+    if photo.gallery.is_public:
+        patch_cache_control(response, public=True, no_cache=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def rendition(request, pk, name):
+    photo = get_object_or_404(Photo, pk=pk)
+    if not photo.gallery.is_public:
+        if request.user not in photo.gallery.explorers.all():
+            raise PermissionDenied
+    store = get_rendition_store()
+    prefix = posixpath.splitext(posixpath.basename(photo.image.name))[0] + '_'
+    if posixpath.dirname(name) != photo.cache_name() or \
+       not posixpath.basename(name).startswith(prefix) or not store.exists(name):
+        raise Http404
+    # Rendition names include a digest of everything they are made from, so
+    # their contents never change and can be cached for good
+    etag = '"%s"' % hashlib.sha1(smart_str(name)).hexdigest()
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        response = FileResponse(store.open(name), content_type=content_type)
+    response['ETag'] = etag
+    if photo.gallery.is_public:
+        patch_cache_control(response, public=True, max_age=RENDITION_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, max_age=RENDITION_MAX_AGE, immutable=True)
+    return response
+
+
 class PhotoView(object):
     queryset = Photo.objects.filter(is_public=True)
 
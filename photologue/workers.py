@@ -0,0 +1,108 @@
+""" Helpers for rendering photos in a pool of worker processes.
+
+Workers are forked from the management command that creates the pool, so they
+share its settings but must not share its database connections.
+"""
+import multiprocessing
+
+from django.db import connections
+
+
+def close_connections():
+    for conn in connections.all():
+        conn.close()
+
+
+def in_transaction():
+    """Whether a connection is inside an atomic block, which closing it for a
+    pool would break and whose changes the workers could not see."""
+    return any(conn.in_atomic_block for conn in connections.all())
+
+
+def get_pool(workers):
+    """Return a process pool of `workers` processes.
+
+    Connections are closed before forking so that each worker opens its own
+    on first use.
+    """
+    close_connections()
+    return multiprocessing.Pool(workers, initializer=close_connections)
+
+
+def run_rendition_job(pk):
+    """Render a single queued job. Returns an error message or None."""
+    from photologue.models import RenditionJob
+    try:
+        job = RenditionJob.objects.select_related('photosize').get(pk=pk)
+    except RenditionJob.DoesNotExist:
+        return None
+    try:
+        job.run()
+    except Exception, e:
+        return u'%s: %s' % (job, e)
+    return None
+
+
+def cache_image(task):
+    """Render sizes for one image for the `plcache` command.
+
+    `task` is a tuple of (app label, model name, pk, photo size ids, reset).
+    Returns a tuple of (app label, model name, pk, bytes written, error).
+    The sizes are looked up in the worker's PhotoSizeCache, which reloads
+    them when they are edited.
+    """
+    from django.apps import apps
+    from photologue.models import PhotoSizeCache
+    app_label, model_name, pk, size_ids, reset = task
+    photosizes = [photosize for photosize in PhotoSizeCache().sizes.values() if photosize.pk in size_ids]
+    written, error = 0, None
+    try:
+        model = apps.get_model(app_label, model_name)
+        obj = model.objects.get(pk=pk)
+        if reset:
+            for photosize in photosizes:
+                obj.remove_size(photosize, False)
+        written = obj.create_sizes(photosizes)
+    except Exception, e:
+        error = u'%s.%s #%s: %s' % (app_label, model_name, pk, e)
+    return (app_label, model_name, pk, written, error)
+
+
+def sweep_renditions(dry_run=False):
+    """Remove renditions no longer referenced and queue missing pre-cached ones.
+
+    Renditions are named after the settings of their size and effects, so
+    those made before a size or effect was edited, or for deleted sizes, are
+    no longer referenced by any image. Returns a tuple of (renditions
+    removed, images queued for rendering).
+    """
+    from photologue.models import (ImageModel, PhotoSize, RenditionJob,
+                                   QUEUE_RENDITIONS)
+    from photologue.stores import get_rendition_store
+    store = get_rendition_store()
+    photosizes = list(PhotoSize.objects.select_related('effect', 'watermark'))
+    pre_cached = [photosize for photosize in photosizes if photosize.pre_cache]
+
+    referenced = {}
+    queued = 0
+    for cls in ImageModel.__subclasses__():
+        for obj in cls.objects.select_related('effect').iterator():
+            if not obj.image:
+                continue
+            names = referenced.setdefault(obj.cache_name(), set())
+            for photosize in photosizes:
+                names.add(obj._get_rendition_name(photosize))
+            if QUEUE_RENDITIONS and not dry_run:
+                missing = [photosize for photosize in pre_cached if not obj.size_exists(photosize)]
+                if missing:
+                    RenditionJob.objects.enqueue(obj, missing)
+                    queued += 1
+
+    removed = 0
+    for directory, names in referenced.items():
+        for name in store.listdir(directory):
+            if name not in names:
+                if not dry_run:
+                    store.delete(name, prune=False)
+                removed += 1
+    return removed, queued
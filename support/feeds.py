@@ -0,0 +1,48 @@
+'''
+Who follows what, for the activity feeds of the notifications app.
+'''
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+
+from experiences.models import Experience
+from photologue.models import Photo
+from support.models import Cheer
+
+
+def gallery_owner(gallery):
+    '''
+    Return the experience or narrative a gallery belongs to, or None.
+    '''
+    for name in ('experience', 'narrative'):
+        try:
+            return getattr(gallery, name)
+        except ObjectDoesNotExist:
+            pass
+    return None
+
+
+def followers(actor, target=None):
+    '''
+    Return the pks of the explorers cheering for the actor of an activity
+    and of those tracking the experience of its target. Activity on private
+    experiences, narratives and photos is only for those notified directly.
+    A photo is private with its gallery and with the experience or narrative
+    the gallery belongs to.
+    '''
+    if isinstance(target, Photo):
+        if not target.is_public or not target.gallery.is_public:
+            return set()
+        target = gallery_owner(target.gallery) or target
+    if not getattr(target, 'is_public', True):
+        return set()
+    experience = target if isinstance(target, Experience) else getattr(target, 'experience', None)
+    if experience is not None and not experience.is_public:
+        return set()
+
+    pks = set()
+    if isinstance(actor, get_user_model()):
+        pks.update(Cheer.objects.filter(explorer=actor).values_list('cheerer_id', flat=True))
+    if experience is not None:
+        pks.update(experience.tracking_explorers.values_list('pk', flat=True))
+    return pks
@@ -11,7 +11,7 @@ from django.template.loader import render_to_string
 from django.core.mail import EmailMultiAlternatives
 
 from experiences.models import Experience
-from notifications.models import Notification
+from notifications.models import Notification, fan_out, queue_messages, wants_digest
 from acressity.utils import get_site_domain
 
 
@@ -126,6 +126,10 @@ def comment_handler(sender, **kwargs):
     elif model == 'Photo':
         recipients.append(comment.content_object.author)
         
+    # A note on an explorer is personal, it only goes to their own feed
+    fan_out(recipients, comment.user, 'has posted a new note', target=comment.content_object,
+            description=comment.comment, followers=model != 'Explorer')
+    messages = []
     for recipient in recipients:
         newnotify = Notification.objects.create(
             recipient=recipient,
@@ -136,10 +140,11 @@ def comment_handler(sender, **kwargs):
             target_object_id=comment.object_pk,
             public=True,
             description=comment.comment,
-            timestamp=timezone.now()
+            timestamp=timezone.now(),
+            email_pending=wants_digest(recipient)
         )
 
-        if newnotify.recipient.notify:
+        if newnotify.recipient.notify and not newnotify.email_pending:
             to = newnotify.recipient.email
             from_email = 'acressity@acressity.com'
             subject = 'New note on your Acressity journey'
@@ -147,6 +152,7 @@ def comment_handler(sender, **kwargs):
             html_content = render_to_string('notifications/email.html', {'notice': newnotify, 'domain': get_site_domain()})
             message = EmailMultiAlternatives(subject, text_content, from_email, [to])
             message.attach_alternative(html_content, 'text/html')  # This will no longer be necessary in Django 1.7. Can be provided to send_mail as function parameter
-            message.send()
+            messages.append(message)
+    queue_messages(messages)
 
 comment_was_posted.connect(comment_handler)
@@ -36,11 +36,10 @@ def handle_paypal_signals(sender, **kwargs):
                 paypal_ipn_object.payment_gross, item)
             if paypal_ipn_object.memo:
                 notification_verb += ' With a memo: "{0}"'.format(paypal_ipn_object.memo)
-            for explorer in item.explorers.all():
-                notify.send(
-                    sender=benefactor, recipient=explorer,
-                    verb=notification_verb
-                )
+            notify.send_many(
+                sender=benefactor, recipients=item.explorers.all(),
+                verb=notification_verb
+            )
             if isinstance(benefactor, Explorer):
                 notify.send(
                     sender=recipient, recipient=benefactor,
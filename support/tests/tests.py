@@ -1,8 +1,23 @@
+import datetime
+
+import mock
+
+from django.contrib.sites.models import Site
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
 from django.core.management import call_command
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.utils.six import StringIO
+from django_comments.models import Comment
 
-from support.models import Quote
+from experiences.models import Experience
+from explorers.tests import helpers as explorer_helpers
+from narratives.models import Narrative
+from photologue.tests import helpers as photologue_helpers
+from photologue.tests.test_main import PhotologueTestCase
+from support.models import Cheer, Quote, comment_handler
+from notifications.models import FeedEntry, QueuedEmail, fan_out, queue_mail
 
 class QuoteTest(TestCase):
     test_quote_datafile = 'support/tests/data/quotes.dat'
@@ -57,3 +72,126 @@ class QuoteTest(TestCase):
         self.assertEqual(Quote.objects.count(), 1)
         call_command('load_quotes', *arguments, stdout=out)
         self.assertEqual(Quote.objects.count(), 2)
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise IOError('Mail server unavailable')
+
+
+class QueuedEmailTest(TestCase):
+    def setUp(self):
+        queue_email = mock.patch('notifications.models.QUEUE_EMAIL', True)
+        queue_email.start()
+        self.addCleanup(queue_email.stop)
+        queue_mail('Comments from Acressity', 'Nice site', 'acressity@acressity.com',
+                ['someone@somewhere.edu'])
+
+    def test_queued_email_is_sent_by_command(self):
+        self.assertEqual(len(mail.outbox), 0)
+        out = StringIO()
+        call_command('sendqueuedmail', stdout=out)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['someone@somewhere.edu'])
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertIn('0 emails queued', out.getvalue())
+
+    @override_settings(EMAIL_BACKEND='support.tests.tests.FailingEmailBackend')
+    def test_failed_email_is_retried_later(self):
+        call_command('sendqueuedmail', stdout=StringIO())
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('unavailable', email.last_error)
+        self.assertFalse(QueuedEmail.objects.due().exists())
+
+
+class UnqueuedEmailTest(TestCase):
+    def test_email_is_sent_at_once_by_default(self):
+        queue_mail('Comments from Acressity', 'Nice site', 'acressity@acressity.com',
+                ['someone@somewhere.edu'])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+
+class FeedTest(PhotologueTestCase):
+    def setUp(self):
+        super(FeedTest, self).setUp()
+        self.actor = explorer_helpers.create_test_explorer()
+        self.cheerer = explorer_helpers.create_test_explorer()
+        self.tracker = explorer_helpers.create_test_explorer()
+        Cheer.objects.create(cheerer=self.cheerer, explorer=self.actor)
+        self.experience = Experience.objects.create(title='Climb Mount Everest', author=self.actor,
+                is_public=True)
+        self.experience.tracking_explorers.add(self.tracker)
+
+    def feeds(self):
+        return sorted(FeedEntry.objects.values_list('recipient_id', flat=True))
+
+    def test_followers_get_public_activity(self):
+        self.assertEqual(fan_out([], self.actor, 'has a new journey', target=self.experience), 2)
+        self.assertEqual(self.feeds(), sorted([self.cheerer.pk, self.tracker.pk]))
+
+    def test_activity_is_written_once(self):
+        fan_out([self.tracker], self.actor, 'has a new journey', target=self.experience)
+        fan_out([self.tracker], self.actor, 'has a new journey', target=self.experience)
+
+        self.assertEqual(self.feeds(), sorted([self.cheerer.pk, self.tracker.pk]))
+
+    def test_private_experience_is_not_followed(self):
+        self.experience.is_public = False
+        self.experience.save()
+
+        fan_out([self.tracker], self.actor, 'has a new journey', target=self.experience)
+
+        self.assertEqual(self.feeds(), [self.tracker.pk])
+
+    def test_private_narrative_is_not_followed(self):
+        narrative = Narrative.objects.create(title='Base camp', body='Arrived', experience=self.experience,
+                author=self.actor, is_public=False)
+
+        fan_out([], self.actor, 'has a new narrative', target=narrative)
+
+        self.assertEqual(self.feeds(), [])
+
+    def test_photo_in_private_gallery_is_not_followed(self):
+        self.gallery.is_public = False
+        self.gallery.save()
+        photo = photologue_helpers.create_test_photo(self.gallery)
+
+        fan_out([], self.actor, 'has a new photo', target=photo)
+
+        self.assertEqual(self.feeds(), [])
+
+    def test_photo_of_private_experience_is_not_followed(self):
+        self.experience.gallery = self.gallery
+        self.experience.save()
+        photo = photologue_helpers.create_test_photo(self.gallery)
+
+        fan_out([], self.actor, 'has a new photo', target=photo)
+        self.assertEqual(self.feeds(), sorted([self.cheerer.pk, self.tracker.pk]))
+
+        FeedEntry.objects.all().delete()
+        self.experience.is_public = False
+        self.experience.save()
+        fan_out([], self.actor, 'has a new photo', target=photo)
+        self.assertEqual(self.feeds(), [])
+
+    def test_note_on_explorer_is_personal(self):
+        explorer = explorer_helpers.create_test_explorer()
+        comment = Comment.objects.create(content_object=explorer, user=self.actor, comment='Just between us',
+                site=Site.objects.get_current())
+
+        comment_handler(sender=Comment, comment=comment, request=None)
+
+        self.assertEqual(self.feeds(), [explorer.pk])
+
+    def test_prune_old_entries(self):
+        fan_out([self.tracker], self.actor, 'has a new journey', target=self.experience,
+                timestamp=timezone.now() - datetime.timedelta(days=100))
+        fan_out([self.tracker], self.actor, 'has a new narrative', target=self.experience)
+        out = StringIO()
+
+        call_command('prunefeed', stdout=out)
+
+        self.assertIn('Deleted 2 feed entries', out.getvalue())
+        self.assertEqual(FeedEntry.objects.filter(verb='has a new narrative').count(), 2)
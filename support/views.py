@@ -5,7 +5,6 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.core.urlresolvers import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.mail import send_mail
 from django.core.exceptions import PermissionDenied
 from django_comments.models import Comment
 from django.contrib.auth import get_user_model
@@ -14,6 +13,7 @@ from django.views.decorators.csrf import csrf_exempt
 from acressity import settings
 from experiences.models import Experience
 from notifications import notify
+from notifications.models import queue_mail
 from support.models import InvitationRequest
 from support.forms import PotentialExplorerForm
 from paypal.standard.forms import PayPalPaymentsForm
@@ -73,7 +73,7 @@ def comment_to_creator(request):
             message = comment + '\n\n{0}'.format(request.META.get('HTTP_REFERER'))
             if request.user.is_authenticated():
                 message += '\n\nFrom {0}'.format(request.user.get_full_trailname())
-            send_mail('Comments from Acressity', message, 'acressity@acressity.com', ['andrew.s.gaines@gmail.com'])
+            queue_mail('Comments from Acressity', message, 'acressity@acressity.com', ['andrew.s.gaines@gmail.com'])
             messages.success(request, 'Thank you for your comment! It will be used to improve the site.')
     return redirect(request.META.get('HTTP_REFERER'))
 
@@ -121,7 +121,7 @@ def experience_invite(request, experience_id):
                 form.save()
                 invitation_request = InvitationRequest(author=request.user, potential_explorer=form.instance, experience=experience, code=''.join([random.choice(string.ascii_letters + string.digits) for i in range(25)]))
                 invitation_request.save()
-                send_mail(
+                queue_mail(
                     'Invitation from {0}'.format(request.user.get_full_name()), 'Hello {3} {4},\nYou\'ve been invited by {0} to participate in the experience "{1}"\n\nTo view this invitation, go to http://acressity.com/support/view_invitation/{2}\n\nIf you do not know this person, or believe this email was sent in error, please ignore or respond to acressity@acressity.com'.format(request.user.get_full_name(), experience, invitation_request.code, form.instance.first_name, form.instance.last_name), 'acressity@acressity.com', [form.cleaned_data['email']])
                 messages.success(request, 'You\'ve invited {0} {1} to {2}. They will be sent an invitation email'.format(form.cleaned_data['first_name'], form.cleaned_data['last_name'], experience))
                 return redirect(reverse('experience', args=(experience.id,)))